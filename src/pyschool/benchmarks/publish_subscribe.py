@@ -0,0 +1,230 @@
+"""
+This module benchmarks the throughput and latency of the publish-subscribe
+implementations.
+
+The sweep covers the number of subscribers, the ratio of active (not paused)
+subscribers, the message size, and the delivery backend:
+
+* "pattern": pattern.publish_subscribe.Publisher, with strong references.
+* "pattern-weak": pattern.publish_subscribe.Publisher, with weak references.
+* "inline", "thread", "process": pubsub.ipublisher.PublisherBase, with the
+  respective delivery executor.  PublisherBase has no paused subscribers, so
+  these backends are measured at an active ratio of 1.0 only.
+
+Each case publishes the same message repeatedly and reports messages per
+second, subscriber deliveries per second, and the p50 and p99 latency of a
+single publication (for the pooled executors, submission plus flush), as
+JSON.
+
+The pubsub package imports itself as `pubsub`, so src/pyschool must be on the
+module search path, as it is when run from there.
+
+Example:
+    > conda activate pyschool-env
+    > cd ~/pyschool/src/pyschool
+    > python -m benchmarks.publish_subscribe --subscribers 1 100 1000 \\
+    >     --backends pattern inline thread --output pubsub.json
+"""
+
+import argparse
+from contextlib import redirect_stdout
+import itertools
+import json
+import platform
+import sys
+import time
+from typing import List
+
+from pyschool.pattern.publish_subscribe import Publisher, Subscriber
+from pubsub.ipublisher import EXECUTORS, PublisherBase  # as pubsub imports itself
+
+BACKENDS = ("pattern", "pattern-weak") + EXECUTORS
+
+
+class CountingSubscriber(Subscriber):
+    """A pattern Subscriber that only counts its publications."""
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def publication_callback(self, *, message=""):
+        self.count += 1
+
+
+class CountingBaseSubscriber:
+    """A pubsub subscriber that only counts its publications.  Module level, so
+    the process executor can pickle it."""
+
+    def __init__(self):
+        self.count = 0
+
+    def update(self):
+        self.count += 1
+
+    def publication_batch_callback(self, messages):
+        self.count += len(messages)
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    """Returns the nearest-rank percentile q (0 to 100) of sorted values."""
+    index = max(0, min(len(ordered) - 1, round(q / 100.0 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _pattern_case(subscribers, active_ratio, message, weak):
+    publisher = Publisher(weak=weak)
+    roster = [CountingSubscriber() for _ in range(subscribers)]
+    active = round(subscribers * active_ratio)
+    for i, subscriber in enumerate(roster):
+        publisher.subscribe(subscriber, active=i < active)
+
+    def publish():
+        publisher.publish(message)
+
+    return publish, (lambda: None), roster, active
+
+
+def _base_case(subscribers, message, executor):
+    publisher = PublisherBase(name="benchmark", executor=executor)
+    roster = [CountingBaseSubscriber() for _ in range(subscribers)]
+    for subscriber in roster:
+        publisher.connect(subscriber)
+    messages = (message,)
+
+    def publish():
+        publisher.publish_many(messages)
+        publisher.flush()
+
+    return publish, (lambda: publisher.shutdown()), roster, subscribers
+
+
+def run_case(
+    backend: str,
+    subscribers: int,
+    active_ratio: float,
+    message_bytes: int,
+    messages: int,
+    warmup: int = 10,
+) -> dict:
+    """
+    Measures a single case of the sweep.
+
+    Arguments:
+        backend (str): One of BACKENDS.
+        subscribers (int): The number of subscribers.
+        active_ratio (float): The fraction, 0.0 to 1.0, of subscribers active.
+        message_bytes (int): The size of the message, in bytes.
+        messages (int): The number of publications measured.
+        warmup (int): The number of publications before measurement.
+            Defaults to 10.
+
+    Returns:
+        result (dict): The case parameters and its measurements.
+
+    Raises:
+        ValueError: If the backend is not one of BACKENDS.
+    """
+    message = bytes(message_bytes)
+    with redirect_stdout(sys.stderr):  # keep stdout for the JSON report
+        if backend in ("pattern", "pattern-weak"):
+            publish, close, roster, active = _pattern_case(
+                subscribers, active_ratio, message, weak=backend == "pattern-weak"
+            )
+        elif backend in EXECUTORS:
+            publish, close, roster, active = _base_case(subscribers, message, backend)
+        else:
+            raise ValueError(
+                f"Unknown backend '{backend}', expected one of {BACKENDS}."
+            )
+    # the roster keeps the subscribers alive for the weak backend
+
+    try:
+        for _ in range(warmup):
+            publish()
+
+        latencies = []
+        clock = time.perf_counter
+        tic = clock()
+        for _ in range(messages):
+            start = clock()
+            publish()
+            latencies.append(clock() - start)
+        elapsed = clock() - tic
+    finally:
+        close()
+
+    latencies.sort()
+    return dict(
+        backend=backend,
+        subscribers=subscribers,
+        active_ratio=active_ratio,
+        active_subscribers=active,
+        message_bytes=message_bytes,
+        messages=messages,
+        seconds=elapsed,
+        messages_per_second=messages / elapsed,
+        deliveries_per_second=messages * active / elapsed,
+        p50_us=_percentile(latencies, 50) * 1e6,
+        p99_us=_percentile(latencies, 99) * 1e6,
+    )
+
+
+def sweep(
+    backends=("pattern",),
+    subscribers=(1, 10, 100),
+    active_ratios=(1.0,),
+    message_bytes=(0,),
+    messages: int = 1000,
+) -> dict:
+    """
+    Measures every combination of the sweep parameters.
+
+    Returns:
+        report (dict): The environment and the list of case results.
+    """
+    results = []
+    for backend, count, ratio, size in itertools.product(
+        backends, subscribers, active_ratios, message_bytes
+    ):
+        if backend in EXECUTORS and ratio != 1.0:
+            continue  # PublisherBase has no paused subscribers
+        results.append(run_case(backend, count, ratio, size, messages))
+
+    return dict(
+        python=platform.python_version(),
+        implementation=platform.python_implementation(),
+        machine=platform.machine(),
+        results=results,
+    )
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--backends", nargs="+", default=["pattern"], choices=BACKENDS)
+    parser.add_argument("--subscribers", nargs="+", type=int, default=[1, 10, 100])
+    parser.add_argument("--active-ratios", nargs="+", type=float, default=[1.0])
+    parser.add_argument("--message-bytes", nargs="+", type=int, default=[0])
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    report = sweep(
+        backends=args.backends,
+        subscribers=args.subscribers,
+        active_ratios=args.active_ratios,
+        message_bytes=args.message_bytes,
+        messages=args.messages,
+    )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fout:
+            fout.write(text + "\n")
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,64 @@
+"""
+This module tests the publish-subscribe benchmark suite.
+
+Example:
+    > conda activate pyschool-env
+    > pytest src/pyschool/benchmarks/tests/test_benchmark.py -rP
+"""
+
+import json
+import sys
+
+import pytest
+
+from pyschool.benchmarks import publish_subscribe as bench
+from pubsub import ipublisher
+
+
+def test_sweep_skips_paused_ratios_for_publisher_base():
+    report = bench.sweep(
+        backends=("pattern", "inline"),
+        subscribers=(1, 4),
+        active_ratios=(1.0, 0.5),
+        message_bytes=(0, 64),
+        messages=5,
+    )
+    results = report["results"]
+    assert len(results) == 8 + 4  # pattern: 2 x 2 x 2, inline: 2 x 1 x 2
+    assert {"backend", "messages_per_second", "p50_us", "p99_us"} <= set(results[0])
+    assert all(item["p50_us"] <= item["p99_us"] for item in results)
+
+
+def test_paused_subscribers_receive_nothing():
+    result = bench.run_case("pattern", 10, 0.3, 0, messages=5)
+    assert result["active_subscribers"] == 3
+
+    publish, close, roster, active = bench._pattern_case(10, 0.3, b"", weak=False)
+    for _ in range(5):
+        publish()
+    close()
+    # every subscriber received the subscribed event, only the active the rest
+    assert [item.count for item in roster] == [6] * active + [1] * (10 - active)
+
+
+@pytest.mark.parametrize("backend", ["pattern-weak", "thread"])
+def test_backends(backend):
+    result = bench.run_case(backend, 2, 1.0, 8, messages=5)
+    assert result["messages_per_second"] > 0
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        bench.run_case("no-such-backend", 1, 1.0, 0, messages=1)
+
+
+def test_main_writes_json(tmp_path):
+    output = tmp_path / "report.json"
+    bench.main(["--subscribers", "2", "--messages", "3", "--output", str(output)])
+    report = json.loads(output.read_text())
+    assert report["results"][0]["subscribers"] == 2
+
+
+def test_publisher_base_is_the_pubsub_class():
+    assert bench.PublisherBase is ipublisher.PublisherBase
+    assert "pyschool.pubsub.ipublisher" not in sys.modules  # loaded once
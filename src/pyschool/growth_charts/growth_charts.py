@@ -30,7 +30,7 @@ class DistributionPlotter:
     def file_io(self, x_column=1, y_columns=[2]):
         n_header_rows = 1  # number of header rows to be skipping when reading input
         d = os.path.join(self.home, self.file)
-        data = np.genfromtxt(d, dtype="float", delimiter=",", skip_header=n_header_rows)
+        data = np.loadtxt(d, dtype="float", delimiter=",", skiprows=n_header_rows)
 
         self.data_x = data[:, x_column] * self.months_to_years  # years, age
         self.data_y = data[:, y_columns]  # cm, stature
@@ -37,8 +37,8 @@ def main(argv):
 
     n_header_rows = 1  # number of header rows to be skipping when reading input
 
-    input_table = np.genfromtxt(
-        "input.csv", dtype="float", delimiter=",", skip_header=n_header_rows
+    input_table = np.loadtxt(
+        "input.csv", dtype="float", delimiter=",", skiprows=n_header_rows, ndmin=2
     )
 
     print("Input data table:")
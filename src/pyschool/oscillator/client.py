@@ -1,17 +1,28 @@
 #!/usr/bin/env python
+import os
 import sys
 import numpy as np
 from scipy.integrate import odeint
 from scipy.integrate import solve_ivp
-from scipy import linalg
+from scipy import linalg, sparse
+from scipy.sparse import linalg as sparse_linalg
 import json
 
+SOLVERS = ("ivp", "odeint", "modal")  # the solvers known to solve_window
+METHODS = ("RK45", "RK23", "DOP853", "Radau", "BDF", "LSODA")  # of the ivp solver
+OUTPUTS = ("csv", "npz", "npy")  # the output formats known to main
+MODAL_MAX_DOF = 2000  # the most masses of a dense, modal solution
 
-def dudt_rhs(state_variables, time, parameters=[1, 1, 1, 1]):
+
+def dudt_rhs_ivp(t, y, m1, m2, k1, k2):
     """Returns the right-hand-side (RHS) vector for the system of
     first-order ordinary differential equations describing the two
     degree of freedom (DOF) spring mass system.
 
+    The client solves chains with dudt_rhs_chain.  This function is kept as
+    the reference two DOF system that the chain and batch solvers are
+    tested against.
+
     No gravity.
 
     m1 u1'' + (k1 + k2) u1 - k2 u2 = 0
@@ -33,8 +44,9 @@ def dudt_rhs(state_variables, time, parameters=[1, 1, 1, 1]):
               ( -k2 u1 + k2 u2 ) / (-m2)
             ]
     """
-    u1, u2, u3, u4 = state_variables
-    m1, m2, k1, k2 = parameters
+    # u1, u2, u3, u4 = state_variables
+    u1, u2, u3, u4 = y
+    # m1, m2, k1, k2 = parameters
 
     rhs = [
         u3,
@@ -45,48 +57,471 @@ def dudt_rhs(state_variables, time, parameters=[1, 1, 1, 1]):
     return rhs
 
 
-def dudt_rhs_ivp(t, y, m1, m2, k1, k2):
-    """Returns the right-hand-side (RHS) vector for the system of
-    first-order ordinary differential equations describing the two
-    degree of freedom (DOF) spring mass system.
+def dudt_rhs_batch(t, y, m1, m2, k1, k2):
+    """Returns the right-hand-side (RHS) vector of N independent two
+    degree of freedom (DOF) spring mass systems, see dudt_rhs_ivp.
 
-    No gravity.
+    The state of the N systems is stacked component by component,
+    y = [u1 (N), u2 (N), u3 (N), u4 (N)], so the RHS is evaluated with
+    four vectorized NumPy expressions, not N Python lists.  The masses
+    and stiffnesses are scalars or arrays of N.
+    """
+    u1, u2, u3, u4 = y.reshape(4, -1)
+
+    return np.concatenate(
+        (
+            u3,
+            u4,
+            ((k1 + k2) * u1 - k2 * u2) / (-1.0 * m1),
+            (-k2 * u1 + k2 * u2) / (-1.0 * m2),
+        )
+    )
 
-    m1 u1'' + (k1 + k2) u1 - k2 u2 = 0
-    m2 u2''       - k2  u1 + k2 u2 = 0
 
-    Let
-        u3 = u1'  # velocity of u1
-        u4 = u2'  # velocity of u2
+def solve_batch(parameters, initial_conditions, t, abs_error=1.0e-8, rel_error=1.0e-6):
+    """Integrates N independent two DOF spring mass systems at once, e.g.,
+    the cases of a Monte Carlo sweep, as one stacked state with RK45.
 
-    Then
+    solve_ivp controls the step with the RMS norm of the whole state, so
+    the tolerances are scaled by 1/sqrt(N), which bounds the error of
+    every single case by the given tolerances.
 
-        LHS = RHS
-        LHS = [u1', u2', u3', u4'] = dydt
+    Arguments:
+        parameters (array): The (N, 4) array of [m1, m2, k1, k2] per case.
+        initial_conditions (array): The (N, 4) array of
+            [u1_at_0, u2_at_0, u1dot_at_0, u2dot_at_0] per case.
+        t (array): The times at which the solution is returned.
+        abs_error (float): The absolute error tolerance per case.
+        rel_error (float): The relative error tolerance per case.
 
-        RHS =
-            [ u3,
-              u4,
-              ( (k1 + k2) u1 - k2 u2 ) / (-m1),
-              ( -k2 u1 + k2 u2 ) / (-m2)
-            ]
+    Returns:
+        solution (array): The (N, 4, len(t)) array of [u1, u2, u1dot,
+            u2dot] per case and time.
     """
-    # u1, u2, u3, u4 = state_variables
-    u1, u2, u3, u4 = y
-    # m1, m2, k1, k2 = parameters
+    m1, m2, k1, k2 = np.asarray(parameters, dtype=float).T
+    y0 = np.asarray(initial_conditions, dtype=float).T.ravel()  # (4 N,)
+    n_cases = len(m1)
+    scale = 1.0 / np.sqrt(n_cases)
+
+    solution_ivp = solve_ivp(
+        fun=dudt_rhs_batch,
+        t_span=(t[0], t[-1]),
+        y0=y0,
+        method="RK45",
+        t_eval=t,
+        args=(m1, m2, k1, k2),
+        atol=abs_error * scale,
+        rtol=rel_error * scale,
+    )
+
+    return solution_ivp.y.reshape(4, n_cases, -1).transpose(1, 0, 2)
+
+
+def solve_modal(M, K, u_at_0, udot_at_0, t):
+    """Returns the exact solution of the linear, undamped system
+    M u'' + K u = 0 by modal superposition.
+
+    With the mass-normalized generalized eigenvectors Phi of (K, M) and
+    the frequencies omega, the modal coordinates q = Phi^T M u are
+    independent harmonic oscillators,
+
+        q(t) = q(0) cos(omega t) + q'(0) / omega sin(omega t),
+
+    so u, u', and u'' = -Phi omega^2 q are evaluated at all times at once,
+    with no step size control and no energy drift.  A rigid body mode,
+    omega = 0, moves as q(t) = q(0) + q'(0) t.
+
+    Arguments:
+        M (array): The (n, n) symmetric positive definite mass matrix.
+        K (array): The (n, n) symmetric positive semi-definite stiffness
+            matrix.
+        u_at_0 (array): The n displacements at t[0].
+        udot_at_0 (array): The n velocities at t[0].
+        t (array): The times at which the solution is returned.
+
+    Returns:
+        u, udot, uddot (array, array, array): The (n, len(t)) displacements,
+            velocities, and accelerations.
+    """
+    eigenvalues, Phi = linalg.eigh(K, M)  # Phi^T M Phi = I
+    omega = np.sqrt(np.clip(eigenvalues, 0.0, None))
 
-    rhs = [
-        u3,
-        u4,
-        ((k1 + k2) * u1 - k2 * u2) / (-1.0 * m1),
-        (-k2 * u1 + k2 * u2) / (-1.0 * m2),
-    ]
-    return rhs
+    q0 = Phi.T @ (M @ np.asarray(u_at_0, dtype=float))
+    qdot0 = Phi.T @ (M @ np.asarray(udot_at_0, dtype=float))
+
+    tau = np.asarray(t, dtype=float) - t[0]
+    phase = np.outer(omega, tau)
+    cos, sin = np.cos(phase), np.sin(phase)
+
+    rigid = omega < 1e-12 * max(1.0, omega.max())
+    w = np.where(rigid, 1.0, omega)[:, np.newaxis]
+    sin_over_w = np.where(rigid[:, np.newaxis], tau, sin / w)
+
+    q = q0[:, np.newaxis] * cos + qdot0[:, np.newaxis] * sin_over_w
+    qdot = -q0[:, np.newaxis] * w * sin + qdot0[:, np.newaxis] * cos
+    qddot = -(omega**2)[:, np.newaxis] * q
+
+    return Phi @ q, Phi @ qdot, Phi @ qddot
+
+
+def chain_matrices(masses, stiffnesses):
+    """Returns the mass vector and the sparse, tridiagonal stiffness matrix of
+    a chain of N masses, where spring 1 joins mass 1 to the ground and
+    spring i joins mass i - 1 to mass i.
+
+        K[i, i] = k_i + k_(i+1)  (k_(N+1) = 0)
+        K[i, i + 1] = K[i + 1, i] = -k_(i+1)
+
+    For N = 2, K is the [[k1 + k2, -k2], [-k2, k2]] of dudt_rhs_ivp.
+
+    Arguments:
+        masses (array): The N masses.
+        stiffnesses (array): The N spring stiffnesses.
+
+    Returns:
+        m, K (array, scipy.sparse.csr_matrix): The N masses, i.e., the
+            diagonal of the lumped mass matrix, and the (N, N) stiffness
+            matrix.
+    """
+    m = np.asarray(masses, dtype=float)
+    k = np.asarray(stiffnesses, dtype=float)
+    if m.shape != k.shape:
+        raise ValueError("A chain needs as many springs as masses.")
+
+    diagonal = k + np.append(k[1:], 0.0)
+    K = sparse.diags([-k[1:], diagonal, -k[1:]], offsets=[-1, 0, 1], format="csr")
+    return m, K
+
+
+def dudt_rhs_chain(t, y, m, K):
+    """Returns the right-hand-side (RHS) vector of the first-order system of
+    an N mass chain, M u'' + K u = 0, as a sparse matrix-vector product.
+
+        y = [u (N), u' (N)]
+        RHS = [u', -(K u) / m]
+    """
+    n = len(m)
+    u, udot = y[:n], y[n:]
+    return np.concatenate((udot, -(K @ u) / m))
+
+
+def jacobian_chain(m, K):
+    """Returns the constant, sparse Jacobian of dudt_rhs_chain,
+
+        J = [[0, I], [-M^-1 K, 0]],
+
+    for the implicit solvers of solve_ivp, e.g., method="BDF" or "Radau".
+    """
+    n = len(m)
+    return sparse.bmat(
+        [[None, sparse.identity(n)], [-sparse.diags(1.0 / m) @ K, None]],
+        format="csc",
+    )
+
+
+def chain_from_model(model):
+    """Returns the masses, stiffnesses, and initial conditions of a chain
+    from the input file, either as the numbered keys m1, m2, ..., k1, k2,
+    ..., u1_at_0, ..., u1dot_at_0, ..., or, for long chains, as the lists
+    "masses", "stiffnesses", "u_at_0", and "udot_at_0".  A two mass chain
+    is the default.
+    """
+    n = 2
+    while f"m{n + 1}" in model:
+        n += 1
+    masses = model.get(
+        "masses", [model.get(f"m{i}", 1.0) for i in range(1, n + 1)]
+    )  # kg
+    n = len(masses)
+    stiffnesses = model.get(
+        "stiffnesses", [model.get(f"k{i}", 1.0) for i in range(1, n + 1)]
+    )  # N/m
+    u_at_0 = model.get(
+        "u_at_0",
+        [model.get(f"u{i}_at_0", 0.1 if i == 1 else 0.0) for i in range(1, n + 1)],
+    )  # m
+    udot_at_0 = model.get(
+        "udot_at_0", [model.get(f"u{i}dot_at_0", 0.0) for i in range(1, n + 1)]
+    )  # m/s
+    return masses, stiffnesses, u_at_0, udot_at_0
+
+
+def times(t_start, t_stop, nts, start=0, stop=None):
+    """Returns t[start:stop] of t = np.linspace(t_start, t_stop, nts),
+    bit for bit, without building t, so a long run is evaluated a window
+    of times at a time."""
+    stop = nts if stop is None else stop
+    step = (t_stop - t_start) / max(nts - 1, 1)
+    t = np.arange(start, stop) * step + t_start
+    if stop == nts and stop > start:
+        t[-1] = t_stop  # as np.linspace, the last time is exact
+    return t
+
+
+def solve_window(solver, m, K, y0, t, method="RK45"):
+    """Returns the displacements and velocities of a chain at the times t,
+    from the state y0 = [u (N), u' (N)] at t[0], with the "ivp", "odeint",
+    or "modal" solver.  The accelerations are returned by the modal solver
+    only, which evaluates them exactly, and are None otherwise.
+
+    Returns:
+        u, udot, uddot (array, array, array or None): The (n, len(t))
+            displacements, velocities, and accelerations.
+
+    The modal solver needs every mode of the chain, from a dense
+    eigensolution with O(n^2) memory and O(n^3) time, so it is limited to
+    MODAL_MAX_DOF masses.  Longer chains take the "ivp" solver, which keeps
+    K sparse.
+
+    Raises:
+        ValueError: If the solver is not one of SOLVERS, or is "modal" for a
+            chain of more than MODAL_MAX_DOF masses.
+    """
+    if solver not in SOLVERS:
+        raise ValueError(f"Unknown solver '{solver}', expected one of {SOLVERS}.")
+
+    n = len(m)
+
+    if solver == "modal":
+        if n > MODAL_MAX_DOF:
+            raise ValueError(
+                f"The modal solver is limited to {MODAL_MAX_DOF} masses, not {n}, "
+                "use the ivp solver."
+            )
+        return solve_modal(np.diag(m), K.toarray(), y0[:n], y0[n:], t)
+
+    if solver == "odeint":
+        solution = odeint(dudt_rhs_chain, y0, t, args=(m, K), printmessg=1, tfirst=True)
+        return solution[:, :n].T, solution[:, n:].T, None
+
+    # "RK45" (default), or an implicit method, e.g., "BDF" or "Radau",
+    # for stiff chains, which uses the sparse Jacobian, or "LSODA", which
+    # takes the Jacobian as a function returning a dense matrix
+    jacobian = dict()
+    if method in ("BDF", "Radau"):
+        jacobian["jac"] = jacobian_chain(m, K)
+    elif method == "LSODA":
+        dense = jacobian_chain(m, K).toarray()
+        jacobian["jac"] = lambda t, y, *args: dense
+
+    solution_ivp = solve_ivp(
+        fun=dudt_rhs_chain,
+        t_span=(t[0], t[-1]),
+        y0=y0,
+        method=method,
+        t_eval=t,  # evaluated by the dense output of each step
+        args=(m, K),
+        **jacobian,
+    )
+    return solution_ivp.y[:n], solution_ivp.y[n:], None
+
+
+def energies(m, stiffnesses, u, udot):
+    """Returns the kinetic, internal, and total energies of a chain at each
+    time of the (n, nts) displacements and velocities."""
+    ke = 0.5 * m @ np.multiply(udot, udot)  # 1/2 m v^2
+
+    delta = np.diff(u, axis=0, prepend=0.0)  # relative displacement of springs
+    ie = 0.5 * np.asarray(stiffnesses, dtype=float) @ np.multiply(delta, delta)
+
+    te = ke + ie  # total energy of the system, no gravity so no potential energy
+    return ke, ie, te
+
+
+def stream(
+    solver, m, K, stiffnesses, y0, t_start, t_stop, nts, chunk_steps, method="RK45"
+):
+    """Yields the results of a run chunk_steps time steps at a time, so the
+    memory of a run is that of a chunk, however long the run.
+
+    Each window is integrated from the state at its first time to the first
+    time of the next chunk, which gives the initial state of the next
+    window.  The accelerations are the second order np.gradient of the
+    velocities, as for a whole run: the two previous velocities and the
+    next one are carried across each chunk boundary, so the one-sided
+    differences are used at the first and last times of the run only.  A
+    chunk is held back until three velocities are known, e.g., the first
+    chunk of a single time.
+
+    Yields:
+        start, results (int, dict): The index of the first time of the
+            chunk, and its t, u, udot, uddot, ke, ie, and te, as for a
+            whole run.
+    """
+    n = len(m)
+    y0 = np.asarray(y0, dtype=float)
+    history_t, history_udot = np.empty(0), np.empty((n, 0))
+    pending = []  # the (start, results) of chunks waiting for accelerations
+
+    for start in range(0, nts, chunk_steps):
+        stop = min(start + chunk_steps, nts)
+        t = times(t_start, t_stop, nts, start, min(stop + 1, nts))
+
+        if len(t) > 1:
+            u, udot, uddot = solve_window(solver, m, K, y0, t, method)
+        else:  # the last time of the run, the end state of the last window
+            u, udot, uddot = y0[:n, np.newaxis], y0[n:, np.newaxis], None
+
+        y0 = np.concatenate((u[:, -1], udot[:, -1]))
+        count = stop - start
+        ke, ie, te = energies(m, stiffnesses, u[:, :count], udot[:, :count])
+        results = dict(t=t[:count], u=u[:, :count], udot=udot[:, :count])
+        results.update(uddot=None, ke=ke, ie=ie, te=te)
+
+        if uddot is not None:  # exact, from the modal solver
+            results["uddot"] = uddot[:, :count]
+            yield start, results
+            continue
+
+        pending.append((start, results))
+        t_all = np.concatenate(
+            (history_t, *(item["t"] for _, item in pending), t[count:])
+        )
+        if len(t_all) < 3 and stop < nts:
+            continue  # too few velocities for the gradient yet
+
+        udot_all = np.concatenate(
+            (history_udot, *(item["udot"] for _, item in pending), udot[:, count:]),
+            axis=1,
+        )
+        uddot_all = np.gradient(udot_all, t_all, axis=1, edge_order=2)
+        first = len(history_t)
+        for item_start, item in pending:
+            last = first + len(item["t"])
+            item["uddot"] = uddot_all[:, first:last]
+            first = last
+            yield item_start, item
+
+        last = len(t_all) - (len(t) - count)  # drops the next chunk's time
+        history_t, history_udot = t_all[:last][-2:], udot_all[:, :last][:, -2:]
+        pending = []
+
+
+UNITS = dict(
+    t="s", u="m", udot="m/s", uddot="m/s^2", ke="J", ie="J", te="J"
+)  # units of the columns of the results
+
+
+def channels_of(results):
+    """Returns the results as the channels of the text output, e.g., u1, u2,
+    u1dot, ..., ke, ie, te, each a one dimensional array over time."""
+    channels = dict()
+    for name in ("u", "udot", "uddot"):
+        for i, channel in enumerate(results[name], start=1):
+            channels[name.replace("u", f"u{i}", 1)] = channel
+    for name in ("ke", "ie", "te"):
+        channels[name] = results[name]
+    return channels
+
+
+def open_csv(input_file_base, results):
+    """Returns the text files of the channels of the results, open for
+    writing, by channel name."""
+    return {
+        name: open(input_file_base + "_t_" + name + ".csv", "w")
+        for name in channels_of(results)
+    }
+
+
+def append_csv(files, results):
+    """Appends the (t, channel) rows of the results to the open text files
+    of open_csv."""
+    for name, channel in channels_of(results).items():
+        np.savetxt(files[name], np.transpose([results["t"], channel]), delimiter=",")
+
+
+def close_csv(files):
+    """Closes the text files of open_csv."""
+    for fout in files.values():
+        fout.close()
+        print(f"Saved file: {fout.name}")
+
+
+def write_csv(input_file_base, results):
+    """Writes each channel as a separate two column (t, channel) text file."""
+    files = open_csv(input_file_base, results)
+    try:
+        append_csv(files, results)
+    finally:
+        close_csv(files)
+
+
+def write_npz(file_string, results, model):
+    """Writes all results once to a single binary .npz file, one column per
+    result, i.e., t (nts), u, udot, uddot (n, nts), and ke, ie, te (nts),
+    with a json "metadata" column holding the model, units, and shapes."""
+    metadata = dict(
+        model=model,
+        units=UNITS,
+        shapes={name: np.shape(values) for name, values in results.items()},
+    )
+    np.savez(file_string, metadata=np.array(json.dumps(metadata)), **results)
+    print(f"Saved file: {file_string}")
+
+
+def read_npz(file_string):
+    """Returns the results and the metadata of a .npz file of write_npz."""
+    with np.load(file_string, allow_pickle=False) as data:
+        results = {name: data[name] for name in data.files if name != "metadata"}
+        metadata = json.loads(str(data["metadata"]))
+    return results, metadata
+
+
+def open_store(directory, shapes, model):
+    """Creates a store of results, a directory with one .npy column per
+    result, of the given shapes, as write_npz, and a metadata.json file.
+    Returns the columns memory mapped by name, so a run is written to them
+    chunk by chunk, with append_store, and never held in memory whole."""
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, "metadata.json"), "w") as fout:
+        json.dump(dict(model=model, units=UNITS, shapes=shapes), fout)
+    return {
+        name: np.lib.format.open_memmap(
+            os.path.join(directory, name + ".npy"),
+            mode="w+",
+            dtype=np.float64,
+            shape=tuple(shape),
+        )
+        for name, shape in shapes.items()
+    }
+
+
+def append_store(columns, start, results):
+    """Writes the results of a chunk, from the time index start on, to the
+    columns of open_store, and flushes them to disk."""
+    for name, values in results.items():
+        count = np.shape(values)[-1]
+        columns[name][..., start : start + count] = values
+        columns[name].flush()
+
+
+def read_store(directory):
+    """Returns the results, memory mapped, and the metadata of a store of
+    open_store."""
+    with open(os.path.join(directory, "metadata.json")) as fin:
+        metadata = json.load(fin)
+    results = {
+        name: np.load(os.path.join(directory, name + ".npy"), mmap_mode="r")
+        for name in metadata["shapes"]
+    }
+    return results, metadata
+
+
+def export_csv(file_string):
+    """Post-processes a .npz file of write_npz, or a .results store of
+    open_store, into the text files of write_csv, e.g., test_jasper.npz
+    into test_jasper_t_u1.csv, ..."""
+    file_string = file_string.rstrip(os.sep)
+    if os.path.isdir(file_string):
+        results, _ = read_store(file_string)
+    else:
+        results, _ = read_npz(file_string)
+    write_csv(os.path.splitext(file_string)[0], results)
 
 
 def main(argv):
 
-    help_string = "$ python client.py input_file.json"
+    help_string = "$ python client.py input_file.json  (or results_file.npz or .results to export csv)"
 
     try:
         input_file = argv[0]
@@ -97,39 +532,38 @@ def main(argv):
         print("Abnormal script termination.")
         sys.exit("No input file specified.")
 
+    if input_file.rstrip(os.sep).endswith((".npz", ".results")):
+        export_csv(input_file)
+        return
+
     with open(input_file) as f:
         model = json.load(f)
 
-    # mass
-    m1 = model.get("m1", 1.0)  # kg
-    m2 = model.get("m2", 1.0)  # kg
-
-    # stiffness
-    k1 = model.get("k1", 1.0)  # N/m
-    k2 = model.get("k2", 1.0)  # N/m
-
-    M = np.array([[m1, 0.0], [0.0, m2]])
-    K = np.array([[k1 + k2, -k2], [-k2, k2]])
-
-    eigenvalues = linalg.eigvals(K, M)
-    frequencies = np.sqrt(eigenvalues)
-
-    print("Initial frequency and period content:")
-    for i, freq in enumerate(frequencies, start=1):
-        period = 2 * np.pi / np.real(freq)
-        print(
-            f"  frequency {i}: {freq} radians/second    =>    period {i}: {period} seconds."
-        )
+    # mass, stiffness, and initial conditions of the chain
+    masses, stiffnesses, u_at_0, udot_at_0 = chain_from_model(model)
+    m, K = chain_matrices(masses, stiffnesses)
+    n = len(m)
+
+    if n <= 64:
+        eigenvalues = linalg.eigvalsh(K.toarray(), np.diag(m))
+        frequencies = np.sqrt(eigenvalues)
+
+        print("Initial frequency and period content:")
+        for i, freq in enumerate(frequencies, start=1):
+            period = 2 * np.pi / np.real(freq)
+            print(
+                f"  frequency {i}: {freq} radians/second    =>    period {i}: {period} seconds."
+            )
+    else:
+        # only the lowest frequency, by shift-invert about zero
+        eigenvalues = sparse_linalg.eigsh(
+            K.tocsc(), k=1, M=sparse.diags(m, format="csc"), sigma=0.0
+        )[0]
+        frequencies = np.sqrt(eigenvalues)
+        print(f"Lowest frequency of {n} masses: {frequencies[0]} radians/second.")
 
     period_max = 2 * np.pi / np.real(np.min(frequencies))  # second
 
-    # initial conditions
-    u1_at_0 = model.get("u1_at_0", 0.1)  # m
-    u2_at_0 = model.get("u2_at_0", 0.0)  # m
-
-    u1dot_at_0 = model.get("u1dot_at_0", 0.0)  # m/s
-    u2dot_at_0 = model.get("u2dot_at_0", 0.0)  # m/s
-
     # ODE solver paramters
     abs_error = model.get("absolute_error", 1.0e-8)
     rel_error = model.get("relative_error", 1.0e-6)
@@ -149,82 +583,93 @@ def main(argv):
         )
         sys.exit("Error in time parameters input.")  # early exit
 
-    t = np.linspace(t_start, t_stop, num=nts, endpoint=True)
-
-    # collect parameters and initial conditions
-    parameters = [m1, m2, k1, k2]
-    initial_conditions = [u1_at_0, u2_at_0, u1dot_at_0, u2dot_at_0]
-
-    solver_odeint = 0
-
-    if solver_odeint:
-        # solution = odeint(dudt_rhs, initial_conditions, t, args=(parameters,), atol=abs_error, rtol=rel_error)
-        # solution = odeint(dudt_rhs, initial_conditions, t, args=(parameters,), atol=abs_error, rtol=rel_error, printmessg=1)
-        solution = odeint(
-            dudt_rhs, initial_conditions, t, args=(parameters,), printmessg=1
+    # collect initial conditions
+    initial_conditions = np.concatenate((u_at_0, udot_at_0))
+
+    # "ivp" (default), "odeint", or "modal" (exact, closed form)
+    solver = model.get("solver", "ivp")
+    if solver not in SOLVERS:
+        raise ValueError(f"Unknown solver '{solver}', expected one of {SOLVERS}.")
+    method = model.get("method", "RK45")
+    if method not in METHODS:
+        raise ValueError(f"Unknown method '{method}', expected one of {METHODS}.")
+
+    # "csv" (default), a text file per channel, "npz", a single binary file,
+    # or "npy", a .results directory of binary columns
+    output = model.get("output", "csv")
+    if output not in OUTPUTS:
+        raise ValueError(f"Unknown output '{output}', expected one of {OUTPUTS}.")
+
+    # stream long runs, chunk_steps time steps at a time
+    chunk_steps = model.get("chunk_steps")
+
+    if chunk_steps:
+        if output == "npz":
+            print("Error: npz output is written once, stream to npy or csv output.")
+            sys.exit("Error in output parameters input.")  # early exit
+
+        chunks = stream(
+            solver,
+            m,
+            K,
+            stiffnesses,
+            initial_conditions,
+            t_start,
+            t_stop,
+            nts,
+            chunk_steps,
+            method,
         )
-        # unpack displacements
-        u1 = solution[:, 0]
-        u2 = solution[:, 1]
 
-        # unpack velocities
-        u1dot = solution[:, 2]
-        u2dot = solution[:, 3]
+        if output == "npy":
+            series, channels = (nts,), (n, nts)
+            shapes = dict(
+                t=series,
+                u=channels,
+                udot=channels,
+                uddot=channels,
+                ke=series,
+                ie=series,
+                te=series,
+            )
+            columns = open_store(input_file_base + ".results", shapes, model)
+            for start, results in chunks:
+                append_store(columns, start, results)
+            print(f"Saved directory: {input_file_base}.results")
+        else:
+            files = None
+            try:
+                for start, results in chunks:
+                    files = files or open_csv(input_file_base, results)
+                    append_csv(files, results)
+            finally:
+                if files:
+                    close_csv(files)
+        return
 
-    else:
-        solution_ivp = solve_ivp(
-            fun=lambda t, y: dudt_rhs_ivp(t, y, m1, m2, k1, k2),
-            t_span=(t[0], t[-1]),
-            y0=initial_conditions,
-            method="RK45",
-            t_eval=t,
-        )
-
-        t = solution_ivp.t  # overwrite existing times and use from hereon
-
-        # unpack displacements
-        u1 = solution_ivp.y[0, :]
-        u2 = solution_ivp.y[1, :]
+    t = np.linspace(t_start, t_stop, num=nts, endpoint=True)
 
-        # unpack velocities
-        u1dot = solution_ivp.y[2, :]
-        u2dot = solution_ivp.y[3, :]
+    u, udot, uddot = solve_window(solver, m, K, initial_conditions, t, method)
 
-    # accelerations
-    u1ddot = np.gradient(u1dot, t, edge_order=2)
-    u2ddot = np.gradient(u2dot, t, edge_order=2)
+    # accelerations, exact for the modal solver
+    if uddot is None:
+        uddot = np.gradient(udot, t, axis=1, edge_order=2)
 
     # energies
-    ke1 = 0.5 * m1 * np.multiply(u1dot, u1dot)  # 1/2 m v^2
-    ke2 = 0.5 * m2 * np.multiply(u2dot, u2dot)
-    ke = ke1 + ke2
+    ke, ie, te = energies(m, stiffnesses, u, udot)
 
-    delta2 = u2 - u1
-    ie1 = (
-        0.5 * k1 * np.multiply(u1, u1)
-    )  # u1 is the same as delta1, relative displacement
-    ie2 = 0.5 * k2 * np.multiply(delta2, delta2)
-    ie = ie1 + ie2
+    results = dict(t=t, u=u, udot=udot, uddot=uddot, ke=ke, ie=ie, te=te)
 
-    te = ke + ie  # total energy of the system, no gravity so no potential energy
-
-    # write solution to a file, write each channel as a separate file
-    channel_strings = [
-        "u1",
-        "u2",
-        "u1dot",
-        "u2dot",
-        "u1ddot",
-        "u2ddot",
-        "ke",
-        "ie",
-        "te",
-    ]
-
-    for str in channel_strings:
-        file_string = input_file_base + "_t_" + str + ".csv"
-        np.savetxt(file_string, np.transpose([t, eval(str)]), delimiter=",")
-        print(f"Saved file: {file_string}")
+    if output == "npz":
+        write_npz(input_file_base + ".npz", results, model)
+    elif output == "npy":
+        shapes = {name: np.shape(values) for name, values in results.items()}
+        append_store(
+            open_store(input_file_base + ".results", shapes, model), 0, results
+        )
+        print(f"Saved directory: {input_file_base}.results")
+    else:
+        write_csv(input_file_base, results)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,237 @@
+"""
+This module tests the two degree of freedom oscillator solvers.
+
+Example:
+    > conda activate pyschool-env
+    > pytest src/pyschool/oscillator/tests/test_client.py -rP
+"""
+
+import json
+
+import numpy as np
+import pytest
+from scipy.integrate import solve_ivp
+
+from pyschool.oscillator import client
+
+
+def test_batch_matches_single_case_solutions():
+    parameters = np.array([[1.0, 1.0, 100.0, 10.0], [10.0, 1.0, 30.0, 5.0]])
+    initial_conditions = np.array([[0.0, 0.0, -1.0, -1.0], [1.0, 0.0, 0.0, 0.0]])
+    t = np.linspace(0.0, 1.5, 151)
+
+    solution = client.solve_batch(parameters, initial_conditions, t)
+    assert solution.shape == (2, 4, len(t))
+
+    for index, (case, y0) in enumerate(zip(parameters, initial_conditions)):
+        single = solve_ivp(
+            fun=lambda t, y: client.dudt_rhs_ivp(t, y, *case),
+            t_span=(t[0], t[-1]),
+            y0=y0,
+            t_eval=t,
+            atol=1.0e-8,
+            rtol=1.0e-6,
+        )
+        assert np.allclose(solution[index], single.y, atol=1.0e-4)
+
+
+def test_modal_solution_is_exact():
+    m1, m2, k1, k2 = 10.0, 1.0, 30.0, 5.0
+    M = np.array([[m1, 0.0], [0.0, m2]])
+    K = np.array([[k1 + k2, -k2], [-k2, k2]])
+    t = np.linspace(0.0, 100.0, 2001)
+
+    u, udot, uddot = client.solve_modal(M, K, [1.0, 0.0], [0.0, 0.5], t)
+
+    reference = solve_ivp(
+        fun=lambda t, y: client.dudt_rhs_ivp(t, y, m1, m2, k1, k2),
+        t_span=(t[0], t[-1]),
+        y0=[1.0, 0.0, 0.0, 0.5],
+        method="DOP853",
+        t_eval=t,
+        atol=1.0e-12,
+        rtol=1.0e-12,
+    )
+    assert np.allclose(np.vstack((u, udot)), reference.y, atol=1.0e-8)
+    assert np.allclose(M @ uddot + K @ u, 0.0, atol=1.0e-10)
+
+    energy = 0.5 * np.einsum("it,ij,jt->t", udot, M, udot)
+    energy += 0.5 * np.einsum("it,ij,jt->t", u, K, u)
+    assert np.ptp(energy) < 1.0e-12 * energy[0]  # no drift
+
+
+def test_modal_solution_rigid_body_mode():
+    M = np.eye(2)
+    K = np.array([[1.0, -1.0], [-1.0, 1.0]])  # free-free, omega = 0 and sqrt(2)
+    t = np.linspace(0.0, 2.0, 5)
+
+    u, udot, _ = client.solve_modal(M, K, [0.0, 0.0], [1.0, 1.0], t)
+
+    assert np.allclose(u, [t, t])  # translates without vibrating
+    assert np.allclose(udot, 1.0)
+
+
+def test_chain_of_two_matches_two_dof_system():
+    m, K = client.chain_matrices([10.0, 1.0], [30.0, 5.0])
+    assert np.allclose(K.toarray(), [[35.0, -5.0], [-5.0, 5.0]])
+
+    y = np.array([0.3, -0.2, 1.0, 2.0])
+    expected = client.dudt_rhs_ivp(0.0, y, 10.0, 1.0, 30.0, 5.0)
+    assert np.allclose(client.dudt_rhs_chain(0.0, y, m, K), expected)
+
+
+def test_chain_jacobian_and_implicit_solver():
+    n = 200
+    rng = np.random.default_rng(0)
+    m, K = client.chain_matrices(rng.uniform(1.0, 2.0, n), rng.uniform(50.0, 100.0, n))
+    jacobian = client.jacobian_chain(m, K)
+
+    y = rng.standard_normal(2 * n)
+    step = rng.standard_normal(2 * n)
+    difference = client.dudt_rhs_chain(0.0, y + step, m, K)
+    difference -= client.dudt_rhs_chain(0.0, y, m, K)
+    assert np.allclose(jacobian @ step, difference)  # the RHS is linear
+
+    t = np.linspace(0.0, 0.5, 11)
+    u_at_0, udot_at_0 = np.zeros(n), -np.ones(n)
+    solution = solve_ivp(
+        fun=client.dudt_rhs_chain,
+        t_span=(t[0], t[-1]),
+        y0=np.concatenate((u_at_0, udot_at_0)),
+        method="BDF",
+        t_eval=t,
+        args=(m, K),
+        jac=jacobian,
+        atol=1.0e-10,
+        rtol=1.0e-8,
+    )
+    u, _, _ = client.solve_modal(np.diag(m), K.toarray(), u_at_0, udot_at_0, t)
+    assert np.allclose(solution.y[:n], u, atol=1.0e-5)
+
+
+def test_window_of_implicit_methods():
+    m, K = client.chain_matrices([10.0, 1.0], [30.0, 5.0])
+    y0 = np.array([1.0, 0.0, 0.0, 0.5])
+    t = np.linspace(0.0, 2.0, 21)
+    u, _, _ = client.solve_modal(np.diag(m), K.toarray(), y0[:2], y0[2:], t)
+    for method in ("BDF", "Radau", "LSODA"):
+        u_method, _, uddot = client.solve_window("ivp", m, K, y0, t, method)
+        assert uddot is None
+        assert np.allclose(u_method, u, atol=1.0e-2)
+    with pytest.raises(ValueError):
+        client.solve_window("modl", m, K, y0, t)
+
+
+def test_modal_window_is_limited_in_size(monkeypatch):
+    m, K = client.chain_matrices(np.ones(3), np.ones(3))
+    y0, t = np.zeros(6), np.linspace(0.0, 1.0, 3)
+    monkeypatch.setattr(client, "MODAL_MAX_DOF", 2)
+    with pytest.raises(ValueError):
+        client.solve_window("modal", m, K, y0, t)
+    u, _, _ = client.solve_window("ivp", m, K, y0, t)  # stays sparse
+    assert u.shape == (3, 3)
+
+
+def test_chain_from_numbered_keys_and_lists():
+    masses, stiffnesses, u_at_0, udot_at_0 = client.chain_from_model(
+        {"m1": 5.0, "m2": 1.0, "m3": 2.0, "k1": 3.0, "u2dot_at_0": -1.0}
+    )
+    assert masses == [5.0, 1.0, 2.0]
+    assert stiffnesses == [3.0, 1.0, 1.0]
+    assert u_at_0 == [0.1, 0.0, 0.0]
+    assert udot_at_0 == [0.0, -1.0, 0.0]
+
+    masses, stiffnesses, u_at_0, _ = client.chain_from_model(
+        {"masses": [1.0] * 4, "stiffnesses": [2.0] * 4}
+    )
+    assert len(masses) == len(stiffnesses) == len(u_at_0) == 4
+
+
+def test_npz_output_and_csv_export(tmp_path):
+    t = np.linspace(0.0, 1.0, 5)
+    u = np.vstack((np.sin(t), np.cos(t)))
+    results = dict(t=t, u=u, udot=2 * u, uddot=3 * u, ke=t, ie=2 * t, te=3 * t)
+    model = {"m1": 1.0, "output": "npz"}
+
+    client.write_npz(str(tmp_path / "run.npz"), results, model)
+    loaded, metadata = client.read_npz(str(tmp_path / "run.npz"))
+    assert metadata["model"] == model
+    assert metadata["shapes"]["u"] == [2, 5]
+    for name, values in results.items():
+        assert np.array_equal(loaded[name], values)
+
+    client.export_csv(str(tmp_path / "run.npz"))
+    names = list(client.channels_of(results))
+    assert names == ["u1", "u2", "u1dot", "u2dot", "u1ddot", "u2ddot", "ke", "ie", "te"]
+    u2dot = np.loadtxt(tmp_path / "run_t_u2dot.csv", delimiter=",")
+    assert np.allclose(u2dot, np.transpose([t, 2 * np.cos(t)]))
+
+
+def test_times_match_linspace():
+    t = np.linspace(0.3, 17.9, 1001)
+    assert np.array_equal(client.times(0.3, 17.9, 1001), t)
+    assert np.array_equal(client.times(0.3, 17.9, 1001, 990, 1001), t[990:])
+    assert np.array_equal(client.times(0.3, 17.9, 1001, 100, 250), t[100:250])
+
+
+@pytest.mark.parametrize("solver", ["ivp", "odeint"])
+@pytest.mark.parametrize("chunk_steps", [1, 2, 7, 8])  # 8 ends on a single time
+def test_streamed_run_matches_whole_run(solver, chunk_steps):
+    masses, stiffnesses = [10.0, 1.0, 2.0], [30.0, 5.0, 8.0]
+    m, K = client.chain_matrices(masses, stiffnesses)
+    y0 = np.array([1.0, 0.0, -0.5, 0.0, 0.5, 0.0])
+    nts = 201
+
+    chunks = list(
+        client.stream(solver, m, K, stiffnesses, y0, 0.0, 10.0, nts, chunk_steps)
+    )
+    assert [start for start, _ in chunks] == list(range(0, nts, chunk_steps))
+    results = {
+        name: np.concatenate([chunk[name] for _, chunk in chunks], axis=-1)
+        for name in chunks[0][1]
+    }
+    assert results["u"].shape == (3, nts)
+
+    t = np.linspace(0.0, 10.0, nts)
+    assert np.array_equal(results["t"], t)
+    uddot = np.gradient(results["udot"], t, axis=1, edge_order=2)
+    assert np.allclose(results["uddot"], uddot, rtol=1.0e-12, atol=1.0e-12)
+
+    u, udot, _ = client.solve_modal(np.diag(m), K.toarray(), y0[:3], y0[3:], t)
+    assert np.allclose(results["u"], u, atol=1.0e-2)  # default tolerances
+    ke, ie, te = client.energies(m, stiffnesses, u, udot)
+    assert np.allclose(results["te"], te, rtol=1.0e-3)
+
+
+def test_streamed_store_and_csv_export(tmp_path):
+    file_string = str(tmp_path / "run.json")
+    model = {"m1": 10.0, "m2": 1.0, "k1": 30.0, "k2": 5.0, "time_stop": 2.0}
+    with open(file_string, "w") as fout:
+        json.dump(dict(model, solver="modal", output="npy", chunk_steps=6), fout)
+
+    client.main([file_string])
+    results, metadata = client.read_store(str(tmp_path / "run.results"))
+    assert metadata["shapes"]["u"] == [2, 20]
+
+    with open(file_string, "w") as fout:
+        json.dump(dict(model, solver="modal"), fout)
+    client.main([file_string])  # the whole run, as csv
+    u2ddot = np.loadtxt(tmp_path / "run_t_u2ddot.csv", delimiter=",")
+    assert np.allclose(u2ddot, np.transpose([results["t"], results["uddot"][1]]))
+
+    client.export_csv(str(tmp_path / "run.results"))
+    exported = np.loadtxt(tmp_path / "run_t_u2ddot.csv", delimiter=",")
+    assert np.allclose(exported, u2ddot, rtol=1.0e-12, atol=1.0e-12)
+
+
+@pytest.mark.parametrize(
+    "key, value", [("solver", "modl"), ("method", "RK4"), ("output", "hdf5")]
+)
+def test_unknown_input_values_are_rejected(tmp_path, key, value):
+    file_string = str(tmp_path / "run.json")
+    with open(file_string, "w") as fout:
+        json.dump({"time_stop": 1.0, key: value}, fout)
+
+    with pytest.raises(ValueError, match=value):
+        client.main([file_string])
+    assert list(tmp_path.glob("run_*")) == []  # rejected before solving
@@ -12,10 +12,15 @@ Example:
 """
 
 from abc import ABC, abstractmethod
-from typing import NamedTuple
+from functools import partial
+from threading import Lock, RLock
+from typing import Callable, Hashable, NamedTuple, Optional, Sequence
+from weakref import WeakKeyDictionary, WeakMethod, ref
 
 # import numpy as np
 
+DEFAULT_TOPIC = "default"  # the topic used when no topic is specified
+
 
 class Subscriber(ABC):
     """The base class Subscriber for the Publish-Subscribe pattern.
@@ -38,6 +43,19 @@ class Subscriber(ABC):
         """
         pass
 
+    def publication_batch_callback(self, *, messages: Sequence) -> None:
+        """The batch callback method called by a Publisher's `publish_many`.
+        Descendants may override this method to receive a whole sequence (e.g., a
+        list or NumPy array) of messages in one call.  The default implementation
+        falls back to one `publication_callback` per message.
+
+        Keyword Arguments:
+            messages (Sequence): The publications, in order, from the publisher
+            to the subscriber.
+        """
+        for message in messages:
+            self.publication_callback(message=message)
+
 
 class ConcreteSubscriber(Subscriber):
     """This class is included as an example of how Subscriber descendants
@@ -66,60 +84,309 @@ class PublisherEvent(NamedTuple):
     resumed: str = "subscription was resumed"
 
 
+class RegistryStats(NamedTuple):
+    size: int  # number of subscribers currently registered
+    pruned: int  # number of subscribers pruned after being garbage collected
+
+
+class _WeakCallback:
+    """A callback that holds a weak reference to its subscriber, and does nothing
+    once the subscriber is garbage collected."""
+
+    __slots__ = ("_method",)
+
+    def __init__(self, method: WeakMethod):
+        self._method = method
+
+    def __call__(self, **kwargs) -> None:
+        method = self._method()
+        if method is not None:
+            method(**kwargs)
+
+
+def _weak_callback(method):
+    """Returns the callback wrapped to hold a weak reference to its subscriber.
+    Callbacks that are not bound methods, e.g., a function assigned to an
+    instance attribute, cannot be weakly referenced and are returned as is."""
+    try:
+        return _WeakCallback(WeakMethod(method))
+    except TypeError:
+        return method
+
+
+def _latest(message) -> None:
+    """The default conflation key, which keeps only the latest message."""
+    return None
+
+
+class _Conflator:
+    """The callback of a conflating subscription.
+
+    While the subscriber is busy in its callback or paused, new messages wait in
+    a pending dictionary with one entry per key, and a message replaces the
+    pending message of the same key.  When the subscriber is free, the pending
+    messages are delivered in order of their keys' first arrival.
+
+    Attributes:
+        conflated (int): The number of pending messages replaced by a newer
+            message of the same key, and thus never delivered.
+        paused (bool): If True, messages are held until `resume`.
+    """
+
+    def __init__(self, callback, key: Callable[..., Hashable], paused: bool):
+        self._callback = callback
+        self._key = key
+        self._pending = dict()  # key -> newest message not yet delivered
+        self._lock = Lock()
+        self._busy = False
+        self.conflated = 0
+        self.paused = paused
+
+    def __call__(self, *, message) -> None:
+        self.publish_many(messages=(message,))
+
+    def publish_many(self, *, messages: Sequence) -> None:
+        with self._lock:
+            for message in messages:
+                key = self._key(message)
+                if key in self._pending:
+                    self.conflated += 1
+                self._pending[key] = message
+            if self._busy or self.paused:
+                return
+            self._busy = True
+        self._drain()
+
+    def resume(self) -> None:
+        with self._lock:
+            self.paused = False
+            if self._busy or not self._pending:
+                return
+            self._busy = True
+        self._drain()
+
+    def _drain(self) -> None:
+        """Delivers pending messages until none remain.  Called as the only
+        deliverer, i.e., with `_busy` set."""
+        while True:
+            with self._lock:
+                if self.paused or not self._pending:
+                    self._busy = False  # decided under the lock, no message is lost
+                    return
+                key = next(iter(self._pending))
+                message = self._pending.pop(key)
+            try:
+                self._callback(message=message)
+            except BaseException:
+                with self._lock:
+                    self._busy = False
+                raise
+
+
 class Publisher(ABC):
     """The base class Publisher for the Publish-Subscribe pattern.
 
     Classes should inherit from this base class to receive the
     publish mechanism of the publish-subscribe pattern.
 
+    Subscribers register for one or more named topics.  For each topic, the
+    publisher keeps a precomputed tuple of the callbacks of its active
+    subscribers.  A new subscriber's callback is appended to the tuple, and the
+    tuple is rebuilt only when `unsubscribe`, `pause`, or `resume` changes it,
+    so `publish` only touches the subscribers that actually receive the
+    message.
+
+    In weak mode, the publisher holds only weak references to its subscribers, so
+    a subscriber that is no longer referenced elsewhere is garbage collected and
+    pruned from the publisher automatically, without `unsubscribe`.
+
+    The publisher is safe to use from several threads, and subscribers may
+    subscribe or unsubscribe from within a callback.  `subscribe`,
+    `unsubscribe`, `pause`, and `resume` take a lock and replace the channel
+    tuples of the affected topics only, while `publish` takes no lock and
+    delivers to the tuple of the channel current when it started.  The
+    `subscribers`, `topics`, and `conflated` properties return copies taken
+    under the lock.  The lifecycle event
+    callbacks (e.g., `events.subscribed`) are made after the lock is released.
+
+    A conflating subscription suits subscribers that only care about the latest
+    state, e.g., a view.  While such a subscriber is busy in its callback or is
+    paused, a new message replaces the pending message with the same key, so the
+    subscriber processes at most one pending update per key.  On `resume`, the
+    pending updates are delivered.  See `subscribe` and `conflated`.
+
     Attributes:
-        _subscribers (dict[Subscriber: callback (str)]): Dictionary map with keys
-            as Subscriber objects and values as the string callback methods
-            implemented in the Subscriber descendant.  The callback string defaults
-            to "update" if subscribers provide no callback method string.
+        _subscribers (dict[Subscriber: active (bool)]): Dictionary map with keys
+            as Subscriber objects and values as the subscription state, True if
+            active and False if paused.
+        _topics (dict[topic (str): dict[Subscriber: None]]): Dictionary map with
+            keys as topic names and values as the insertion-ordered collection of
+            Subscribers registered for that topic.
+        _channels (dict[topic (str): tuple[callback, ...]]): Dictionary map with
+            keys as topic names and values as the precomputed tuple of
+            `publication_callback` bound methods of the active subscribers.
+        _batch_channels (dict[topic (str): tuple[callback, ...]]): Dictionary map
+            with keys as topic names and values as the precomputed tuple of
+            `publication_batch_callback` bound methods of the active subscribers.
+        _entries (dict[topic (str): dict[id (int): callback]]): Dictionary map
+            with keys as topic names and values as the callbacks of the active
+            subscribers by subscriber id, in channel order, from which the
+            `_channels` tuples are made.
+        _batch_entries (dict[topic (str): dict[id (int): callback]]): As
+            `_entries`, for the `_batch_channels` tuples.
+        _weak (bool): If True, subscribers are held by weak reference, with
+            `_subscribers` and the values of `_topics` as `WeakKeyDictionary`s.
+        _watch (dict[id (int): weakref.ref]): Dictionary map, used in weak mode,
+            with keys as subscriber ids and values as the weak references that
+            trigger pruning once the subscriber is garbage collected.
+        _pruned (int): The number of subscribers pruned after being garbage
+            collected.
+        _conflators (dict[Subscriber: _Conflator]): Dictionary map with keys as
+            the Subscribers with a conflating subscription and values as their
+            conflating callbacks.
+        _lock (threading.RLock): Serializes changes to the dictionaries above.
     """
 
-    def __init__(self):
+    def __init__(self, weak: bool = False):
+        """
+        Arguments:
+            weak (bool): If True, the publisher holds only weak references to its
+                subscribers.  Defaults to False.
+        """
         super().__init__()
-        # self._subscribers = dict(Subscriber, bool)  # initialized as emtpy dictionary
-        self._subscribers = dict()  # initialized as emtpy dictionary
+        self._weak = weak
+        self._registry = WeakKeyDictionary if weak else dict
+        self._subscribers = self._registry()  # initialized as emtpy dictionary
+        self._topics = dict()  # topic -> subscribers registered for the topic
+        self._watch = dict()
+        self._pruned = 0
+        self._channels = dict()  # topic -> callbacks of active subscribers
+        self._batch_channels = dict()  # topic -> batch callbacks, same order
+        self._entries = dict()  # topic -> subscriber id -> callback
+        self._batch_entries = dict()  # topic -> subscriber id -> batch callback
+        self._conflators = self._registry()  # subscriber -> conflating callback
+        self._lock = RLock()  # held by writers only, never by publish
         self.events = PublisherEvent()  # publisher establishes these event strings
 
-    def subscribe(self, subscriber: Subscriber, active: bool = True) -> None:
+    def subscribe(
+        self,
+        subscriber: Subscriber,
+        active: bool = True,
+        topic: str = DEFAULT_TOPIC,
+        conflate: bool = False,
+        key: Optional[Callable[..., Hashable]] = None,
+    ) -> None:
         """Creates a subscription of the subscriber to a publisher.
 
+        Subscribing an existing subscriber to another topic adds the topic to the
+        subscriber's existing topics.
+
         Arguments:
             subscriber (Subscriber): A subscriber of the publication.
             active (bool): If False, the subscriber's publications are paused.  If
                 True, the subscriber's publications are resumed.  Defaults to True.
+            topic (str): The name of the topic subscribed to.  Defaults to
+                `DEFAULT_TOPIC`.
+            conflate (bool): If True, the subscription is conflating: while the
+                subscriber is busy or paused, a message replaces the pending
+                message with the same key.  A subscription, once conflating,
+                stays so until unsubscribed.  Defaults to False.
+            key (Callable[[message], Hashable]): Returns the conflation key of a
+                message.  Defaults to None, which keeps only the latest message.
         """
-        self._subscribers[subscriber] = active
+        with self._lock:
+            previous = self._subscribers.get(subscriber)  # None if unknown
+            joins = subscriber not in self._topics.get(topic, ())
+            if conflate and subscriber not in self._conflators:
+                joins = joins and previous is None  # its other topics change
+                callback = subscriber.publication_callback
+                if self._weak:
+                    callback = _weak_callback(callback)
+                self._conflators[subscriber] = _Conflator(
+                    callback, key=key or _latest, paused=not active
+                )
+            if previous is None:
+                self._subscribers[subscriber] = active
+            self._topics.setdefault(topic, self._registry())[subscriber] = None
+            if self._weak and id(subscriber) not in self._watch:
+                ident = id(subscriber)
+                self._watch[ident] = ref(subscriber, partial(self._on_collected, ident))
+            if previous not in (None, active):
+                self._set_active(subscriber, active)  # rebuilds all its topics
+            elif joins:
+                self._append(subscriber, topic)  # its other topics are unchanged
+            else:
+                self._rebuild(subscriber)
         subscriber.publication_callback(message=self.events.subscribed)
+        if previous is False and active:
+            conflator = self._conflators.get(subscriber)
+            if conflator is not None:
+                conflator.resume()  # delivers the pending updates
 
-    def unsubscribe(self, subscriber: Subscriber) -> None:
+    def unsubscribe(self, subscriber: Subscriber, topic: Optional[str] = None) -> None:
         """Deletes a subscriber from a publisher's dictionary of subscribers.
 
         Arguments:
             subscriber (Subscriber): A subscriber of the publication.
+            topic (str): If given, the subscriber leaves only this topic, and is
+                deleted from the publisher when no topics remain.  Defaults to
+                None, which deletes the subscriber from all topics.
 
         Raises:
             KeyError: if the subscriber is not in the publisher's dictionary of
                 subscribers.
         """
         try:
+            with self._lock:
+                names = self._topics_of(subscriber) if topic is None else (topic,)
+                if not names or subscriber not in self._topics.get(names[0], ()):
+                    raise KeyError(subscriber)
+                for name in names:
+                    members = self._topics[name]
+                    del members[subscriber]
+                    if not members:
+                        del self._topics[name]
+                self._rebuild(subscriber, topics=names)
+                if not self._topics_of(subscriber):
+                    del self._subscribers[subscriber]
+                    self._watch.pop(id(subscriber), None)
+                    self._conflators.pop(subscriber, None)
             subscriber.publication_callback(message=self.events.unsubscribed)
-            del self._subscribers[subscriber]
         except KeyError:
             print(f"Error: subscriber {subscriber} is unknown.")
 
-    def publish(self, message: str = "") -> None:
+    def publish(self, message: str = "", topic: str = DEFAULT_TOPIC) -> None:
         """Publishes a message (string) to subscribers via publish_callback function.
 
         This is the `push` implementation of the Publish-Subscribe pattern.
+
+        Arguments:
+            message (str): The publication.  Defaults to `""` (empty string).
+            topic (str): The name of the topic published to.  Only active
+                subscribers of this topic are notified.  Defaults to
+                `DEFAULT_TOPIC`.
         """
-        for subscriber, active in self._subscribers.items():
-            if active:
-                subscriber.publication_callback(message=message)
+        for callback in self._channels.get(topic, ()):
+            callback(message=message)
+
+    def publish_many(self, messages: Sequence, topic: str = DEFAULT_TOPIC) -> None:
+        """Publishes a sequence of messages to subscribers via the
+        publication_batch_callback function, one call per subscriber.
+
+        Subscribers that do not override `publication_batch_callback` receive one
+        `publication_callback` per message.
+
+        Arguments:
+            messages (Sequence): The publications, in order, e.g., a list of
+                strings or a NumPy array.  Other iterables are collected into a
+                tuple so every subscriber receives the same messages.
+            topic (str): The name of the topic published to.  Defaults to
+                `DEFAULT_TOPIC`.
+        """
+        if not hasattr(messages, "__len__"):
+            messages = tuple(messages)
+        for callback in self._batch_channels.get(topic, ()):
+            callback(messages=messages)
 
     def pause(self, subscriber: Subscriber) -> None:
         """Retains the connection between publisher and subscriber, but turns off
@@ -134,7 +401,7 @@ class Publisher(ABC):
                 subscribers.
         """
         try:
-            self._subscribers[subscriber] = False  # subscription is paused
+            self._set_active(subscriber, False)  # subscription is paused
             subscriber.publication_callback(message=self.events.paused)
         except KeyError:
             print(f"Error: subscriber {subscriber} is unknown.")
@@ -151,13 +418,141 @@ class Publisher(ABC):
             KeyError: if the subscriber is not in the publisher's dictionary of subscribers.
         """
         try:
-            self._subscribers[subscriber] = True  # subscription is resumed
+            self._set_active(subscriber, True)  # subscription is resumed
             subscriber.publication_callback(message=self.events.resumed)
+            conflator = self._conflators.get(subscriber)
+            if conflator is not None:
+                conflator.resume()  # delivers the pending updates
         except KeyError:
             print(f"Error: subscriber {subscriber} is unknown.")
 
+    def _set_active(self, subscriber: Subscriber, active: bool) -> None:
+        """Sets the subscription state of a known subscriber and rebuilds the
+        channels of its topics.
+
+        Raises:
+            KeyError: if the subscriber is not in the publisher's dictionary of
+                subscribers.
+        """
+        with self._lock:
+            if subscriber not in self._subscribers:
+                raise KeyError(subscriber)
+            if self._subscribers[subscriber] != active:
+                self._subscribers[subscriber] = active
+                self._rebuild(subscriber)
+            conflator = self._conflators.get(subscriber)
+            if conflator is not None and not active:
+                conflator.paused = True
+
+    def _topics_of(self, subscriber: Subscriber) -> tuple:
+        """Returns the names of the topics the subscriber is registered for."""
+        return tuple(
+            name for name, members in self._topics.items() if subscriber in members
+        )
+
+    def _rebuild(self, subscriber: Subscriber, topics: Optional[tuple] = None) -> None:
+        """Recomputes the channel of active callbacks for each topic affected by a
+        change to the subscriber.
+
+        Arguments:
+            subscriber (Subscriber): The subscriber whose subscription changed.
+            topics (tuple[str, ...]): The topics to rebuild.  Defaults to None,
+                which rebuilds all topics the subscriber is registered for.
+        """
+        if topics is None:
+            topics = self._topics_of(subscriber)
+        self._rebuild_topics(topics)
+
+    def _append(self, subscriber: Subscriber, topic: str) -> None:
+        """Appends the callbacks of a subscriber that joined a topic to the end of
+        the topic's channel, which is where a rebuild would put them, without
+        revisiting the topic's other subscribers.  Called with the lock held."""
+        found = self._callbacks_of(subscriber)
+        if found is None:
+            return
+        self._entries.setdefault(topic, dict())[id(subscriber)] = found[0]
+        self._batch_entries.setdefault(topic, dict())[id(subscriber)] = found[1]
+        # the batch channel first, as publish reads each channel on its own
+        batch_channels, channels = self._batch_channels, self._channels
+        batch_channels[topic] = batch_channels.get(topic, ()) + (found[1],)
+        channels[topic] = channels.get(topic, ()) + (found[0],)
+
+    def _refresh(self, topic: str) -> None:
+        """Replaces the channel tuples of a topic with the callbacks of its
+        entries.  Called with the lock held."""
+        if self._entries.get(topic):
+            # the batch channel first, as publish reads each channel on its own
+            self._batch_channels[topic] = tuple(self._batch_entries[topic].values())
+            self._channels[topic] = tuple(self._entries[topic].values())
+        else:
+            self._entries.pop(topic, None)
+            self._batch_entries.pop(topic, None)
+            self._channels.pop(topic, None)
+            self._batch_channels.pop(topic, None)
+
+    def _callbacks_of(self, subscriber: Subscriber) -> Optional[tuple]:
+        """Returns the callback and the batch callback that deliver to the
+        subscriber, or None if the subscriber is paused and not conflating."""
+        conflator = self._conflators.get(subscriber)
+        if conflator is not None:  # also receives while paused
+            return conflator, conflator.publish_many
+        if not self._subscribers.get(subscriber, False):
+            return None
+        callback = subscriber.publication_callback
+        batch_callback = subscriber.publication_batch_callback
+        if self._weak:
+            callback = _weak_callback(callback)
+            batch_callback = _weak_callback(batch_callback)
+        return callback, batch_callback
+
+    def _rebuild_topics(self, topics: tuple) -> None:
+        """Recomputes the callbacks of the active subscribers of each of the
+        topics, and replaces their channel tuples.  Called with the lock held."""
+        for name in topics:
+            entries, batch_entries = dict(), dict()
+            for item in self._topics.get(name, ()):
+                found = self._callbacks_of(item)
+                if found is not None:
+                    entries[id(item)], batch_entries[id(item)] = found
+            self._entries[name], self._batch_entries[name] = entries, batch_entries
+            self._refresh(name)
+
+    def _on_collected(self, key: int, reference: ref) -> None:
+        """Prunes a garbage collected subscriber from the channels of its topics
+        only, so collecting many subscribers does not rebuild every channel once
+        per subscriber.  The weak dictionaries drop the subscriber on their own."""
+        with self._lock:
+            if self._watch.pop(key, None) is not None:
+                self._pruned += 1
+                for name in [n for n, item in self._entries.items() if key in item]:
+                    del self._entries[name][key], self._batch_entries[name][key]
+                    self._refresh(name)
+
     @property
     def subscribers(self) -> dict:
         """Returns the publisher's dictionary of current subscribers and their repective
-        callbacks."""
-        return self._subscribers
+        subscription states."""
+        with self._lock:
+            return self._subscribers.copy()
+
+    @property
+    def topics(self) -> dict:
+        """Returns the publisher's dictionary of topic names and the tuple of
+        subscribers registered for each topic."""
+        with self._lock:
+            topics = {name: tuple(members) for name, members in self._topics.items()}
+        return {name: members for name, members in topics.items() if members}
+
+    @property
+    def conflated(self) -> dict:
+        """Returns the publisher's dictionary of subscribers with a conflating
+        subscription and the number of their messages replaced by a newer message
+        of the same key, and thus never delivered."""
+        with self._lock:
+            return {item: box.conflated for item, box in self._conflators.items()}
+
+    @property
+    def registry_stats(self) -> RegistryStats:
+        """Returns the number of subscribers currently registered and the number of
+        subscribers pruned after being garbage collected."""
+        return RegistryStats(size=len(self._subscribers), pruned=self._pruned)
@@ -0,0 +1,421 @@
+"""
+The module implements an asyncio version of the Publish-Subscribe pattern.
+
+The `AsyncPublisher` gives each Subscriber its own bounded queue and its own
+delivery task, so a slow Subscriber does not stall the Publisher or the
+other Subscribers.  Subscribers may implement `publication_callback` either as a
+regular method or as an `async def` coroutine.
+
+When a Subscriber's queue is full, the overflow policy decides what happens to
+a new publication:
+
+* `block`: the Publisher waits until the queue has room.
+* `drop-oldest`: the oldest queued publication is discarded.
+* `drop-newest`: the new publication is discarded.
+* `coalesce`: the newest queued publication is replaced by the new one.
+
+Lifecycle events, e.g., `events.subscribed`, are always queued, even to a full
+queue, do not count toward the queue size, and are never dropped or replaced by
+a publication.
+
+Example:
+    > async def main():
+    >     pub = AsyncPublisher(maxsize=8, policy=OVERFLOW.drop_oldest)
+    >     await pub.subscribe(ConcreteSubscriber(name="Annie", verbose=True))
+    >     await pub.publish(pub.events.publication)
+    >     await pub.join()  # wait until all queued publications are delivered
+    >     await pub.aclose()
+    >
+    > asyncio.run(main())
+"""
+
+import asyncio
+from collections import deque
+import inspect
+from typing import NamedTuple, Optional
+
+from pyschool.pattern.publish_subscribe import (
+    DEFAULT_TOPIC,
+    PublisherEvent,
+    Subscriber,
+)
+
+
+class OverflowPolicy(NamedTuple):
+    block: str = "block"
+    drop_oldest: str = "drop-oldest"
+    drop_newest: str = "drop-newest"
+    coalesce: str = "coalesce"
+
+
+OVERFLOW = OverflowPolicy()  # the overflow policies known to AsyncPublisher
+
+_CLOSE = object()  # sentinel that ends a mailbox's delivery task
+
+
+class _Event(NamedTuple):
+    """A queued lifecycle event, which the overflow policy does not apply to."""
+
+    message: str
+
+
+class _Mailbox:
+    """The bounded queue and delivery task of a single subscriber.
+
+    The queue holds publications and lifecycle events in order.  Only
+    publications count toward `maxsize`, and only publications are dropped or
+    replaced by the overflow policy.
+
+    Attributes:
+        subscriber (Subscriber): The subscriber the mailbox delivers to.
+        maxsize (int): The number of publications the queue holds before the
+            overflow policy applies.  If less than or equal to zero, the queue
+            size is unbounded.
+        policy (str): The overflow policy, one of `OVERFLOW`.
+        queue (collections.deque): The publications and `_Event`s waiting to be
+            delivered, oldest first.
+        dropped (int): The number of publications dropped or coalesced because
+            the queue was full.
+        closed (bool): If True, the mailbox discards new publications.
+        task (asyncio.Task): The task that delivers queued publications.
+    """
+
+    def __init__(
+        self, subscriber: Subscriber, maxsize: int, policy: str, offload_sync: bool
+    ):
+        if policy not in OVERFLOW:
+            raise ValueError(f"Unknown overflow policy '{policy}'.")
+        self.subscriber = subscriber
+        self.maxsize = maxsize
+        self.policy = policy
+        self.queue = deque()
+        self.dropped = 0
+        self.closed = False
+        self._publications = 0  # the publications in the queue
+        self._arrived = asyncio.Event()  # set when an item is queued
+        self._room = asyncio.Event()  # set when a publication leaves the queue
+        self._idle = asyncio.Event()  # set when every item is delivered
+        self._idle.set()
+        self._offload_sync = offload_sync
+        self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def put(self, message) -> None:
+        """Queues a publication according to the overflow policy."""
+        if self._full():
+            if self.policy == OVERFLOW.block:
+                while self._full() and not self.closed:
+                    self._room.clear()
+                    await self._room.wait()
+            elif self.policy == OVERFLOW.drop_oldest:
+                self._remove_oldest()
+                self.dropped += 1
+            elif self.policy == OVERFLOW.drop_newest:
+                self.dropped += 1
+                return
+            elif not isinstance(self.queue[-1], _Event):  # OVERFLOW.coalesce
+                self.queue[-1] = message
+                self.dropped += 1
+                return
+            # else, a queue ending with an event takes one more publication
+        if self.closed:
+            return  # the subscriber left while the publisher was blocked
+        self._publications += 1
+        self._append(message)
+
+    def put_event(self, message: str) -> None:
+        """Queues a lifecycle event, bypassing the overflow policy."""
+        self._append(_Event(message))
+
+    async def join(self) -> None:
+        """Waits until every queued item is delivered."""
+        await self._idle.wait()
+
+    async def close(self) -> None:
+        """Delivers the items already queued, then ends the delivery task."""
+        self._shut()
+        self._append(_Event(_CLOSE))
+        await self.task
+
+    async def cancel(self) -> None:
+        """Ends the delivery task, discarding the items not yet delivered."""
+        self._shut()
+        self.task.cancel()
+        await asyncio.gather(self.task, return_exceptions=True)
+
+    def _shut(self) -> None:
+        self.closed = True
+        self._room.set()  # releases the publishers blocked on a full queue
+
+    def _full(self) -> bool:
+        return 0 < self.maxsize <= self._publications
+
+    def _append(self, item) -> None:
+        self.queue.append(item)
+        self._idle.clear()
+        self._arrived.set()
+
+    def _remove_oldest(self) -> None:
+        """Removes the oldest publication, skipping events."""
+        for index, item in enumerate(self.queue):
+            if not isinstance(item, _Event):
+                del self.queue[index]
+                self._publications -= 1
+                return
+
+    async def _run(self) -> None:
+        callback = self.subscriber.publication_callback
+        is_coroutine = inspect.iscoroutinefunction(callback)
+        while True:
+            while not self.queue:
+                self._idle.set()
+                self._arrived.clear()
+                await self._arrived.wait()
+            message = self.queue.popleft()
+            if isinstance(message, _Event):
+                message = message.message
+                if message is _CLOSE:
+                    self._idle.set()
+                    return
+            else:
+                self._publications -= 1
+                self._room.set()
+            try:
+                if is_coroutine:
+                    await callback(message=message)
+                elif self._offload_sync:
+                    await asyncio.to_thread(callback, message=message)
+                else:
+                    callback(message=message)
+            except Exception as error:
+                print(f"Error: subscriber {self.subscriber} raised {error!r}.")
+
+
+class AsyncPublisher:
+    """The asyncio Publisher for the Publish-Subscribe pattern.
+
+    The API mirrors `Publisher`, with coroutine methods that must be awaited
+    from within a running event loop.
+
+    Attributes:
+        _subscribers (dict[Subscriber: active (bool)]): Dictionary map with keys
+            as Subscriber objects and values as the subscription state, True if
+            active and False if paused.
+        _topics (dict[topic (str): dict[Subscriber: None]]): Dictionary map with
+            keys as topic names and values as the insertion-ordered collection of
+            Subscribers registered for that topic.
+        _mailboxes (dict[Subscriber: _Mailbox]): Dictionary map with keys as
+            Subscriber objects and values as their queue and delivery task.
+        _channels (dict[topic (str): tuple[_Mailbox, ...]]): Dictionary map with
+            keys as topic names and values as the precomputed tuple of mailboxes
+            of the active subscribers.
+    """
+
+    def __init__(
+        self, maxsize: int = 64, policy: str = OVERFLOW.block, offload_sync: bool = True
+    ):
+        """
+        Arguments:
+            maxsize (int): The default queue size per subscriber.  If less than or
+                equal to zero, the queue size is unbounded.  Defaults to 64.
+            policy (str): The default overflow policy, one of `OVERFLOW`.
+                Defaults to `OVERFLOW.block`.
+            offload_sync (bool): If True, regular (not `async def`) callbacks run in
+                a worker thread via `asyncio.to_thread`, so a slow regular callback
+                does not block the event loop.  If False, they run on the event
+                loop.  Defaults to True.
+        """
+        super().__init__()
+        self._maxsize = maxsize
+        self._policy = policy
+        self._offload_sync = offload_sync
+        self._subscribers = dict()
+        self._topics = dict()
+        self._mailboxes = dict()
+        self._channels = dict()
+        self._closed = False
+        self.events = PublisherEvent()
+
+    async def subscribe(
+        self,
+        subscriber: Subscriber,
+        active: bool = True,
+        topic: str = DEFAULT_TOPIC,
+        maxsize: Optional[int] = None,
+        policy: Optional[str] = None,
+    ) -> None:
+        """Creates a subscription of the subscriber to a publisher.
+
+        Arguments:
+            subscriber (Subscriber): A subscriber of the publication.
+            active (bool): If False, the subscriber's publications are paused.  If
+                True, the subscriber's publications are resumed.  Defaults to True.
+            topic (str): The name of the topic subscribed to.  Defaults to
+                `DEFAULT_TOPIC`.
+            maxsize (int): The subscriber's queue size.  Defaults to None, which
+                uses the publisher's default.  Used only on first subscription.
+            policy (str): The subscriber's overflow policy.  Defaults to None,
+                which uses the publisher's default.  Used only on first
+                subscription.
+
+        Raises:
+            RuntimeError: if the publisher is closed.
+        """
+        self._check_open()
+        if subscriber not in self._mailboxes:
+            self._mailboxes[subscriber] = _Mailbox(
+                subscriber,
+                maxsize=self._maxsize if maxsize is None else maxsize,
+                policy=self._policy if policy is None else policy,
+                offload_sync=self._offload_sync,
+            )
+        self._subscribers[subscriber] = active
+        self._topics.setdefault(topic, dict())[subscriber] = None
+        self._rebuild(subscriber)
+        self._mailboxes[subscriber].put_event(self.events.subscribed)
+
+    async def unsubscribe(
+        self, subscriber: Subscriber, topic: Optional[str] = None
+    ) -> None:
+        """Deletes a subscriber from a publisher's dictionary of subscribers.
+
+        A subscriber deleted from all topics receives its already queued
+        publications before its delivery task ends.
+
+        Arguments:
+            subscriber (Subscriber): A subscriber of the publication.
+            topic (str): If given, the subscriber leaves only this topic.  Defaults
+                to None, which deletes the subscriber from all topics.
+
+        Raises:
+            KeyError: if the subscriber is not in the publisher's dictionary of
+                subscribers.
+        """
+        try:
+            topics = self._topics_of(subscriber) if topic is None else (topic,)
+            if not topics or subscriber not in self._topics.get(topics[0], ()):
+                raise KeyError(subscriber)
+            for name in topics:
+                members = self._topics[name]
+                del members[subscriber]
+                if not members:
+                    del self._topics[name]
+            self._rebuild(subscriber, topics=topics)
+            mailbox = self._mailboxes[subscriber]
+            mailbox.put_event(self.events.unsubscribed)
+            if not self._topics_of(subscriber):
+                del self._subscribers[subscriber]
+                del self._mailboxes[subscriber]
+                await mailbox.close()
+        except KeyError:
+            print(f"Error: subscriber {subscriber} is unknown.")
+
+    async def publish(self, message: str = "", topic: str = DEFAULT_TOPIC) -> None:
+        """Queues a message to the active subscribers of a topic.
+
+        Returns once the message is queued, not once it is delivered.  Only a
+        subscriber with the `block` policy and a full queue makes the publisher
+        wait.
+
+        Arguments:
+            message (str): The publication.  Defaults to `""` (empty string).
+            topic (str): The name of the topic published to.  Defaults to
+                `DEFAULT_TOPIC`.
+
+        Raises:
+            RuntimeError: if the publisher is closed.
+        """
+        self._check_open()
+        for mailbox in self._channels.get(topic, ()):
+            await mailbox.put(message)
+
+    async def pause(self, subscriber: Subscriber) -> None:
+        """Turns off notifications from the publisher to subscriber.  Publications
+        already queued are still delivered.  See also `resume` method.
+
+        Raises:
+            KeyError: if the subscriber is not in the publisher's dictionary of
+                subscribers.
+        """
+        try:
+            self._set_active(subscriber, False)
+            self._mailboxes[subscriber].put_event(self.events.paused)
+        except KeyError:
+            print(f"Error: subscriber {subscriber} is unknown.")
+
+    async def resume(self, subscriber: Subscriber) -> None:
+        """Turns on notifications from the publisher to subscriber.  See also
+        `pause` method.
+
+        Raises:
+            KeyError: if the subscriber is not in the publisher's dictionary of
+                subscribers.
+        """
+        try:
+            self._set_active(subscriber, True)
+            self._mailboxes[subscriber].put_event(self.events.resumed)
+        except KeyError:
+            print(f"Error: subscriber {subscriber} is unknown.")
+
+    async def join(self) -> None:
+        """Waits until every queued publication has been delivered."""
+        await asyncio.gather(*(item.join() for item in self._mailboxes.values()))
+
+    async def aclose(self) -> None:
+        """Cancels the delivery tasks of all subscribers, discarding publications
+        not yet delivered, and deletes all subscribers.  A closed publisher
+        cannot be subscribed or published to."""
+        self._closed = True
+        mailboxes = list(self._mailboxes.values())
+        self._subscribers.clear()
+        self._topics.clear()
+        self._mailboxes.clear()
+        self._channels.clear()
+        await asyncio.gather(*(item.cancel() for item in mailboxes))
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("AsyncPublisher is closed.")
+
+    def _set_active(self, subscriber: Subscriber, active: bool) -> None:
+        if subscriber not in self._subscribers:
+            raise KeyError(subscriber)
+        if self._subscribers[subscriber] != active:
+            self._subscribers[subscriber] = active
+            self._rebuild(subscriber)
+
+    def _topics_of(self, subscriber: Subscriber) -> tuple:
+        return tuple(
+            name for name, members in self._topics.items() if subscriber in members
+        )
+
+    def _rebuild(self, subscriber: Subscriber, topics: Optional[tuple] = None) -> None:
+        if topics is None:
+            topics = self._topics_of(subscriber)
+        for name in topics:
+            mailboxes = tuple(
+                self._mailboxes[item]
+                for item in self._topics.get(name, ())
+                if self._subscribers.get(item, False)
+            )
+            if mailboxes:
+                self._channels[name] = mailboxes
+            else:
+                self._channels.pop(name, None)
+
+    @property
+    def subscribers(self) -> dict:
+        """Returns the publisher's dictionary of current subscribers and their
+        respective subscription states."""
+        return self._subscribers
+
+    @property
+    def topics(self) -> dict:
+        """Returns the publisher's dictionary of topic names and the tuple of
+        subscribers registered for each topic."""
+        return {name: tuple(members) for name, members in self._topics.items()}
+
+    @property
+    def dropped(self) -> dict:
+        """Returns the publisher's dictionary of current subscribers and the number
+        of their publications dropped or coalesced by the overflow policy."""
+        return {item: box.dropped for item, box in self._mailboxes.items()}
@@ -7,8 +7,40 @@ Example:
 """
 
 # import pytest
+import gc
+import sys
+import threading
 
-from pyschool.pattern.publish_subscribe import Publisher, ConcreteSubscriber
+from pyschool.pattern.publish_subscribe import (
+    Publisher,
+    ConcreteSubscriber,
+    Subscriber,
+    DEFAULT_TOPIC,
+    RegistryStats,
+)
+
+
+class RecordingSubscriber(Subscriber):
+    """A Subscriber that records the messages it receives, for testing."""
+
+    def __init__(self, *, name: str):
+        super().__init__()
+        self.name = name
+        self.messages = []
+
+    def publication_callback(self, *, message: str = "") -> None:
+        self.messages.append(message)
+
+
+class BatchSubscriber(RecordingSubscriber):
+    """A Subscriber that implements the batch hook, for testing."""
+
+    def __init__(self, *, name: str):
+        super().__init__(name=name)
+        self.batches = []
+
+    def publication_batch_callback(self, *, messages) -> None:
+        self.batches.append(messages)
 
 
 def test_publisher_constructor():
@@ -126,3 +158,297 @@ def test_pub_sub_scenario():
 
     # Confirm Cali doees again receive publications.
     pub.publish(pub.events.publication)
+
+
+def test_topic_dispatch():
+    pub = Publisher()
+    annie = RecordingSubscriber(name="Annie")
+    bobby = RecordingSubscriber(name="Bobby")
+    pub.subscribe(annie, topic="sports")
+    pub.subscribe(bobby, topic="weather")
+    pub.subscribe(bobby, topic="sports")
+    annie.messages.clear()
+    bobby.messages.clear()
+
+    pub.publish("goal", topic="sports")
+    pub.publish("rain", topic="weather")
+    pub.publish("nobody listens", topic="finance")
+    pub.publish("nobody listens")  # DEFAULT_TOPIC has no subscribers
+
+    assert annie.messages == ["goal"]
+    assert bobby.messages == ["goal", "rain"]
+    assert pub.topics == {"sports": (annie, bobby), "weather": (bobby,)}
+
+
+def test_topic_channels_rebuilt_on_pause_resume_unsubscribe():
+    pub = Publisher()
+    annie = RecordingSubscriber(name="Annie")
+    bobby = RecordingSubscriber(name="Bobby")
+    pub.subscribe(annie)
+    pub.subscribe(bobby, active=False)
+    assert len(pub._channels[DEFAULT_TOPIC]) == 1
+
+    pub.resume(bobby)
+    assert len(pub._channels[DEFAULT_TOPIC]) == 2
+
+    pub.pause(annie)
+    annie.messages.clear()
+    pub.publish("news")
+    assert annie.messages == []
+    assert bobby.messages[-1] == "news"
+
+    pub.unsubscribe(bobby)
+    assert bobby not in pub.subscribers
+    assert DEFAULT_TOPIC not in pub._channels  # only paused Annie remains
+
+    pub.pause(bobby)  # unknown subscriber, declined gracefully
+    assert bobby not in pub.subscribers
+
+
+def test_unsubscribe_single_topic():
+    pub = Publisher()
+    annie = RecordingSubscriber(name="Annie")
+    pub.subscribe(annie, topic="sports")
+    pub.subscribe(annie, topic="weather")
+
+    pub.unsubscribe(annie, topic="sports")
+    assert annie in pub.subscribers
+    assert pub.topics == {"weather": (annie,)}
+
+    pub.unsubscribe(annie, topic="weather")
+    assert annie not in pub.subscribers
+    assert pub.topics == {}
+
+
+def test_publish_many():
+    pub = Publisher()
+    annie = RecordingSubscriber(name="Annie")  # per-message fallback
+    bobby = BatchSubscriber(name="Bobby")  # batch hook
+    cali = RecordingSubscriber(name="Cali")  # paused
+    for sub in (annie, bobby, cali):
+        pub.subscribe(sub)
+    pub.pause(cali)
+    for sub in (annie, bobby, cali):
+        sub.messages.clear()
+
+    pub.publish_many(["a", "b", "c"])
+    pub.publish_many(item for item in ("d", "e"))  # a generator is collected
+
+    assert annie.messages == ["a", "b", "c", "d", "e"]
+    assert bobby.messages == []
+    assert bobby.batches == [["a", "b", "c"], ("d", "e")]
+    assert cali.messages == []
+
+
+def test_weak_registry_prunes_collected_subscribers():
+    pub = Publisher(weak=True)
+    annie = RecordingSubscriber(name="Annie")
+    pub.subscribe(annie, topic="sports")
+    pub.subscribe(RecordingSubscriber(name="Bobby"), topic="sports")
+    pub.subscribe(RecordingSubscriber(name="Cali"), topic="weather")
+    gc.collect()
+
+    assert pub.registry_stats == RegistryStats(size=1, pruned=2)
+    assert pub.topics == {"sports": (annie,)}
+    assert len(pub._channels["sports"]) == 1
+    assert "weather" not in pub._channels
+
+    pub.publish("goal", topic="sports")
+    assert annie.messages[-1] == "goal"
+
+    pub.unsubscribe(annie)  # explicit unsubscribe is not counted as a prune
+    del annie
+    gc.collect()
+    assert pub.registry_stats == RegistryStats(size=0, pruned=2)
+
+
+def test_weak_registry_prunes_only_the_topics_of_a_collected_subscriber():
+    pub = Publisher(weak=True)
+    readers = [RecordingSubscriber(name=f"Reader {i}") for i in range(3)]
+    for reader in readers:
+        pub.subscribe(reader, topic="sports")
+    pub.subscribe(readers[0], topic="weather")
+    weather = pub._channels["weather"]
+
+    del reader
+    readers.pop()
+    gc.collect()
+
+    assert pub.registry_stats == RegistryStats(size=2, pruned=1)
+    assert len(pub._channels["sports"]) == 2
+    assert pub._channels["weather"] is weather  # not rebuilt
+    pub.publish("goal", topic="sports")
+    assert [reader.messages[-1] for reader in readers] == ["goal", "goal"]
+
+
+def test_strong_registry_keeps_subscribers():
+    pub = Publisher()
+    pub.subscribe(RecordingSubscriber(name="Annie"))
+    gc.collect()
+    assert pub.registry_stats == RegistryStats(size=1, pruned=0)
+
+
+class ReentrantSubscriber(RecordingSubscriber):
+    """A Subscriber that changes the subscriptions from within its callback."""
+
+    def __init__(self, *, name: str, publisher: Publisher, newcomer: Subscriber):
+        super().__init__(name=name)
+        self.publisher = publisher
+        self.newcomer = newcomer
+
+    def publication_callback(self, *, message: str = "") -> None:
+        super().publication_callback(message=message)
+        if message == "news":
+            self.publisher.unsubscribe(self)
+            self.publisher.subscribe(self.newcomer)
+
+
+def test_reentrant_subscription_changes_during_publish():
+    pub = Publisher()
+    newcomer = RecordingSubscriber(name="Newcomer")
+    annie = ReentrantSubscriber(name="Annie", publisher=pub, newcomer=newcomer)
+    bobby = RecordingSubscriber(name="Bobby")
+    pub.subscribe(annie)
+    pub.subscribe(bobby)
+
+    pub.publish("news")  # must not raise, delivers to the snapshot at start
+
+    assert "news" in bobby.messages
+    assert "news" not in newcomer.messages  # joined after publish started
+    assert set(pub.subscribers) == {bobby, newcomer}
+
+    pub.publish("more news")
+    assert annie.messages.count("more news") == 0
+    assert newcomer.messages[-1] == "more news"
+
+
+def test_concurrent_publish_and_subscription_changes():
+    pub = Publisher()
+    steady = RecordingSubscriber(name="Steady")
+    pub.subscribe(steady)
+    churners = [RecordingSubscriber(name=f"Churn {i}") for i in range(16)]
+    publishers, messages, rounds = 8, 500, 200
+    errors = []
+    start = threading.Barrier(publishers + len(churners))
+
+    def publish():
+        try:
+            start.wait()
+            for _ in range(messages):
+                pub.publish("tick")
+                pub.publish_many(("tock",))
+        except Exception as error:
+            errors.append(error)
+
+    def churn(subscriber):
+        try:
+            start.wait()
+            for i in range(rounds):
+                pub.subscribe(subscriber, topic=f"topic {i % 3}")
+                pub.pause(subscriber)
+                pub.resume(subscriber)
+                pub.unsubscribe(subscriber)
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=publish) for _ in range(publishers)]
+    threads += [threading.Thread(target=churn, args=(item,)) for item in churners]
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # switch threads often to provoke races
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert errors == []
+    assert steady.messages.count("tick") == publishers * messages
+    assert steady.messages.count("tock") == publishers * messages
+    assert set(pub.subscribers) == {steady}
+    assert pub.topics == {DEFAULT_TOPIC: (steady,)}
+
+
+def test_conflating_subscription_while_paused():
+    pub = Publisher()
+    view = RecordingSubscriber(name="View")
+    log = RecordingSubscriber(name="Log")
+    pub.subscribe(view, conflate=True, key=lambda message: message[0])
+    pub.subscribe(log)
+    pub.pause(view)
+    view.messages.clear()
+    log.messages.clear()
+
+    for message in [("agent", 1), ("landmark", 1), ("agent", 2), ("agent", 3)]:
+        pub.publish(message)
+    assert view.messages == []
+
+    pub.resume(view)
+    assert view.messages == [pub.events.resumed, ("agent", 3), ("landmark", 1)]
+    assert len(log.messages) == 4  # not conflating, receives everything
+    assert pub.conflated == {view: 2}
+
+    pub.publish_many([("agent", 4), ("agent", 5)])
+    assert view.messages[-1] == ("agent", 5)
+    assert pub.conflated == {view: 3}
+
+    pub.unsubscribe(view)
+    assert pub.conflated == {}
+
+
+def test_conflating_subscription_paused_by_subscribe():
+    pub = Publisher()
+    view = RecordingSubscriber(name="View")
+    pub.subscribe(view, conflate=True)
+    pub.subscribe(view, active=False)
+    view.messages.clear()
+
+    pub.publish("a")
+    pub.publish("b")
+
+    assert view.messages == []
+    assert pub.subscribers == {view: False}
+    pub.resume(view)
+    assert view.messages == [pub.events.resumed, "b"]
+
+
+def test_conflating_subscription_resumed_by_subscribe():
+    pub = Publisher()
+    view = RecordingSubscriber(name="View")
+    pub.subscribe(view, conflate=True, active=False)
+    view.messages.clear()
+
+    pub.publish("a")
+    assert view.messages == []
+    pub.subscribe(view, active=True)
+    pub.publish("b")
+
+    assert view.messages == [pub.events.subscribed, "a", "b"]
+    assert pub.subscribers == {view: True}
+
+
+class BusySubscriber(RecordingSubscriber):
+    """A Subscriber whose callback triggers more publications while it is busy."""
+
+    def __init__(self, *, name: str, publisher: Publisher):
+        super().__init__(name=name)
+        self.publisher = publisher
+
+    def publication_callback(self, *, message: str = "") -> None:
+        super().publication_callback(message=message)
+        if message == "frame 0":
+            for i in range(1, 4):
+                self.publisher.publish(f"frame {i}")
+
+
+def test_conflating_subscription_while_busy():
+    pub = Publisher()
+    view = BusySubscriber(name="View", publisher=pub)
+    pub.subscribe(view, conflate=True)
+    view.messages.clear()
+
+    pub.publish("frame 0")
+
+    assert view.messages == ["frame 0", "frame 3"]
+    assert pub.conflated[view] == 2
@@ -0,0 +1,167 @@
+"""
+This module tests the asyncio Publish-Subscribe pattern.
+
+Example:
+    > conda activate pyschool-env
+    > pytest src/pyschool/pattern/tests/test_publish_subscribe_async.py -rP
+"""
+
+import asyncio
+
+import pytest
+
+from pyschool.pattern.publish_subscribe import Subscriber
+from pyschool.pattern.publish_subscribe_async import AsyncPublisher, OVERFLOW
+
+
+class AsyncRecordingSubscriber(Subscriber):
+    """A Subscriber with an `async def` callback that records publications."""
+
+    def __init__(self, *, name: str, delay: float = 0.0):
+        super().__init__()
+        self.name = name
+        self.delay = delay
+        self.messages = []
+
+    async def publication_callback(self, *, message: str = "") -> None:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.messages.append(message)
+
+
+class SyncRecordingSubscriber(Subscriber):
+    """A Subscriber with a regular callback that records publications."""
+
+    def __init__(self, *, name: str):
+        super().__init__()
+        self.name = name
+        self.messages = []
+
+    def publication_callback(self, *, message: str = "") -> None:
+        self.messages.append(message)
+
+
+def test_fast_subscriber_independent_of_slow_subscriber():
+    async def scenario():
+        pub = AsyncPublisher(maxsize=4, policy=OVERFLOW.drop_oldest)
+        fast = AsyncRecordingSubscriber(name="Fast")
+        slow = AsyncRecordingSubscriber(name="Slow", delay=0.05)
+        await pub.subscribe(fast)
+        await pub.subscribe(slow)
+
+        for i in range(20):
+            await pub.publish(f"{i}")
+        await asyncio.sleep(0.01)
+
+        # the fast subscriber has everything long before the slow one finishes
+        assert fast.messages[-1] == "19"
+        assert len(slow.messages) <= 1
+        await pub.join()
+        assert pub.dropped[slow] > 0
+        await pub.aclose()
+        return slow
+
+    slow = asyncio.run(scenario())
+    assert slow.messages[-1] == "19"  # the newest publication is never dropped
+
+
+@pytest.mark.parametrize(
+    "policy, expected",
+    [
+        (OVERFLOW.block, ["0", "1", "2", "3", "4"]),
+        (OVERFLOW.drop_oldest, ["3", "4"]),
+        (OVERFLOW.drop_newest, ["0", "1"]),
+        (OVERFLOW.coalesce, ["0", "4"]),
+    ],
+)
+def test_overflow_policy(policy, expected):
+    async def scenario():
+        pub = AsyncPublisher(maxsize=2, policy=policy, offload_sync=False)
+        sub = SyncRecordingSubscriber(name="Annie")
+        await pub.subscribe(sub)
+        await pub.join()
+        sub.messages.clear()
+
+        # publish without yielding to the delivery task, except when blocked
+        for i in range(5):
+            await pub.publish(f"{i}")
+        await pub.join()
+        await pub.aclose()
+        return sub
+
+    sub = asyncio.run(scenario())
+    assert sub.messages == expected
+
+
+@pytest.mark.parametrize(
+    "policy, expected",
+    [
+        (OVERFLOW.block, ["0", "1", "2"]),
+        (OVERFLOW.drop_oldest, ["2"]),
+        (OVERFLOW.drop_newest, ["0"]),
+        (OVERFLOW.coalesce, ["2"]),
+    ],
+)
+def test_overflow_policy_keeps_lifecycle_events(policy, expected):
+    async def scenario():
+        pub = AsyncPublisher(maxsize=1, policy=policy, offload_sync=False)
+        sub = SyncRecordingSubscriber(name="Annie")
+        await pub.subscribe(sub)  # queued, not yet delivered
+        for i in range(3):
+            await pub.publish(f"{i}")
+        await pub.unsubscribe(sub)  # to a full queue
+        return pub, sub
+
+    pub, sub = asyncio.run(scenario())
+    events = pub.events
+    assert sub.messages == [events.subscribed, *expected, events.unsubscribed]
+
+
+def test_publish_after_aclose():
+    async def scenario():
+        pub = AsyncPublisher(maxsize=1, policy=OVERFLOW.block)
+        sub = AsyncRecordingSubscriber(name="Annie", delay=10.0)
+        await pub.subscribe(sub)
+        await pub.publish("0")
+        blocked = asyncio.create_task(pub.publish("1"))  # on the full queue
+        await asyncio.sleep(0)
+        await pub.aclose()
+        await asyncio.wait_for(blocked, timeout=1.0)  # released, not hung
+        assert pub.subscribers == {}
+        assert pub.dropped == {}
+        await pub.join()
+        with pytest.raises(RuntimeError):
+            await pub.publish("2")
+        with pytest.raises(RuntimeError):
+            await pub.subscribe(sub)
+        return sub
+
+    assert asyncio.run(scenario()).messages == []
+
+
+def test_pause_resume_unsubscribe():
+    async def scenario():
+        pub = AsyncPublisher()
+        sub = SyncRecordingSubscriber(name="Annie")
+        await pub.subscribe(sub)
+        await pub.pause(sub)
+        await pub.publish("missed")
+        await pub.resume(sub)
+        await pub.publish("news")
+        await pub.unsubscribe(sub)
+        await pub.unsubscribe(sub)  # unknown subscriber, declined gracefully
+        return pub, sub
+
+    pub, sub = asyncio.run(scenario())
+    assert "missed" not in sub.messages
+    assert sub.messages[-2:] == ["news", pub.events.unsubscribed]
+    assert pub.subscribers == {}
+
+
+def test_unknown_overflow_policy():
+    async def scenario():
+        pub = AsyncPublisher(policy="no-such-policy")
+        await pub.subscribe(SyncRecordingSubscriber(name="Annie"))
+
+    with pytest.raises(ValueError):
+        asyncio.run(scenario())
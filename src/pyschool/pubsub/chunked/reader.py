@@ -0,0 +1,110 @@
+"""
+Implements chunked.Reader
+"""
+
+import json
+import zlib
+
+import numpy as np
+
+from pubsub.chunked.writer import FOOTER, MAGIC
+from pubsub.reader_base import ReaderBase
+
+
+class Reader(ReaderBase):
+    """
+    A reader for a shard of a chunked store, see chunked.Writer.
+
+    Attributes:
+        file_path (str): The path to the shard containing the data.
+        _data (dict[str: np.ndarray]): The arrays of the shard, by name.
+        _index (dict[str: dict]): The index of the shard, read on first use.
+    """
+
+    def __init__(self, file_path: str):
+        """
+        The init method of the chunked.Reader class.
+
+        Arguments:
+            file_path (str): The path to the shard to be read.
+        """
+        super().__init__(file_path=file_path)
+        self._index = None
+
+    @property
+    def names(self) -> list:
+        """
+        The names of the arrays in the shard, read from its index only.
+        """
+        return list(self._read_index())
+
+    def read(self, name: str, start: int = 0, stop: int = None) -> np.ndarray:
+        """
+        Reads the rows start:stop of one array, decompressing only the chunks
+        that hold them.
+
+        Arguments:
+            name (str): The name of the array.
+            start (int): The first row read.  Defaults to 0.
+            stop (int): The row after the last row read.  Defaults to None,
+                for the last row of the array.
+
+        Returns:
+            rows (np.ndarray): The rows read, along the first axis.
+
+        Raises:
+            KeyError: If the shard has no array of that name.
+            ValueError: If the array has no rows, i.e., is 0-dimensional.
+        """
+        item = self._read_index()[name]
+        shape = item["shape"]
+        if not shape:
+            raise ValueError(f"Array '{name}' of {self.file_path} has no rows.")
+        start, stop, _ = slice(start, stop).indices(shape[0])
+        stop = max(start, stop)
+        step = item["rows"]
+        first, last = start // step, -(-stop // step)
+        with open(self.file_path, "rb") as fin:
+            payload = self._read_chunks(fin, item["chunks"][first : max(last, 1)])
+        count = min(last * step, shape[0]) - first * step
+        rows = np.frombuffer(payload, dtype=np.dtype(item["dtype"]))
+        rows = rows.reshape(max(count, 0), *shape[1:])
+        return rows[start - first * step : stop - first * step]
+
+    def _read_data(self):
+        """
+        Reads the arrays of the shard from the specified file path.
+
+        Raises:
+            FileNotFoundError: If the provided file_path does not
+                exist.
+            ValueError: If the file is not a shard of a chunked store.
+        """
+        index = self._read_index()
+        with open(self.file_path, "rb") as fin:
+            self._data = {
+                name: np.frombuffer(
+                    self._read_chunks(fin, item["chunks"]),
+                    dtype=np.dtype(item["dtype"]),
+                ).reshape(item["shape"])
+                for name, item in index.items()
+            }
+
+    def _read_index(self) -> dict:
+        if self._index is None:
+            with open(self.file_path, "rb") as fin:
+                if fin.readline() != MAGIC:
+                    raise ValueError(f"{self.file_path} is not a chunked store shard.")
+                fin.seek(-FOOTER.size, 2)
+                (offset,) = FOOTER.unpack(fin.read(FOOTER.size))
+                fin.seek(offset)
+                self._index = json.loads(fin.readline())
+        return self._index
+
+    @staticmethod
+    def _read_chunks(fin, chunks) -> bytes:
+        payload = []
+        for offset, length in chunks:
+            fin.seek(offset)
+            payload.append(zlib.decompress(fin.read(length)))
+        return b"".join(payload)
@@ -0,0 +1,79 @@
+"""
+Implements chunked.Writer
+
+A chunked store is a directory of self-describing shards.  Each shard holds
+up to shard_size arrays, and each array is split along its first axis into
+chunks of a fixed number of rows, about chunk_bytes each, compressed one at a
+time.  The shard ends with a line of json, the index, that gives the name,
+dtype, shape and rows per chunk of each array, and the offset and length of
+each of its compressed chunks, followed by the offset of the index as an
+8-byte little-endian integer.  A reader thus decompresses only the chunks of
+the rows it reads, see chunked.Reader.read.  A shard needs no shared
+metadata, so any number of processes may write different shards of one store
+at once.
+"""
+
+import json
+import struct
+import zlib
+
+import numpy as np
+
+from pubsub.writer_base import WriterBase
+
+MAGIC = b"PYSCHOOL-CHUNK-2\n"  # first line of every shard
+FOOTER = struct.Struct("<Q")  # the offset of the index, last in every shard
+
+
+class Writer(WriterBase):
+    """
+    A writer of shards of a chunked store.
+
+    Attributes:
+        file_path (str): The path to the shard to be written.
+        level (int): The zlib compression level, 0 to 9.
+        chunk_bytes (int): The uncompressed size of a chunk, rounded to
+            whole rows of at least one row.
+    """
+
+    suffix = ".chunk"
+    shard_size = 64
+
+    def __init__(self, file_path: str, level: int = 6, chunk_bytes: int = 2**20):
+        """
+        The init method of the chunked.Writer class.
+
+        Arguments:
+            file_path (str): The path to the shard to be written.
+            level (int): The zlib compression level, 0 (none) to 9
+                (smallest). Defaults to 6.
+            chunk_bytes (int): The uncompressed size of a chunk.  Defaults
+                to 1 MiB.
+        """
+        super().__init__(file_path=file_path)
+        self.level = level
+        self.chunk_bytes = chunk_bytes
+
+    def _write_data(self, fout, data):
+        """
+        Writes the dict of arrays to an open binary file as one shard.
+        """
+        index = dict()
+        fout.write(MAGIC)
+        for name, array in data.items():
+            array = np.asarray(array)
+            rows = np.ascontiguousarray(array)  # at least one dimension
+            row_bytes = rows[:1].nbytes or 1
+            step = max(1, self.chunk_bytes // row_bytes)
+            chunks = []
+            for start in range(0, max(len(rows), 1), step):
+                payload = zlib.compress(rows[start : start + step].data, self.level)
+                chunks.append((fout.tell(), len(payload)))
+                fout.write(payload)
+            index[name] = dict(
+                dtype=array.dtype.str, shape=array.shape, rows=step, chunks=chunks
+            )
+
+        offset = fout.tell()
+        fout.write(json.dumps(index).encode() + b"\n")
+        fout.write(FOOTER.pack(offset))
@@ -2,8 +2,11 @@
 Implements Controller
 """
 
+from concurrent.futures import FIRST_COMPLETED, wait
+import hashlib
+import json
 import os
-from typing import List, Dict
+from typing import Callable, Iterator, List, Dict, Tuple
 from pathlib import Path
 
 # from sklearn.model_selection import train_test_split
@@ -11,7 +14,61 @@ from pathlib import Path
 # from ptm.data.controller import IController
 # from ptm.factory import Factory
 # from icontroller import IController
+from pubsub.factory import Factory
 from pubsub.icontroller import IController
+from pubsub.ipublisher import make_executor
+
+
+class JobError(Exception):
+    """
+    Raised when one or more jobs of a Controller run fail, once all of its
+    jobs have been run.
+
+    Attributes:
+        errors (list[tuple[tuple, Exception]]): The arguments of the jobs
+            that failed and the exceptions they raised, in job order.
+        results (list): The result of each job, in job order, None for a
+            failed job.
+    """
+
+    def __init__(self, function: Callable, errors, results):
+        self.errors = errors
+        self.results = results
+        failed = ", ".join(f"{args}: {error!r}" for args, error in errors)
+        super().__init__(f"{len(errors)} {function.__name__} job(s) failed ({failed})")
+
+
+def _materialize(
+    reader: Callable, writer: Callable, members: Dict[str, str], target: str
+) -> str:
+    """
+    Reads the source files and writes their data to the target file, as a
+    dict of arrays by name if the writer writes shards.  Module level, so
+    the process executor can pickle it.
+
+    Arguments:
+        members (Dict[str, str]): The source files, by name.
+
+    Returns:
+        target (str): The path to the file written.
+    """
+    if writer.shard_size is None:
+        (source,) = members.values()
+        return writer(target).write(reader(source).data)
+    data = {name: reader(source).data for name, source in members.items()}
+    return writer(target).write(data)
+
+
+def _digest(source: str) -> str:
+    """
+    Returns the SHA-256 hex digest of the content of a file.  Module level,
+    so the process executor can pickle it.
+    """
+    digest = hashlib.sha256()
+    with open(source, "rb") as fin:
+        for block in iter(lambda: fin.read(2**20), b""):
+            digest.update(block)
+    return digest.hexdigest()
 
 
 class Controller(IController):
@@ -37,6 +94,17 @@ class Controller(IController):
             generators.
         __filenames (List[str]): A list of paths to scan dicoms for
             all patients.
+        executor (str): The executor that scans and writes files, one
+            of 'inline', 'thread', 'process'.
+        max_workers (int): The number of workers of a pooled executor.
+        max_in_flight (int): The most files submitted to the executor
+            and not yet written.
+        incremental (bool): If True, only new or changed files are
+            written and orphaned outputs deleted, per the manifest.
+        split_mode (str): How files are assigned to the train,
+            validation, and test sets, 'shuffle' or 'hash'.
+        shard_size (int): The number of files written to each shard by
+            a writer of shards, or None for the writer's default.
     """
 
     def __init__(
@@ -50,6 +118,12 @@ class Controller(IController):
         random_seed: int = 42,
         read_mode: str = "dicom",
         write_mode: str = "numpy",
+        executor: str = "process",
+        max_workers: int = None,
+        max_in_flight: int = None,
+        incremental: bool = False,
+        split_mode: str = "shuffle",
+        shard_size: int = None,
     ):
         """
         The init method of the Controller class
@@ -74,24 +148,43 @@ class Controller(IController):
                 Defaults to 'dicom'.
             write_mode (str): The type of file to which to write.
                 Defaults to 'numpy'.
+            executor (str): The executor that scans and writes files,
+                one of 'inline', 'thread', 'process'. Defaults to
+                'process'.
+            max_workers (int): The number of workers of a pooled
+                executor. Defaults to None, the number of processors.
+            max_in_flight (int): The most files submitted to the
+                executor and not yet written, which bounds the memory
+                held by pending work. Defaults to None, four per worker.
+            incremental (bool): If True, keep the output directories and
+                write only files that are new or whose content changed
+                since the manifest of the previous run, and delete
+                outputs whose input is gone. If False, recreate the
+                output directories and write every file. Defaults to
+                False.
+            split_mode (str): 'shuffle' splits the list of all files
+                with sklearn's seeded train_test_split. 'hash' assigns
+                each file from a stable hash of its path and the seed,
+                so adding files never moves existing files to another
+                set. Defaults to 'shuffle'.
+            shard_size (int): The number of files written to each
+                shard by a writer of shards, e.g., 'npz' or 'chunked'.
+                Defaults to None, the writer's shard_size.
+
+        Raises:
+            ValueError: If split_mode is not 'shuffle' or 'hash'.
         """
-        super().__init__(
-            organs=organs,
-            train_split=train_split,
-            val_split=val_split,
-            test_split=test_split,
-            write_loc=write_loc,
-            read_loc=read_loc,
-            random_seed=random_seed,
-        )
-        # read_mode=read_mode)
+        if split_mode not in ("shuffle", "hash"):
+            raise ValueError(f"Unknown split_mode '{split_mode}'.")
+
+        super().__init__()
 
         # Set values of mutable arguments
         if not organs:
             organs = ["bone", "skin"]
 
         # Set class attributes
-        self._factory = Factory()
+        self._factory = Factory
         self.organs = organs
         self._train_split = train_split
         self._val_split = val_split
@@ -102,10 +195,20 @@ class Controller(IController):
         self._rs = random_seed
         self.read_mode = read_mode
         self.write_mode = write_mode
+        self.executor = executor
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight or 4 * self.max_workers
+        self.incremental = incremental
+        self.split_mode = split_mode
+        self.shard_size = shard_size
 
     def data(self):
         """
         Handles data reading and writing
+
+        Raises:
+            JobError: If any file could not be listed, read, or written,
+                once all other files have been written.
         """
         # Make the directories to which the data will be written
         self._make_dirs()
@@ -114,8 +217,139 @@ class Controller(IController):
         dsets = self.datasets
 
         # Loop over dsets, saving fnames to the path.
+        shards = []
         for path, fnames in dsets.items():
-            self._write(path=path, filenames=fnames)
+            shards.extend(self._plan_shards(path=path, filenames=fnames))
+
+        # A shard is written whole if any of its files is new or changed
+        manifest = self._load_manifest() if self.incremental else dict()
+        jobs = [
+            (source, target)
+            for members, target in shards
+            for source in members.values()
+        ]
+        changed = {
+            source: record for source, _, record in self._changed(jobs, manifest)
+        }
+        shards = [
+            (members, target)
+            for members, target in shards
+            if any(source in changed for source in members.values())
+        ]
+
+        reader = self._factory.reader_factory(mode=self.read_mode)
+        writer = self._factory.writer_factory(mode=self.write_mode)
+        failure = None
+        try:
+            written = self._run(
+                _materialize, [(reader, writer, *shard) for shard in shards]
+            )
+        except JobError as error:
+            written, failure = error.results, error
+        for (members, target), result in zip(shards, written):
+            if result is not None:
+                for source in members.values():
+                    if source in changed:
+                        manifest[source] = changed[source]
+
+        # the files written are recorded, so a rerun writes only the failed
+        self._save_manifest(manifest)
+        if failure is not None:
+            raise failure
+
+    @property
+    def manifest_path(self) -> str:
+        """
+        (str) Returns the path to the manifest, which maps each input file
+        to its size, modification time, content hash, and output file.
+        """
+        return os.path.join(self.write_loc, "manifest.json")
+
+    def _load_manifest(self) -> dict:
+        """
+        Returns the manifest of the previous run, or an empty one.
+        """
+        try:
+            with open(self.manifest_path) as fin:
+                return json.load(fin)
+        except FileNotFoundError:
+            return dict()
+
+    def _save_manifest(self, manifest: dict):
+        """
+        Writes the manifest atomically.
+        """
+        temporary = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as fout:
+            json.dump(manifest, fout)
+        os.replace(temporary, self.manifest_path)
+
+    def _changed(self, jobs: List[Tuple[str, str]], manifest: dict) -> list:
+        """
+        Finds the jobs whose input is new or changed since the manifest, and
+        deletes the outputs, and manifest records, of inputs no longer read.
+        Unchanged records stay in the manifest.
+
+        An input whose size and modification time match its record is
+        unchanged without being read; otherwise, its content hash decides.
+        Unless incremental, every input is written and none is hashed; the
+        records then hold no hash, which the first incremental run computes
+        for the inputs whose size or modification time changed.
+
+        Arguments:
+            jobs (List[Tuple[str, str]]): The (source, target) paths of
+                the files to be read and written.
+            manifest (dict): The manifest of the previous run, updated in
+                place.
+
+        Returns:
+            jobs (List[Tuple[str, str, dict]]): The (source, target,
+                record) of the files to be written, where record is the
+                manifest record of the source once written.
+        """
+        mode = f"{self.read_mode}:{self.write_mode}"
+        targets = {source: target for source, target in jobs}
+
+        # delete the outputs of inputs no longer read, or written elsewhere
+        for source, record in list(manifest.items()):
+            if targets.get(source) != record["target"] or record["mode"] != mode:
+                if os.path.exists(record["target"]):
+                    os.remove(record["target"])
+                del manifest[source]
+
+        candidates = []
+        for source, target in jobs:
+            status = os.stat(source)
+            record = dict(
+                size=status.st_size,
+                mtime_ns=status.st_mtime_ns,
+                target=target,
+                mode=mode,
+            )
+            previous = manifest.get(source)
+            if previous is not None and os.path.exists(target):
+                if all(previous[key] == record[key] for key in ("size", "mtime_ns")):
+                    continue
+            candidates.append((source, target, record))
+
+        if not self.incremental:
+            return candidates  # all written, so no hash is needed to decide
+
+        digests = self._run(_digest, [(source,) for source, _, _ in candidates])
+        changed = []
+        for (source, target, record), digest in zip(candidates, digests):
+            record["sha256"] = digest
+            previous = manifest.get(source)
+            if (
+                previous is not None
+                and previous.get("sha256") == digest
+                and os.path.exists(target)
+            ):
+                manifest[source] = record  # touched, not changed
+            else:
+                changed.append((source, target, record))
+
+        return changed
 
     @property
     def datasets(self) -> Dict[str, List[str]]:
@@ -127,6 +361,18 @@ class Controller(IController):
                 the write location to a list of paths to files to
                 be read.
         """
+        if self.split_mode == "hash":
+            dsets = {
+                os.path.join(self.write_loc, dset): []
+                for dset in ("train", "validation", "test")
+            }
+            for filename in self._iter_filenames():
+                dset = self._split_of(filename)
+                dsets[os.path.join(self.write_loc, dset)].append(filename)
+            return dsets
+
+        from sklearn.model_selection import train_test_split
+
         # Split train, test, val sets
         test_size = self._test_split / (
             self._train_split + self._val_split + self._test_split
@@ -149,36 +395,83 @@ class Controller(IController):
 
         return dsets
 
+    def _split_of(self, filename: str) -> str:
+        """
+        Assigns a file to 'train', 'validation', or 'test' from a hash of
+        its path relative to read_loc and the seed, in proportion to the
+        splits.  The assignment depends on no other file.
+
+        Arguments:
+            filename (str): The path to the file to be read.
+
+        Returns:
+            dset (str): The name of the set of the file.
+        """
+        relative = Path(os.path.relpath(filename, self.read_loc)).as_posix()
+        digest = hashlib.blake2b(f"{self._rs}:{relative}".encode(), digest_size=8)
+        position = int.from_bytes(digest.digest(), "big") / 2**64  # in [0, 1)
+
+        total = self._train_split + self._val_split + self._test_split
+        if position < self._train_split / total:
+            return "train"
+        if position < (self._train_split + self._val_split) / total:
+            return "validation"
+        return "test"
+
+    def _iter_filenames(self):
+        """
+        Yields the files to be read as the directory tree is searched, or
+        from self._filenames if already compiled.
+
+        Yields:
+            filename (str): The path to the next file to be read.
+        """
+        if self.__filenames:
+            yield from self.__filenames
+            return
+
+        for path in self._scan_dirs():
+            for fname in os.listdir(path):
+                yield os.path.join(path, fname)
+
     @property
     def _filenames(self) -> List[str]:
         """
-        Compiles a list of files to be read and returns it.
+        Compiles a list of files to be read and returns it.  The files are
+        in the order _iter_filenames yields them, which the seeded split
+        depends on, but the directories are listed in parallel.
 
         Returns:
             self.__filenames (List[str]): A list of paths to scan
                 dicoms for all patients.
         """
-        # Search through the directory tree looking for directories
-        # matching 3Dircadb1.*
         if not self.__filenames:
-            filenames = []
-            for path in Path(self.read_loc).rglob("3Dircadb1.*"):
-                if not path.is_dir():
-                    continue
+            paths = list(self._scan_dirs())
+            listings = self._run(os.listdir, [(path,) for path in paths])
+            self.__filenames = [
+                os.path.join(path, fname)
+                for path, fnames in zip(paths, listings)
+                for fname in fnames
+            ]
 
-                # Get the files in the directory
-                path = os.path.join(path, "PATIENT_DICOM")
-                filenames.extend(
-                    [os.path.join(path, fname) for fname in os.listdir(path)]
-                )
+        return self.__filenames
 
-            self.__filenames = filenames
+    def _scan_dirs(self) -> Iterator[str]:
+        """
+        Searches the directory tree for the directories matching
+        3Dircadb1.* and yields the directory of scans of each.
 
-        return self.__filenames
+        Yields:
+            path (str): The path to the next PATIENT_DICOM directory.
+        """
+        for path in Path(self.read_loc).rglob("3Dircadb1.*"):
+            if path.is_dir():
+                yield os.path.join(path, "PATIENT_DICOM")
 
     def _make_dirs(self):
         """
-        Creates the directories to which the data will be written.
+        Creates the directories to which the data will be written.  In
+        incremental mode, existing directories are kept.
         """
         datasets = ["train", "test", "validation"]
         data_types = ["scans", "masks"]
@@ -187,9 +480,9 @@ class Controller(IController):
                 # Make the directory. If it exists, delete it and
                 # recreate it. Else, just create it.
                 path = os.path.join(self.write_loc, dset, dtype)
-                if os.path.exists(path):
+                if os.path.exists(path) and not self.incremental:
                     self._rmdir(path=path)
-                os.makedirs(path)
+                os.makedirs(path, exist_ok=True)
 
     def _rmdir(self, path: str):
         """
@@ -206,15 +499,107 @@ class Controller(IController):
                 item.unlink()
         directory.rmdir()
 
-    def _write(self, path: str, filenames: List[str]):
+    def _plan_shards(
+        self, path: str, filenames: List[str]
+    ) -> List[Tuple[Dict[str, str], str]]:
         """
-        Writes the masks and scans to the provided path.
+        Plans the shards of scans to be written under the provided path, one
+        file per scan, or shard_size scans per shard for a writer of shards.
+        Nothing is read or written here; data writes the shards via _run.
 
         Arguments:
-            path (str): The path to the parent directory to which to
-                write the data.
+            path (str): The path to the parent directory under which the
+                shards are written.
             filenames (List[str]): A list of paths to the files to be
                 read.
+
+        Returns:
+            shards (List[Tuple[Dict[str, str], str]]): The files to be
+                read, by name, and the path to the file they are written
+                to.
         """
         # Create a writer constructor
-        writer_constructor = self._factory.writer_factory(mode=self.writer_mode)
+        writer_constructor = self._factory.writer_factory(mode=self.write_mode)
+
+        members = dict()
+        for filename in filenames:
+            # e.g., 3Dircadb1.1/PATIENT_DICOM/image_0 -> 3Dircadb1.1_image_0
+            relative = Path(os.path.relpath(filename, self.read_loc))
+            parts = [*relative.parent.parts, relative.stem]
+            name = "_".join(part for part in parts if part != "PATIENT_DICOM")
+            members[name] = filename
+
+        suffix = writer_constructor.suffix
+        if writer_constructor.shard_size is None:
+            return [
+                ({name: filename}, os.path.join(path, "scans", name + suffix))
+                for name, filename in members.items()
+            ]
+
+        size = self.shard_size or writer_constructor.shard_size
+        names = list(members)
+        return [
+            (
+                {name: members[name] for name in names[start : start + size]},
+                os.path.join(path, "scans", f"shard-{start // size:06d}{suffix}"),
+            )
+            for start in range(0, len(names), size)
+        ]
+
+    def _run(self, function: Callable, jobs: List[tuple]) -> list:
+        """
+        Calls the function with each job's arguments on the executor,
+        keeping at most max_in_flight jobs submitted at a time, and
+        prints the progress.  A failed job is reported, and the other jobs
+        are still run.
+
+        Arguments:
+            function (Callable): The function, picklable for the
+                process executor.
+            jobs (List[tuple]): The arguments of each call.
+
+        Returns:
+            results (list): The result of each job, in job order.
+
+        Raises:
+            JobError: If any job raised an exception, once all jobs are
+                done.
+        """
+        results = [None] * len(jobs)
+        errors = []
+        done = 0
+        step = max(1, len(jobs) // 20)  # progress every 5%
+
+        def collect(index, call):
+            nonlocal done
+            try:
+                results[index] = call()
+            except Exception as error:
+                print(f"Error: {function.__name__}{jobs[index]} raised {error!r}.")
+                errors.append((index, error))
+            done += 1
+            if done % step == 0 or done == len(jobs):
+                print(f"{function.__name__}: {done} of {len(jobs)} done.")
+
+        pool = make_executor(kind=self.executor, max_workers=self.max_workers)
+        if pool is None:
+            for index, job in enumerate(jobs):
+                collect(index, lambda: function(*job))
+        else:
+            with pool:
+                pending = dict()  # future -> index of its job
+                for index, job in enumerate(jobs):
+                    if len(pending) >= self.max_in_flight:
+                        finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            collect(pending.pop(future), future.result)
+                    pending[pool.submit(function, *job)] = index
+                for future in wait(pending).done:
+                    collect(pending[future], future.result)
+
+        if errors:
+            errors.sort(key=lambda item: item[0])
+            raise JobError(
+                function, [(jobs[index], error) for index, error in errors], results
+            )
+        return results
@@ -1,44 +1,110 @@
 """
-Implements json.Reader
+Implements csv.Reader
 """
 
+from itertools import islice
+from typing import Iterator
+
 import numpy as np
 
 from pubsub.reader_base import ReaderBase
 
+ENGINES = ("numpy", "pandas")  # the csv parsers known to Reader
+
 
 class Reader(ReaderBase):
     """
-    A reader for json data.
+    A reader for csv data.
+
+    The "numpy" engine parses with np.loadtxt, which tokenizes in C and,
+    unlike np.genfromtxt, does not hold the text and intermediate lists
+    alongside the final array.  It requires every field to be present.  The
+    optional "pandas" engine parses with pandas.read_csv, and reads empty
+    fields as nan.
 
     Attributes:
         file_path (str): The path to the file containing the data.
-        _data (dict): The data read from the file.
+        engine (str): The csv parser, one of ENGINES.
+        _data (np.ndarray): The data read from the file.
     """
 
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, engine: str = "numpy"):
         """
         The init method of the csv.Reader class.
 
         Arguments:
             file_path (str): The path to the file to be read.
+            engine (str): The csv parser, one of ENGINES.  Defaults to
+                'numpy'.
+
+        Raises:
+            ValueError: If the engine is not one of ENGINES.
         """
         super().__init__(file_path=file_path)
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{engine}', expected one of {ENGINES}.")
+        self.engine = engine
 
     def _read_data(self) -> np.ndarray:
         """
         Reads the data from the specified file path.
 
         Raises:
-            NotImplementedError: If _read_data has not been
-                implemented in the child class.
             FileNotFoundError: If the provided file_path does not
                 exist.
-            dicom.errors.InvalidDicomError: If the provided file_path
-                does not contain a valid dicom file.
+            ValueError: If the numpy engine finds a missing or
+                non-numeric field.
+            ModuleNotFoundError: If the pandas engine is requested
+                but pandas is not installed.
+        """
+        if self.engine == "pandas":
+            self._data = self._read_csv().to_numpy()
+        else:
+            self._data = np.loadtxt(self.file_path, dtype=float, delimiter=",")
+
+    def iter_chunks(self, rows: int = 65536) -> Iterator[np.ndarray]:
+        """
+        Reads the data from the specified file path a fixed number of rows
+        at a time, so files larger than memory can be processed.  The data
+        property is not set.
+
+        Arguments:
+            rows (int): The number of rows of each chunk; the last chunk
+                may be shorter.  None reads the whole file as one chunk.
+                Defaults to 65536.
+
+        Yields:
+            chunk (np.ndarray): The next (rows, columns) array of data.
+
+        Raises:
+            ValueError: If rows is not positive.
         """
-        # Read the data from the file
+        if rows is not None and rows < 1:
+            raise ValueError("rows must be positive.")
+
+        if self.engine == "pandas":
+            if rows is None:
+                yield self._read_csv().to_numpy()
+                return
+            with self._read_csv(chunksize=rows) as frames:
+                for frame in frames:
+                    yield frame.to_numpy()
+            return
+
         with open(self.file_path) as fin:
-            self._data = np.genfromtxt(fin, dtype=float, comments="#", delimiter=",")
+            lines = (line for line in fin if line.split("#", 1)[0].strip())
+            while True:
+                chunk = list(islice(lines, rows))
+                if not chunk:
+                    return
+                yield np.loadtxt(chunk, dtype=float, delimiter=",", ndmin=2)
+
+    def _read_csv(self, **kwargs):
+        """
+        Calls pandas.read_csv, imported on first use since pandas is optional.
+        """
+        import pandas as pd
 
-        # return data  # <-- no need to return, just set member data
+        return pd.read_csv(
+            self.file_path, header=None, comment="#", dtype=float, **kwargs
+        )
@@ -0,0 +1,211 @@
+"""
+Implements DataLoader
+
+Iterates over batches of data read from many files, e.g., a split directory
+written by Controller.  Files are read ahead on an executor, so reading the
+next batch overlaps with computing on the current one.
+
+Example:
+    > loader = DataLoader(sorted(glob("train/scans/*.npy")), batch_size=32,
+    >                     prefetch=64, shuffle_buffer=1024, seed=42)
+    > for batch in loader:
+    >     model.fit(batch)
+    > loader.stats  # LoaderStats(items=..., batches=..., wait_seconds=...)
+"""
+
+from collections import deque
+import random
+import time
+from typing import Callable, Iterator, List, NamedTuple
+
+import numpy as np
+
+from pubsub.factory import Factory
+from pubsub.ipublisher import make_executor
+
+
+class LoaderStats(NamedTuple):
+    items: int  # files read
+    batches: int  # batches yielded
+    wait_seconds: float  # time the consumer waited for a file to be read
+
+
+def _load(reader: Callable, file_path: str):
+    """
+    Reads a file into memory, so the read happens on the worker, not when
+    the batch is collated.  Module level, so the process executor can
+    pickle it.
+    """
+    data = reader(file_path).data
+    if isinstance(data, dict):
+        return {key: np.array(value) for key, value in data.items()}
+    return np.array(data)
+
+
+def _collate(items: list):
+    """
+    Stacks arrays into a batch, or dicts of arrays into a dict of batches.
+    """
+    if isinstance(items[0], dict):
+        return {key: np.stack([item[key] for item in items]) for key in items[0]}
+    return np.stack(items)
+
+
+class DataLoader:
+    """
+    A prefetching, batching iterator over the data of files.
+
+    Attributes:
+        file_paths (List[str]): The paths to the files to be read.
+        batch_size (int): The number of files per batch.
+        prefetch (int): The most files read ahead of the consumer.
+        shuffle_buffer (int): The size of the buffer items are drawn from
+            at random, or 0 for file order.
+        drop_last (bool): If True, a last batch smaller than batch_size is
+            not yielded.
+        _reader (Callable): The reader class constructor.
+    """
+
+    def __init__(
+        self,
+        file_paths: List[str],
+        batch_size: int = 32,
+        prefetch: int = 8,
+        mode: str = "npy",
+        reader: Callable = None,
+        executor: str = "thread",
+        max_workers: int = None,
+        shuffle_buffer: int = 0,
+        seed: int = None,
+        drop_last: bool = False,
+    ):
+        """
+        The init method of the DataLoader class.
+
+        Arguments:
+            file_paths (List[str]): The paths to the files to be read.
+            batch_size (int): The number of files per batch. Defaults
+                to 32.
+            prefetch (int): The most files read ahead of the consumer.
+                Defaults to 8.
+            mode (str): The type of reader, see Factory.reader_factory.
+                Defaults to 'npy'.
+            reader (Callable): An IReader class constructor, used instead
+                of mode. Defaults to None.
+            executor (str): The executor that reads files, one of
+                'inline', 'thread', 'process'. Defaults to 'thread'.
+            max_workers (int): The number of workers of a pooled
+                executor. Defaults to None, the concurrent.futures default.
+            shuffle_buffer (int): Items are drawn at random from a buffer
+                of this size, which bounds the memory shuffling takes.
+                Defaults to 0, no shuffle.
+            seed (int): The random seed of the shuffle. Defaults to None.
+            drop_last (bool): If True, a last batch smaller than
+                batch_size is not yielded. Defaults to False.
+
+        Raises:
+            ValueError: If batch_size or prefetch is not positive.
+        """
+        if batch_size < 1 or prefetch < 1:
+            raise ValueError("batch_size and prefetch must be positive.")
+        self.file_paths = file_paths
+        self.batch_size = batch_size
+        self.prefetch = prefetch
+        self.shuffle_buffer = shuffle_buffer
+        self.drop_last = drop_last
+        self._reader = reader or Factory.reader_factory(mode=mode)
+        self._executor = executor
+        self._max_workers = max_workers
+        self._random = random.Random(seed)
+        self._items = 0
+        self._batches = 0
+        self._wait = 0.0
+
+    def __iter__(self) -> Iterator:
+        """
+        Yields the batches of one pass over the files.
+
+        Yields:
+            batch (np.ndarray or dict[str: np.ndarray]): The data of up to
+                batch_size files, stacked along a new first axis.
+        """
+        batch = []
+        for item in self._shuffled(self._read_ahead()):
+            batch.append(item)
+            if len(batch) == self.batch_size:
+                self._batches += 1
+                yield _collate(batch)
+                batch = []
+        if batch and not self.drop_last:
+            self._batches += 1
+            yield _collate(batch)
+
+    def __len__(self) -> int:
+        """Returns the number of batches of one pass."""
+        if self.drop_last:
+            return len(self.file_paths) // self.batch_size
+        return -(-len(self.file_paths) // self.batch_size)
+
+    def _read_ahead(self) -> Iterator:
+        """
+        Yields the data of each file in order, keeping up to prefetch
+        files submitted to the executor.
+        """
+        clock = time.perf_counter
+        pool = make_executor(kind=self._executor, max_workers=self._max_workers)
+        if pool is None:
+            for file_path in self.file_paths:
+                start = clock()
+                item = _load(self._reader, file_path)
+                self._wait += clock() - start
+                self._items += 1
+                yield item
+            return
+
+        pending = deque()
+        paths = iter(self.file_paths)
+        try:
+            for file_path in paths:
+                pending.append(pool.submit(_load, self._reader, file_path))
+                if len(pending) == self.prefetch:
+                    break
+            while pending:
+                future = pending.popleft()
+                for file_path in paths:  # refill before waiting
+                    pending.append(pool.submit(_load, self._reader, file_path))
+                    break
+                start = clock()
+                item = future.result()
+                self._wait += clock() - start
+                self._items += 1
+                yield item
+        finally:
+            for future in pending:
+                future.cancel()
+            pool.shutdown()
+
+    def _shuffled(self, items: Iterator) -> Iterator:
+        """
+        Yields the items drawn at random from a buffer of shuffle_buffer
+        items, or in order if shuffle_buffer is 0.
+        """
+        if self.shuffle_buffer < 2:
+            yield from items
+            return
+
+        buffer = []
+        for item in items:
+            buffer.append(item)
+            if len(buffer) == self.shuffle_buffer:
+                index = self._random.randrange(len(buffer))
+                buffer[index], buffer[-1] = buffer[-1], buffer[index]
+                yield buffer.pop()
+        self._random.shuffle(buffer)
+        yield from buffer
+
+    @property
+    def stats(self) -> LoaderStats:
+        """(LoaderStats) Returns the items, batches, and waiting time so far."""
+        return LoaderStats(
+            items=self._items, batches=self._batches, wait_seconds=self._wait
+        )
@@ -2,60 +2,180 @@
 Implements Factory
 """
 
-from importlib import import_module
+from fnmatch import fnmatchcase
 from typing import Callable
 
 from pubsub.ipublisher import IPublisher
 from pubsub.isubscriber import ISubscriber
+from pubsub.registry import builders, readers, writers
+
+_ROUTING = ("topic", "follows", "topics", "callback")  # the fields _wire reads
 
 
 class Factory:
     """
     Provides a constructor of various classes.
+
+    Classes are resolved through the process-wide registries in
+    pubsub.registry, so each class is imported and looked up once per
+    process, however many objects are built from it.
     """
 
-    def __init__(self, build_specification):
+    def __init__(self, build_specification, publish: str = "each"):
         """
         The init method of the Factory class.
+
+        The build specification may declare routing.  A publisher item may
+        name its "topic".  A subscriber item may list the publisher items it
+        "follows", by key, and the "topics" it follows, as names or
+        shell-style patterns, e.g., "sports*".  A subscriber that declares
+        neither follows every publisher.  A subscriber item may also name
+        its "callback", which defaults to "update".
+
+        Publishers of the same topic that no subscriber follows by key share
+        a single subscriber roster, so wiring costs O(P + S) rather than
+        O(P x S) when routing is by topic or is absent.
+
+        Arguments:
+            build_specification (str): The path to the .json build
+                specification.
+            publish (str): The initial publication after wiring.  'each':
+                every publisher publishes.  'batched': one publish_many per
+                shared roster, with the names of its publishers as the
+                messages.  'none': no initial publication.  Defaults to
+                'each'.
+
+        Raises:
+            ValueError: If publish is not one of 'each', 'batched', 'none'.
         """
+        if publish not in ("each", "batched", "none"):
+            raise ValueError(f"Unknown publish '{publish}'.")
+
         _reader_interface = self.reader_factory(mode="json")
         _reader = _reader_interface(build_specification)
 
-        _objects = []  # empty roster of objects, fill is a value Object is created
-        for item in _reader.data:
-            class_kwargs = _reader.data[item]
+        # build each object as soon as its item is parsed, and keep only the
+        # routing of the item, so no more than one item's kwargs are held
+        routing = dict()  # item key -> routing fields of the item
+        self._objects = dict()  # item key -> object created from the item
+        for item, class_kwargs in _reader.iter_items():
+            routing[item] = {
+                field: class_kwargs[field]
+                for field in _ROUTING
+                if field in class_kwargs
+            }
             module_name = class_kwargs.get("module", None)
             if module_name is not None:
-                module_dict = dict(name=f".{module_name}", package="pubsub")
                 try:
-                    the_module = import_module(**module_dict)
-                    try:
-                        the_class = getattr(the_module, module_name.capitalize())
-                        if the_class:
-                            _objects.append(the_class(**class_kwargs))
-                    except AttributeError:
-                        print(
-                            f"Skipping module {the_module.__name__}; class {module_name.capitalize()} not found."
-                        )
+                    the_class = builders.resolve(module_name)
+                    if the_class:
+                        self._objects[item] = the_class(**class_kwargs)
+                except AttributeError:
+                    print(
+                        f"Skipping module {builders.package}.{module_name}; class {module_name.capitalize()} not found."
+                    )
                 except ModuleNotFoundError:
                     print(
-                        f'Skipping module {module_dict["package"] + module_dict["name"]}; module not found.'
+                        f"Skipping module {builders.package}.{module_name}; module not found."
                     )
 
         # connect the publish-subscribe mechanism
-        subscribers = [item for item in _objects if isinstance(item, ISubscriber)]
-        for item in subscribers:
+        subscribers = {
+            key: item
+            for key, item in self._objects.items()
+            if isinstance(item, ISubscriber)
+        }
+        for item in subscribers.values():
             print(f"{item.name} has an ISubscriber interface")
 
-        publishers = [item for item in _objects if isinstance(item, IPublisher)]
-        for item in publishers:
+        publishers = {
+            key: item
+            for key, item in self._objects.items()
+            if isinstance(item, IPublisher)
+        }
+        for item in publishers.values():
             print(f"{item.name} has an IPublisher interface")
-            for who in subscribers:
-                item.connect(who)
 
-        for item in publishers:
-            print(f"{item.name} responds to a command and pubishes:")
-            item.publish()
+        groups = self._wire(routing, publishers, subscribers)
+
+        if publish == "each":
+            for item in publishers.values():
+                print(f"{item.name} responds to a command and pubishes:")
+                item.publish()
+        elif publish == "batched":
+            for group in groups:
+                names = [item.name for item in group]
+                print(f"{', '.join(names)} respond to a command and publish:")
+                group[0].publish_many(names)
+
+    @staticmethod
+    def _wire(routing, publishers, subscribers):
+        """
+        Connects subscribers to publishers according to the routing of the
+        build specification.
+
+        Arguments:
+            routing (dict[str: dict]): The routing fields, "topic", "follows",
+                "topics", and "callback", of each item of the build
+                specification, by item key.
+            publishers (dict[str: IPublisher]): The publishers, by item key.
+            subscribers (dict[str: ISubscriber]): The subscribers, by item key.
+
+        Returns:
+            groups (list[list[IPublisher]]): The publishers grouped by the
+                subscriber roster they share, in specification order.
+        """
+        topic_of = {key: routing[key].get("topic") for key in publishers}
+        topics = set(topic_of.values())
+
+        # subscribers of each topic, and the followers of individual publishers
+        by_topic = {topic: [] for topic in topics}
+        followers = dict()
+        for key, who in subscribers.items():
+            follows = routing[key].get("follows", [])
+            patterns = routing[key].get("topics", [])
+            callback = routing[key].get("callback", None)
+            if not follows and not patterns:
+                matched = topics  # follows every publisher
+            else:
+                matched = {
+                    topic
+                    for topic in topics
+                    if topic is not None
+                    and any(fnmatchcase(topic, pattern) for pattern in patterns)
+                }
+            for topic in matched:
+                by_topic[topic].append((who, callback))
+            for publisher_key in follows:
+                if publisher_key in publishers:
+                    followers.setdefault(publisher_key, []).append((who, callback))
+
+        # publishers that only have topic subscribers share the topic's roster
+        shared = dict()  # topic -> first publisher, which owns the roster
+        groups = dict()  # id of roster owner -> publishers sharing the roster
+        for key, item in publishers.items():
+            topic = topic_of[key]
+            owner = shared.get(topic)
+            if key not in followers and owner is not None:
+                if hasattr(item, "share_subscribers"):
+                    item.share_subscribers(owner)
+                    groups[id(owner)].append(item)
+                    continue
+            for who, callback in by_topic[topic] + followers.get(key, []):
+                item.connect(who, callback)
+            groups[id(item)] = [item]
+            if key not in followers and topic not in shared:
+                shared[topic] = item
+
+        return list(groups.values())
+
+    @property
+    def objects(self):
+        """
+        (dict[str: object]) Returns the objects built, by item key of the
+        build specification.
+        """
+        return self._objects
 
     @staticmethod
     def reader_factory(mode: str = "json") -> Callable:
@@ -63,8 +183,9 @@ class Factory:
         Imports the correct reader class.
 
         Arguments:
-            mode (str): The type of reader to import. Defaults to
-                'json'.
+            mode (str): The type of reader to import, e.g., 'json',
+                'csv', or 'npy' for memory-mapped binary data. Defaults
+                to 'json'.
 
         Returns:
             class_constructor (pubsub.reader.IReader): The reader
@@ -74,8 +195,28 @@ class Factory:
             ModuleNotFoundError: If the requested reader does not
                 exist.
         """
-        module_dict = dict(name=f".{mode}.reader", package="pubsub")
-        module = import_module(**module_dict)
-        class_constructor = getattr(module, "Reader")
+        class_constructor = readers.resolve(mode)
+
+        return class_constructor
+
+    @staticmethod
+    def writer_factory(mode: str = "npy") -> Callable:
+        """
+        Imports the correct writer class.
+
+        Arguments:
+            mode (str): The type of writer to import, e.g., 'npy' for one
+                .npy file per array, 'npz' for compressed .npz shards, or
+                'chunked' for a chunked store. Defaults to 'npy'.
+
+        Returns:
+            class_constructor (pubsub.iwriter.IWriter): The writer
+                class contructor.
+
+        Raises:
+            ModuleNotFoundError: If the requested writer does not
+                exist.
+        """
+        class_constructor = writers.resolve(mode)
 
         return class_constructor
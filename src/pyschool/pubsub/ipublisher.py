@@ -3,6 +3,10 @@ Implements IPublisher
 """
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import NamedTuple
+from weakref import WeakKeyDictionary, WeakMethod, ref
 
 
 class IPublisher(ABC):
@@ -56,26 +60,278 @@ class IPublisher(ABC):
         pass
 
 
+class PublishError(Exception):
+    """
+    Raised when one or more subscriber callbacks fail during delivery.
+
+    Attributes:
+        errors (list[tuple[ISubscriber, Exception]]): The subscribers whose
+            callbacks failed and the exceptions they raised, in order.
+    """
+
+    def __init__(self, errors):
+        self.errors = errors
+        names = ", ".join(
+            f"{getattr(who, 'name', who)}: {error!r}" for who, error in errors
+        )
+        super().__init__(f"{len(errors)} subscriber callback(s) failed ({names})")
+
+
+EXECUTORS = ("inline", "thread", "process")  # the delivery executors known
+_HARVEST_AT = 1024  # the fewest pending deliveries that trigger a harvest
+
+
+class RegistryStats(NamedTuple):
+    size: int  # number of subscribers currently connected
+    pruned: int  # number of subscribers pruned after being garbage collected
+
+
+def _weak_reference(method):
+    """
+    Returns a reference that, when called, returns the method, or None once
+    the method's subscriber is garbage collected.  Callables that are not
+    bound methods cannot be weakly referenced and are held as is.
+    """
+    try:
+        return WeakMethod(method)
+    except TypeError:
+        return lambda: method
+
+
+def make_executor(kind: str = "inline", max_workers: int = None):
+    """
+    Creates an executor by name, e.g., the delivery executor of a publisher.
+
+    Arguments:
+        kind (str): One of EXECUTORS.  Defaults to 'inline'.
+        max_workers (int): The number of workers of a pooled executor.
+            Defaults to None, which uses the concurrent.futures default.
+
+    Returns:
+        executor (concurrent.futures.Executor or None): None for 'inline'.
+
+    Raises:
+        ValueError: If the kind is not one of EXECUTORS.
+    """
+    if kind == "inline":
+        return None
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=max_workers)
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=max_workers)
+    raise ValueError(f"Unknown executor '{kind}', expected one of {EXECUTORS}.")
+
+
 class PublisherBase(IPublisher):
+    """
+    The Base class for publishers.
+
+    Subscriber callbacks are resolved to bound methods once, at connect time,
+    and delivered by the executor chosen with the "executor" keyword:
+
+    * "inline" (default): callbacks run serially in the calling thread.
+    * "thread": callbacks run on a ThreadPoolExecutor, for I/O-bound
+      subscribers.
+    * "process": callbacks run on a ProcessPoolExecutor, for CPU-bound
+      subscribers.  Each call runs on a pickled copy of the subscriber, so
+      changes to the subscriber's state are not seen by this process.
+
+    With the "thread" and "process" executors, publish returns once the
+    callbacks are submitted; flush waits for them to finish.
+
+    With the "weak" keyword True, the publisher holds only weak references to
+    its subscribers, so a subscriber that is no longer referenced elsewhere is
+    garbage collected and pruned without disconnect.
+
+    Attributes:
+        _subscribers (dict[ISubscriber: str]): The subscribers and the names of
+            their callbacks.
+        _methods (dict[ISubscriber: Callable]): The subscribers and their
+            resolved callbacks.
+        _batch_methods (dict[ISubscriber: Callable or None]): The subscribers
+            and their resolved "publication_batch_callback" hooks, or None if
+            the subscriber is delivered one message at a time.
+        _executor (concurrent.futures.Executor or None): The delivery executor,
+            None for "inline".
+        _pending (list[tuple[ISubscriber, concurrent.futures.Future]]): The
+            deliveries submitted to the executor and not yet harvested.
+        _harvest_at (int): The length of _pending at which finished
+            deliveries are harvested from it, so a publisher that never
+            flushes holds only the deliveries still in flight.
+        _errors (list[tuple[ISubscriber, Exception]]): The deliveries that
+            failed and are not yet flushed.
+        _weak (bool): If True, the dictionaries above are WeakKeyDictionaries
+            and the resolved callbacks are held as weak references.
+        _watch (dict[int: weakref.ref]): The subscriber ids and the weak
+            references that count a prune once the subscriber is collected.
+        _pruned (int): The number of subscribers pruned after being garbage
+            collected.
+    """
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         _kwargs = kwargs
         self._name = kwargs.get("name", "Unknown Name")
-        self._subscribers = dict()
+        self._weak = kwargs.get("weak", False)
+        registry = WeakKeyDictionary if self._weak else dict
+        self._subscribers = registry()
+        self._methods = registry()
+        self._batch_methods = registry()
+        self._watch = dict()
+        self._pruned = 0
+        self._executor = make_executor(
+            kind=kwargs.get("executor", "inline"),
+            max_workers=kwargs.get("max_workers", None),
+        )
+        self._pending = []
+        self._harvest_at = _HARVEST_AT
+        self._errors = []
         print(f"PublisherBase.__init__() for {self.name}")
 
     def connect(self, subscriber, callback: str = None):
         if callback == None:
             callback = "update"
+        method = getattr(subscriber, callback)
+        if callback == "update":
+            batch = getattr(subscriber, "publication_batch_callback", None)
+        else:
+            batch = None
+        if self._weak:
+            method = _weak_reference(method)
+            batch = None if batch is None else _weak_reference(batch)
+            key = id(subscriber)
+            if key not in self._watch:
+                self._watch[key] = ref(subscriber, partial(self._on_collected, key))
         self._subscribers[subscriber] = callback
+        self._methods[subscriber] = method
+        self._batch_methods[subscriber] = batch
 
     def disconnect(self, subscriber):
         del self._subscribers[subscriber]
+        del self._methods[subscriber]
+        del self._batch_methods[subscriber]
+        self._watch.pop(id(subscriber), None)
+
+    def share_subscribers(self, publisher):
+        """
+        Makes this publisher reference, not copy, the subscribers of another
+        publisher.  Afterwards, connect and disconnect on either publisher
+        change the subscribers of both.
+
+        Arguments:
+            publisher (PublisherBase): The publisher whose subscribers are
+                shared.
+
+        Raises:
+            ValueError: If one publisher is weak and the other is not.
+        """
+        if self._weak != publisher._weak:
+            raise ValueError("Cannot share subscribers between weak and strong.")
+        self._subscribers = publisher._subscribers
+        self._methods = publisher._methods
+        self._batch_methods = publisher._batch_methods
+        self._watch = publisher._watch
 
     def publish(self):
-        for subscriber, callback in self._subscribers.items():
-            method = getattr(subscriber, callback)
-            method()
+        for subscriber, method in self._methods.items():
+            self._submit(subscriber, method)
+        if self._executor is None:
+            self.flush()
+
+    def publish_many(self, messages):
+        """
+        Notifies subscribers of a sequence of messages, one call per subscriber
+        if possible.
+
+        Subscribers connected with the default "update" callback that implement
+        the optional "publication_batch_callback" method receive the whole
+        sequence (e.g., a list or NumPy array) in one call.  Other subscribers
+        receive one call of their callback per message.
+
+        Arguments:
+            messages (Sequence): The messages to publish, in order.
+        """
+        if not hasattr(messages, "__len__"):
+            messages = tuple(messages)
+        for subscriber, method in self._methods.items():
+            batch = self._batch_methods[subscriber]
+            if batch is not None:
+                self._submit(subscriber, batch, messages)
+            else:
+                for _ in range(len(messages)):
+                    self._submit(subscriber, method)
+        if self._executor is None:
+            self.flush()
+
+    def flush(self):
+        """
+        Waits for all submitted callbacks to finish.
+
+        Raises:
+            PublishError: If any callback raised an exception since the last
+                flush.  All other callbacks are still delivered.
+        """
+        pending, self._pending = self._pending, []
+        self._harvest_at = _HARVEST_AT
+        errors, self._errors = self._errors, []
+        for subscriber, future in pending:
+            error = future.exception()
+            if error is not None:
+                errors.append((subscriber, error))
+        if errors:
+            raise PublishError(errors)
+
+    def shutdown(self, wait: bool = True):
+        """
+        Releases the resources of the delivery executor.
+
+        Arguments:
+            wait (bool): If True, waits for submitted callbacks to finish.
+                Defaults to True.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+
+    def _submit(self, subscriber, method, *args):
+        """
+        Delivers a callback inline, or submits it to the executor.
+        """
+        if self._weak:
+            method = method()
+            if method is None:  # the subscriber was garbage collected
+                return
+        if self._executor is None:
+            try:
+                method(*args)
+            except Exception as error:
+                self._errors.append((subscriber, error))
+        else:
+            self._pending.append((subscriber, self._executor.submit(method, *args)))
+            if len(self._pending) >= self._harvest_at:
+                self._harvest()
+
+    def _harvest(self):
+        """
+        Drops the finished deliveries from _pending, keeping the errors of
+        the failed ones for flush.  The next harvest is when _pending has
+        doubled, so harvesting costs O(1) per delivery.
+        """
+        pending = []
+        for subscriber, future in self._pending:
+            if not future.done():
+                pending.append((subscriber, future))
+            elif future.exception() is not None:
+                self._errors.append((subscriber, future.exception()))
+        self._pending = pending
+        self._harvest_at = max(_HARVEST_AT, 2 * len(pending))
+
+    def _on_collected(self, key: int, reference):
+        """
+        Counts a subscriber pruned after being garbage collected.  The weak
+        dictionaries drop the subscriber on their own.
+        """
+        if self._watch.pop(key, None) is not None:
+            self._pruned += 1
 
     @property
     def name(self):
@@ -88,3 +344,11 @@ class PublisherBase(IPublisher):
     @property
     def subscriber_count(self):
         return len(self._subscribers)
+
+    @property
+    def registry_stats(self):
+        """
+        (RegistryStats) Returns the number of subscribers currently
+        connected and the number pruned after being garbage collected.
+        """
+        return RegistryStats(size=len(self._subscribers), pruned=self._pruned)
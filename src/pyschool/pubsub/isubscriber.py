@@ -55,6 +55,15 @@ class SubscriberBase(ISubscriber):
         self._update_count += 1
         print(f"SubscriberBase.update() for {self.name}")
 
+    def publication_batch_callback(self, messages):
+        """The optional batch form of the default 'update' callback,
+        used by PublisherBase.publish_many.  Descendants may override
+        this method to handle a whole sequence (e.g., a list or NumPy
+        array) of messages in one call.  Defaults to one 'update' per
+        message."""
+        for _ in range(len(messages)):
+            self.update()
+
     @property
     def name(self):
         return self._name
@@ -0,0 +1,36 @@
+"""
+Implements IWriter
+"""
+
+from abc import ABC, abstractmethod
+
+
+class IWriter(ABC):
+    """
+    The Interface class for writers.
+
+    Attributes:
+        file_path (str): The path to the file to be written.
+    """
+
+    def __init__(self, file_path: str):
+        """
+        The init method of the IWriter class.
+
+        Arguments:
+            file_path (str): The path to the file to write.
+        """
+        super().__init__()
+
+    @abstractmethod
+    def write(self, data) -> str:
+        """
+        Writes the data to the file.
+
+        Arguments:
+            data (dict or np.ndarray): The data to be written.
+
+        Returns:
+            file_path (str): The path to the file written.
+        """
+        pass
@@ -1,12 +1,17 @@
 """
 Implements json.Reader
 """
+
 import numpy as np
 
 import json
+from typing import Iterator, Tuple
 
 from pubsub.reader_base import ReaderBase
 
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = tuple(_WHITESPACE + ",}]")  # may follow a complete number
+
 
 class Reader(ReaderBase):
     """
@@ -43,3 +48,94 @@ class Reader(ReaderBase):
             self._data = json.load(fin)
 
         # return data  # <-- no need to return, just set member data
+
+    def iter_items(self, block_size: int = 65536) -> Iterator[Tuple[str, object]]:
+        """
+        Reads the top-level object of the specified file path incrementally,
+        one (key, value) item at a time, so peak memory is set by the largest
+        item rather than the whole document.  The data property is not set.
+
+        Arguments:
+            block_size (int): The number of characters read from the file at
+                a time.  Defaults to 65536.
+
+        Yields:
+            item (tuple[str, object]): The next key and its decoded value, in
+                file order.  Unlike data, a repeated key is yielded again.
+
+        Raises:
+            FileNotFoundError: If the provided file_path does not
+                exist.
+            json.JSONDecodeError: If the file is not a valid json object.
+        """
+        decoder = json.JSONDecoder()
+        with open(self.file_path) as fin:
+            text, index = "", 0
+            at_end = False
+
+            def fill(minimum=block_size):
+                # appends at least minimum characters, unless the file ends
+                nonlocal text, index, at_end
+                block = fin.read(max(minimum, block_size))
+                at_end = not block
+                text, index = text[index:] + block, 0
+                return not at_end
+
+            def skip():
+                # advances to the next non-whitespace character, reading more
+                nonlocal index
+                while True:
+                    while index < len(text) and text[index] in _WHITESPACE:
+                        index += 1
+                    if index < len(text) or not fill():
+                        return text[index : index + 1]
+
+            def expect(characters):
+                nonlocal index
+                found = skip()
+                if not found or found not in characters:
+                    raise json.JSONDecodeError(
+                        f"Expecting one of {characters!r}", text, index
+                    )
+                index += 1
+                return found
+
+            def decode():
+                # decodes the next value, reading more until it is complete
+                nonlocal index
+                skip()
+                while True:
+                    try:
+                        value, end = decoder.raw_decode(text, index)
+                        # a number, e.g., 0. or 1e, may continue past the
+                        # text, unless a delimiter follows it
+                        number = isinstance(value, (int, float)) and not isinstance(
+                            value, bool
+                        )
+                        if at_end or not number or text[end : end + 1] in _DELIMITERS:
+                            index = end
+                            return value
+                    except json.JSONDecodeError:
+                        if at_end:
+                            raise
+                    fill(minimum=len(text) - index)  # doubles the pending text
+
+            def finish():
+                # only whitespace may follow the object, as with json.load
+                if skip():
+                    raise json.JSONDecodeError("Extra data", text, index)
+
+            expect("{")
+            if skip() == "}":
+                expect("}")
+                finish()
+                return
+            while True:
+                key = decode()
+                if not isinstance(key, str):
+                    raise json.JSONDecodeError("Expecting property name", text, index)
+                expect(":")
+                yield key, decode()
+                if expect(",}") == "}":
+                    finish()
+                    return
@@ -0,0 +1,66 @@
+"""
+Implements npy.Reader
+
+Memory-maps binary data instead of parsing text, so opening a multi-GB file
+costs nothing until its pages are touched, and data is a read-only,
+zero-copy view of the file.
+"""
+
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+from pubsub.reader_base import ReaderBase
+
+
+class Reader(ReaderBase):
+    """
+    A reader for binary data, either a .npy file, which describes its own
+    dtype and shape, or a raw file of a single dtype, e.g., the columns of a
+    table written with np.ndarray.tofile.
+
+    Attributes:
+        file_path (str): The path to the file containing the data.
+        dtype (np.dtype): The dtype of a raw file, ignored for a .npy file.
+        shape (tuple[int]): The shape of a raw file, ignored for a .npy
+            file.  None reads the raw file as one dimensional.
+        _data (np.memmap): The read-only memory map of the file.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        dtype: np.dtype = np.float64,
+        shape: Optional[Tuple[int, ...]] = None,
+    ):
+        """
+        The init method of the npy.Reader class.
+
+        Arguments:
+            file_path (str): The path to the file to be read.
+            dtype (np.dtype): The dtype of a raw file.  Defaults to
+                np.float64.
+            shape (tuple[int]): The shape of a raw file, e.g.,
+                (rows, columns).  Defaults to None, one dimensional.
+        """
+        super().__init__(file_path=file_path)
+        self.dtype = np.dtype(dtype)
+        self.shape = shape
+
+    def _read_data(self):
+        """
+        Memory-maps the data of the specified file path.
+
+        Raises:
+            FileNotFoundError: If the provided file_path does not
+                exist.
+            ValueError: If a .npy file is malformed or holds objects, or
+                if a raw file does not match its dtype and shape.
+        """
+        if Path(self.file_path).suffix == ".npy":
+            self._data = np.load(self.file_path, mmap_mode="r", allow_pickle=False)
+        else:
+            self._data = np.memmap(
+                self.file_path, dtype=self.dtype, mode="r", shape=self.shape
+            )
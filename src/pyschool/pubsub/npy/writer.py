@@ -0,0 +1,25 @@
+"""
+Implements npy.Writer
+"""
+
+import numpy as np
+
+from pubsub.writer_base import WriterBase
+
+
+class Writer(WriterBase):
+    """
+    A writer of one uncompressed .npy file per array, which npy.Reader can
+    memory-map.
+
+    Attributes:
+        file_path (str): The path to the file to be written.
+    """
+
+    suffix = ".npy"
+
+    def _write_data(self, fout, data):
+        """
+        Writes the array to an open binary file.
+        """
+        np.save(fout, np.asarray(data), allow_pickle=False)
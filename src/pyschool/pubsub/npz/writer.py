@@ -0,0 +1,27 @@
+"""
+Implements npz.Writer
+"""
+
+import numpy as np
+
+from pubsub.writer_base import WriterBase
+
+
+class Writer(WriterBase):
+    """
+    A writer of compressed .npz shards, each holding up to shard_size arrays
+    by name, so a dataset of many small arrays is a few files.  A shard is
+    read with np.load, e.g., np.load(file_path)["3Dircadb1.1_image_0"].
+
+    Attributes:
+        file_path (str): The path to the file to be written.
+    """
+
+    suffix = ".npz"
+    shard_size = 256
+
+    def _write_data(self, fout, data):
+        """
+        Writes the dict of arrays to an open binary file.
+        """
+        np.savez_compressed(fout, **data)
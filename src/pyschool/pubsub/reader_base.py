@@ -1,23 +1,134 @@
 """
 Implements ReaderBase
+
+Readers may share an optional, process-wide read cache, so that opening an
+unchanged file again costs a stat call instead of a full parse:
+
+    > from pubsub.reader_base import ReadCache, ReaderBase
+    > ReaderBase.cache = ReadCache(max_bytes=2**28)
+    > ReaderBase.cache.stats  # CacheStats(hits=..., misses=..., ...)
 """
 
+from collections import OrderedDict
+import os
+from threading import Lock
+from typing import NamedTuple
+
 import numpy as np
 
 # from ptm.data.reader import IReader
 # from pyschool.pubsub import IReader
 from pubsub.ireader import IReader
 
+MAPPED_NBYTES = 4096  # the nominal size of a memory-mapped array, one page
+
+
+class CacheStats(NamedTuple):
+    hits: int  # reads answered from the cache
+    misses: int  # reads that parsed the file
+    evictions: int  # entries removed to stay within the byte budget
+    entries: int  # entries currently cached
+    nbytes: int  # bytes currently cached
+
+
+class ReadCache:
+    """
+    A least recently used cache of parsed data, keyed by the path,
+    modification time, and size of a file, and the reader that parsed it.
+    A changed file has a new key, so it is parsed again.
+
+    Cached data is shared by every reader of the same file; NumPy arrays
+    are made read-only when cached, and other data must not be modified.
+    Memory-mapped arrays live in the page cache rather than in memory, so
+    a reader charges them at the nominal MAPPED_NBYTES.
+
+    Attributes:
+        max_bytes (int): The byte budget; the least recently used entries are
+            evicted to stay within it.
+        _entries (OrderedDict[tuple: tuple[data, int]]): The cached data and
+            its size in bytes, least recently used first.
+    """
+
+    def __init__(self, max_bytes: int = 2**28):
+        """
+        The init method of the ReadCache class.
+
+        Arguments:
+            max_bytes (int): The byte budget.  Defaults to 2**28 (256 MiB).
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = Lock()
+
+    def get(self, key: tuple):
+        """
+        Returns the data cached under the key, or None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: tuple, data, nbytes: int):
+        """
+        Caches data of nbytes under the key, unless it exceeds the budget.
+        """
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._nbytes -= previous[1]
+            if nbytes > self.max_bytes:
+                return
+            if isinstance(data, np.ndarray):
+                data.flags.writeable = False
+            self._entries[key] = (data, nbytes)
+            self._nbytes += nbytes
+            while self._nbytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._nbytes -= evicted
+                self._evictions += 1
+
+    def clear(self):
+        """
+        Empties the cache and resets its statistics.
+        """
+        with self._lock:
+            self._entries = OrderedDict()
+            self._nbytes = self._hits = self._misses = self._evictions = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        """(CacheStats) Returns the hit, miss, and size statistics."""
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            entries=len(self._entries),
+            nbytes=self._nbytes,
+        )
+
 
 class ReaderBase(IReader):
     """
     The Base class for readers.
 
     Attributes:
+        cache (ReadCache): The read cache shared by all readers, or None
+            (default) for no cache.
         file_path (str): The path to the file containing the data.
         _data (dict or np.ndarray): The data read from the file.
     """
 
+    cache = None
+
     def __init__(self, file_path: str):
         """
         The init method of the ReaderBase class.
@@ -47,11 +158,41 @@ class ReaderBase(IReader):
                 does not contain a valid dicom file.
         """
         if self._data is None:
-            # self._data = self._read_data()  # <-- avoid passing back the data, just set the data
-            self._read_data()
+            cache = ReaderBase.cache
+            if cache is None:
+                # self._data = self._read_data()  # <-- avoid passing back the data, just set the data
+                self._read_data()
+            else:
+                status = os.stat(self.file_path)
+                key = (
+                    os.path.realpath(self.file_path),
+                    status.st_mtime_ns,
+                    status.st_size,
+                    self._mode(),
+                )
+                self._data = cache.get(key)
+                if self._data is None:
+                    self._read_data()
+                    if isinstance(self._data, np.memmap):
+                        nbytes = MAPPED_NBYTES
+                    else:
+                        nbytes = getattr(self._data, "nbytes", status.st_size)
+                    cache.put(key, self._data, nbytes)
 
         return self._data  # <-- now data can be passed back to the client
 
+    def _mode(self) -> tuple:
+        """
+        Returns the reader class and its public options, e.g., a csv
+        engine, which distinguish data parsed from the same file.
+        """
+        options = tuple(
+            (name, repr(value))
+            for name, value in sorted(vars(self).items())
+            if not name.startswith("_") and name != "file_path"
+        )
+        return (type(self).__module__, type(self).__qualname__, options)
+
     # def _read_data(self) -> np.ndarray:
     def _read_data(self):
         """
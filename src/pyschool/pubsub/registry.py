@@ -0,0 +1,187 @@
+"""
+Implements Registry
+
+A process-wide registry of class constructors, keyed by name.  Constructors
+are registered with a decorator, as a lazy "module:attribute" target, or from
+installed entry points, and are otherwise found at a conventional location in
+the package.  Modules are imported on first use only, and each name is
+resolved once per process, so building many objects of few classes costs one
+import per class, not one per object.
+
+Example:
+    > from pubsub.registry import builders
+    >
+    > @builders.register("tabloid")
+    > class Tabloid(PublisherBase):
+    >     pass
+    >
+    > builders.register_lazy("broadsheet", "mypackage.papers:Broadsheet")
+    > builders.resolve("broadsheet")  # imports mypackage.papers now
+"""
+
+from importlib import import_module
+from importlib.metadata import entry_points
+from threading import Lock
+from typing import Callable, Tuple
+
+
+class Registry:
+    """
+    A cache of class constructors, keyed by name.
+
+    Attributes:
+        package (str): The package that conventional locations are relative to.
+        _locate (Callable[[str], Tuple[str, str]]): Returns the conventional
+            (module, attribute) location of a name, the module relative to
+            the package.
+        _targets (dict[str: str or Callable]): The registered names and their
+            constructors, or their lazy "module:attribute" targets.
+        _cache (dict[str: Callable or Exception]): The resolved names and
+            their constructors, or the error raised resolving them.
+    """
+
+    def __init__(self, package: str, locate: Callable[[str], Tuple[str, str]]):
+        """
+        The init method of the Registry class.
+
+        Arguments:
+            package (str): The package that conventional locations are
+                relative to.
+            locate (Callable[[str], Tuple[str, str]]): Returns the
+                conventional (module, attribute) location of a name.
+        """
+        self.package = package
+        self._locate = locate
+        self._targets = dict()
+        self._cache = dict()
+        self._lock = Lock()
+
+    def register(self, name: str, constructor: Callable = None):
+        """
+        Registers a constructor under a name.  Used as a decorator if no
+        constructor is given.
+
+        Arguments:
+            name (str): The name the constructor is resolved by.
+            constructor (Callable): The constructor.  Defaults to None.
+
+        Returns:
+            The constructor, or a decorator that registers its argument.
+        """
+        if constructor is None:
+            return lambda item: self.register(name, item)
+
+        with self._lock:
+            self._targets[name] = constructor
+            self._cache.pop(name, None)
+        return constructor
+
+    def register_lazy(self, name: str, target: str):
+        """
+        Registers a "module:attribute" target under a name, imported on
+        first use.
+
+        Arguments:
+            name (str): The name the constructor is resolved by.
+            target (str): The absolute module and the attribute of the
+                constructor, e.g., 'pubsub.newspaper:Newspaper'.
+        """
+        with self._lock:
+            self._targets[name] = target
+            self._cache.pop(name, None)
+
+    def load_entry_points(self, group: str):
+        """
+        Registers, lazily, the entry points of the installed distributions.
+
+        Arguments:
+            group (str): The entry point group, e.g., 'pyschool.pubsub'.
+        """
+        try:
+            found = entry_points(group=group)
+        except TypeError:  # Python < 3.10 returns a dict of groups
+            found = entry_points().get(group, ())
+        for item in found:
+            self.register_lazy(item.name, item.value)
+
+    def resolve(self, name: str) -> Callable:
+        """
+        Returns the constructor of a name, importing its module on first use.
+
+        Arguments:
+            name (str): The name of the constructor.
+
+        Returns:
+            constructor (Callable): The class constructor.
+
+        Raises:
+            ModuleNotFoundError: If the module of the constructor does not
+                exist.
+            AttributeError: If the module has no such constructor.
+        """
+        try:
+            constructor = self._cache[name]
+        except KeyError:
+            # imports outside the lock, as the module may register itself
+            loaded = self._load(name)
+            with self._lock:
+                target = self._targets.get(name, None)
+                if target is not None and not isinstance(target, str):
+                    loaded = target  # a registration made while importing wins
+                constructor = self._cache.setdefault(name, loaded)
+
+        if isinstance(constructor, Exception):
+            # a new error each time, chained to the cached one and its traceback
+            message = f"Cannot resolve '{name}': {constructor}"
+            if isinstance(constructor, ImportError):
+                error = type(constructor)(
+                    message, name=constructor.name, path=constructor.path
+                )
+            else:
+                error = type(constructor)(message)
+            raise error from constructor
+        return constructor
+
+    def clear(self):
+        """
+        Forgets the resolved constructors, keeping the registrations.
+        """
+        with self._lock:
+            self._cache = dict()
+
+    def _load(self, name: str):
+        """
+        Finds the constructor of a name, or the error raised finding it.
+        """
+        target = self._targets.get(name, None)
+        if target is not None and not isinstance(target, str):
+            return target
+        try:
+            if target is None:
+                module_name, attribute = self._locate(name)
+                module = import_module(module_name, package=self.package)
+            else:
+                module_name, attribute = target.split(":")
+                module = import_module(module_name)
+            return getattr(module, attribute)
+        except (ModuleNotFoundError, AttributeError) as error:
+            return error
+
+    @property
+    def names(self):
+        """(tuple[str]) Returns the names registered or resolved so far."""
+        return tuple(dict.fromkeys([*self._targets, *self._cache]))
+
+
+# The classes built from a build specification, e.g., 'newspaper' is found
+# as the class Newspaper in the module pubsub.newspaper.
+builders = Registry(
+    package="pubsub", locate=lambda name: (f".{name}", name.capitalize())
+)
+
+# The readers by mode, e.g., 'json' is found as pubsub.json.reader.Reader.
+readers = Registry(package="pubsub", locate=lambda mode: (f".{mode}.reader", "Reader"))
+
+# The writers by mode, e.g., 'npy' is found as pubsub.npy.writer.Writer.
+writers = Registry(package="pubsub", locate=lambda mode: (f".{mode}.writer", "Writer"))
+writers.register_lazy("numpy", "pubsub.npy.writer:Writer")  # Controller default
@@ -0,0 +1,266 @@
+"""
+Implements a shared-memory transport for NumPy payloads.
+
+A publisher writes each array once into a ring of slots in a
+multiprocessing.shared_memory segment, and sends subscribers only a small
+ArrayDescriptor (segment name, shape, dtype, offset, sequence).  Subscribers
+in other processes attach to the segment by name and read the array as a
+zero-copy view, so cross-process delivery avoids pickling the whole array.
+
+Each slot begins with a header holding the sequence number of the array
+last written to it, or -1 while the slot is being written.  A slot is reused
+after `slots` further writes, so a subscriber must finish with a view before
+then; SharedArrayReader.view raises StaleDescriptorError for a descriptor
+whose slot was reused or is being rewritten, and SharedArrayReader.read
+copies the array and raises if the slot was rewritten during the copy.
+"""
+
+from multiprocessing import shared_memory
+from typing import NamedTuple
+
+import numpy as np
+
+from pubsub.ipublisher import PublisherBase
+
+_HEADER = 64  # bytes reserved at the start of each slot, keeps data aligned
+_WRITING = -1  # the header of a slot while its data is being written
+
+
+class ArrayDescriptor(NamedTuple):
+    """The small, picklable description of an array in shared memory."""
+
+    name: str  # name of the shared memory segment
+    shape: tuple  # shape of the array
+    dtype: str  # dtype of the array, as a string, e.g., '<f8'
+    offset: int  # byte offset of the array data within the segment
+    sequence: int  # number of the write that produced the array
+
+
+class StaleDescriptorError(Exception):
+    """Raised when the slot of a descriptor has been reused by a later write."""
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Attaches to an existing segment without registering it with this
+    process's resource tracker (Python 3.13+), which would otherwise unlink
+    the segment when this process exits.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13 has no track keyword
+        return shared_memory.SharedMemory(name=name)
+
+
+class SharedArrayRing:
+    """
+    The writer side of the transport, owns the shared memory segment.
+
+    Attributes:
+        slots (int): The number of slots in the ring.
+        slot_bytes (int): The capacity, in bytes, of the array data of a slot.
+        _shm (multiprocessing.shared_memory.SharedMemory): The segment.
+        _sequence (int): The number of arrays written so far.
+    """
+
+    def __init__(self, slot_bytes: int, slots: int = 4):
+        """
+        The init method of the SharedArrayRing class.
+
+        Arguments:
+            slot_bytes (int): The capacity, in bytes, of the array data of a
+                slot, i.e., the largest array.nbytes that can be written.
+            slots (int): The number of slots in the ring.  Defaults to 4.
+        """
+        if slots < 1 or slot_bytes < 1:
+            raise ValueError("slots and slot_bytes must be positive.")
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self._stride = _HEADER + -(-slot_bytes // _HEADER) * _HEADER
+        self._shm = shared_memory.SharedMemory(create=True, size=self._stride * slots)
+        self._sequence = 0
+
+    def write(self, array: np.ndarray) -> ArrayDescriptor:
+        """
+        Copies the array into the next slot of the ring.
+
+        Arguments:
+            array (np.ndarray): The array to write.
+
+        Returns:
+            descriptor (ArrayDescriptor): The description of the written array.
+
+        Raises:
+            ValueError: If the array is larger than slot_bytes.
+        """
+        array = np.asarray(array)
+        if array.nbytes > self.slot_bytes:
+            raise ValueError(
+                f"Array of {array.nbytes} bytes exceeds slot of {self.slot_bytes} bytes."
+            )
+        sequence = self._sequence
+        start = (sequence % self.slots) * self._stride
+        offset = start + _HEADER
+        header = np.ndarray((1,), dtype=np.int64, buffer=self._shm.buf, offset=start)
+        header[0] = _WRITING  # invalidates the previous descriptor first
+        target = np.ndarray(
+            array.shape, dtype=array.dtype, buffer=self._shm.buf, offset=offset
+        )
+        target[...] = array
+        header[0] = sequence  # publishes the array once it is complete
+        self._sequence += 1
+        return ArrayDescriptor(
+            name=self._shm.name,
+            shape=array.shape,
+            dtype=array.dtype.str,
+            offset=offset,
+            sequence=sequence,
+        )
+
+    def close(self):
+        """
+        Closes and unlinks the segment.  Views must not be used afterwards.
+        """
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def name(self) -> str:
+        """(str) Returns the name of the shared memory segment."""
+        return self._shm.name
+
+
+class SharedArrayReader:
+    """
+    The subscriber side of the transport, opens each segment once.
+
+    Attributes:
+        _segments (dict[str: SharedMemory]): The segments attached so far.
+    """
+
+    def __init__(self):
+        """
+        The init method of the SharedArrayReader class.
+        """
+        self._segments = dict()
+
+    def view(self, descriptor: ArrayDescriptor) -> np.ndarray:
+        """
+        Returns a read-only, zero-copy view of the described array.
+
+        Arguments:
+            descriptor (ArrayDescriptor): The description of the array.
+
+        Returns:
+            array (np.ndarray): The view of the array in shared memory.
+
+        Raises:
+            FileNotFoundError: If the segment no longer exists.
+            StaleDescriptorError: If the slot has been reused, or is being
+                rewritten, by a later write.
+        """
+        shm = self._segments.get(descriptor.name)
+        if shm is None:
+            shm = self._segments[descriptor.name] = _attach(descriptor.name)
+        self._check(shm, descriptor)
+        array = np.ndarray(
+            descriptor.shape,
+            dtype=np.dtype(descriptor.dtype),
+            buffer=shm.buf,
+            offset=descriptor.offset,
+        )
+        array.flags.writeable = False
+        self._check(shm, descriptor)  # not rewritten while the view was made
+        return array
+
+    def read(self, descriptor: ArrayDescriptor) -> np.ndarray:
+        """
+        Returns a copy of the described array, checked to be complete, i.e.,
+        its slot was not rewritten while it was copied.
+
+        Arguments:
+            descriptor (ArrayDescriptor): The description of the array.
+
+        Returns:
+            array (np.ndarray): The copy of the array.
+
+        Raises:
+            FileNotFoundError: If the segment no longer exists.
+            StaleDescriptorError: If the slot has been reused, or is being
+                rewritten, by a later write.
+        """
+        array = self.view(descriptor).copy()
+        self._check(self._segments[descriptor.name], descriptor)
+        return array
+
+    @staticmethod
+    def _check(shm, descriptor: ArrayDescriptor):
+        """
+        Raises StaleDescriptorError unless the slot header still holds the
+        sequence number of the descriptor.
+        """
+        header = descriptor.offset - _HEADER
+        sequence = np.ndarray((1,), dtype=np.int64, buffer=shm.buf, offset=header)[0]
+        if sequence == _WRITING:
+            raise StaleDescriptorError(
+                f"Slot of write {descriptor.sequence} is being rewritten."
+            )
+        if sequence != descriptor.sequence:
+            raise StaleDescriptorError(
+                f"Slot of write {descriptor.sequence} was reused by write {sequence}."
+            )
+
+    def close(self):
+        """
+        Detaches from all segments.  All views must be released first.
+        """
+        for shm in self._segments.values():
+            shm.close()
+        self._segments = dict()
+
+
+class SharedArrayPublisher(PublisherBase):
+    """
+    A publisher that broadcasts NumPy arrays through shared memory.
+
+    publish_array writes the array once into the ring and delivers the
+    ArrayDescriptor through publish_many, so subscribers implement
+    "publication_batch_callback" and open the descriptors with a
+    SharedArrayReader.
+    """
+
+    def __init__(self, **kwargs):
+        """
+        Keyword Arguments:
+            slot_bytes (int): The capacity, in bytes, of a ring slot.
+            slots (int): The number of ring slots.  Defaults to 4.
+            Other keywords as PublisherBase.
+        """
+        super().__init__(**kwargs)
+        self._ring = SharedArrayRing(
+            slot_bytes=kwargs["slot_bytes"], slots=kwargs.get("slots", 4)
+        )
+
+    def publish_array(self, array: np.ndarray) -> ArrayDescriptor:
+        """
+        Writes the array into shared memory and publishes its descriptor.
+
+        Arguments:
+            array (np.ndarray): The array to publish.
+
+        Returns:
+            descriptor (ArrayDescriptor): The description of the array sent.
+        """
+        descriptor = self._ring.write(array)
+        self.publish_many((descriptor,))
+        return descriptor
+
+    def shutdown(self, wait: bool = True):
+        super().shutdown(wait=wait)
+        self._ring.close()
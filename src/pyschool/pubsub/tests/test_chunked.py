@@ -0,0 +1,68 @@
+"""
+This module tests the chunked store writer and reader of the pubsub package.
+
+Example:
+    > conda activate pyschool-env
+    > pytest src/pyschool/pubsub/tests/test_chunked.py -rP
+"""
+
+import zlib
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from pubsub.chunked.reader import Reader
+from pubsub.chunked.writer import Writer
+
+ARRAYS = {
+    "frames": np.arange(1000, dtype=np.int32).reshape(100, 10),
+    "scale": np.array(2.5),
+    "empty": np.zeros((0, 3), dtype=np.float32),
+}
+
+
+@pytest.fixture
+def shard(tmp_path):
+    """A shard of ARRAYS, with 8 rows (320 bytes) of frames per chunk."""
+    path = str(tmp_path / "shard.chunk")
+    Writer(path, chunk_bytes=320).write(ARRAYS)
+    return path
+
+
+def test_chunked_round_trip(shard):
+    data = Reader(shard).data
+    assert list(data) == list(ARRAYS)
+    for name, array in ARRAYS.items():
+        assert data[name].dtype == array.dtype
+        assert data[name].shape == array.shape
+        np.testing.assert_array_equal(data[name], array)
+
+
+@pytest.mark.parametrize(
+    "start, stop, chunks",
+    [(0, 8, 1), (7, 9, 2), (20, 35, 3), (96, None, 1), (-3, None, 1), (5, 5, 1)],
+)
+def test_chunked_read_decompresses_only_its_chunks(shard, start, stop, chunks):
+    reader = Reader(shard)
+    with patch("pubsub.chunked.reader.zlib.decompress", wraps=zlib.decompress) as mock:
+        rows = reader.read("frames", start, stop)
+    np.testing.assert_array_equal(rows, ARRAYS["frames"][start:stop])
+    assert mock.call_count == chunks
+
+
+def test_chunked_read_edge_cases(shard):
+    reader = Reader(shard)
+    assert reader.names == list(ARRAYS)
+    assert reader.read("empty").shape == (0, 3)
+    with pytest.raises(ValueError):
+        reader.read("scale")
+    with pytest.raises(KeyError):
+        reader.read("missing")
+
+
+def test_chunked_rejects_other_files(tmp_path):
+    path = tmp_path / "other.chunk"
+    path.write_bytes(b"not a shard\n")
+    with pytest.raises(ValueError):
+        Reader(str(path)).data
@@ -0,0 +1,221 @@
+"""
+This module tests the dataset materialization of pubsub.controller.Controller.
+
+Example:
+    > conda activate pyschool-env
+    > pytest src/pyschool/pubsub/tests/test_controller.py -rP
+"""
+
+import json
+import os
+from pathlib import Path
+from unittest.mock import PropertyMock, patch
+
+import numpy as np
+import pytest
+
+from pubsub.controller import Controller, JobError
+from pubsub.factory import Factory
+
+
+@pytest.fixture
+def datasets():
+    """Patches Controller.datasets, so a test sets the split it materializes
+    as the mock's return_value."""
+    with patch.object(Controller, "datasets", new_callable=PropertyMock) as mock:
+        yield mock
+
+
+@pytest.fixture
+def scans(tmp_path):
+    """Returns the empty scan folder of one patient, under tmp_path / "in"."""
+    scans = tmp_path / "in" / "3Dircadb1.1" / "PATIENT_DICOM"
+    scans.mkdir(parents=True)
+    return scans
+
+
+def test_controller_materializes_in_parallel(datasets, tmp_path):
+    read_loc, write_loc = tmp_path / "in", tmp_path / "out"
+    for patient in (1, 2):
+        scans = read_loc / f"3Dircadb1.{patient}" / "PATIENT_DICOM"
+        scans.mkdir(parents=True)
+        for image in range(3):
+            np.save(scans / f"image_{image}.npy", np.full(4, 10 * patient + image))
+
+    controller = Controller(
+        read_loc=str(read_loc),
+        write_loc=str(write_loc),
+        read_mode="npy",
+        executor="process",
+        max_workers=2,
+        max_in_flight=2,
+    )
+    filenames = sorted(controller._filenames)
+    assert len(filenames) == 6
+    datasets.return_value = {
+        str(write_loc / "train"): filenames[:4],
+        str(write_loc / "validation"): filenames[4:5],
+        str(write_loc / "test"): filenames[5:],
+    }
+    controller.data()
+
+    written = write_loc / "test" / "scans" / "3Dircadb1.2_image_2.npy"
+    np.testing.assert_array_equal(np.load(written), np.full(4, 22))
+    assert len(list(write_loc.rglob("*.npy"))) == 6
+    assert list(write_loc.rglob("*.tmp")) == []
+
+
+def test_controller_incremental(datasets, scans, tmp_path):
+    write_loc = tmp_path / "out"
+    for image in range(3):
+        np.save(scans / f"image_{image}.npy", np.full(4, image))
+
+    def run():
+        controller = Controller(
+            read_loc=str(tmp_path / "in"),
+            write_loc=str(write_loc),
+            read_mode="npy",
+            executor="inline",
+            incremental=True,
+        )
+        datasets.return_value = {
+            str(write_loc / "train"): sorted(controller._filenames)
+        }
+        controller.data()
+        return json.loads(Path(controller.manifest_path).read_text())
+
+    assert len(run()) == 3
+    outputs = write_loc / "train" / "scans"
+    inodes = {item.name: item.stat().st_ino for item in outputs.iterdir()}
+
+    np.save(scans / "image_0.npy", np.full(4, 7))  # changed
+    touched = scans / "image_1.npy"
+    os.utime(touched, ns=(0, touched.stat().st_mtime_ns + 10**9))
+    (scans / "image_2.npy").unlink()  # orphans its output
+    manifest = run()
+
+    assert len(manifest) == 2
+    assert sorted(item.name for item in outputs.iterdir()) == [
+        "3Dircadb1.1_image_0.npy",
+        "3Dircadb1.1_image_1.npy",
+    ]
+    np.testing.assert_array_equal(
+        np.load(outputs / "3Dircadb1.1_image_0.npy"), np.full(4, 7)
+    )
+    assert (outputs / "3Dircadb1.1_image_1.npy").stat().st_ino == inodes[
+        "3Dircadb1.1_image_1.npy"
+    ]
+    assert manifest[str(touched)]["mtime_ns"] == touched.stat().st_mtime_ns
+
+
+def test_controller_raises_failed_jobs(datasets, scans, tmp_path):
+    read_loc, write_loc = tmp_path / "in", tmp_path / "out"
+    np.save(scans / "image_0.npy", np.zeros(4))
+    (scans / "image_1.npy").write_bytes(b"not an array")
+    (read_loc / "3Dircadb1.2").mkdir()  # no PATIENT_DICOM
+
+    controller = Controller(
+        read_loc=str(read_loc),
+        write_loc=str(write_loc),
+        read_mode="npy",
+        executor="thread",
+        incremental=True,
+    )
+    with pytest.raises(JobError) as raised:
+        controller._filenames
+    assert isinstance(raised.value.errors[0][1], FileNotFoundError)
+
+    (read_loc / "3Dircadb1.2").rmdir()
+    datasets.return_value = {str(write_loc / "train"): sorted(controller._filenames)}
+    with pytest.raises(JobError) as raised:
+        controller.data()
+
+    assert len(raised.value.errors) == 1
+    (args, _), *_ = raised.value.errors
+    assert list(args[2].values()) == [str(scans / "image_1.npy")]
+    manifest = json.loads(Path(controller.manifest_path).read_text())
+    assert list(manifest) == [str(scans / "image_0.npy")]
+
+
+def test_controller_not_incremental_reads_inputs_once(datasets, scans, tmp_path):
+    write_loc = tmp_path / "out"
+    for image in range(3):
+        np.save(scans / f"image_{image}.npy", np.full(4, image))
+
+    controller = Controller(
+        read_loc=str(tmp_path / "in"),
+        write_loc=str(write_loc),
+        read_mode="npy",
+        executor="inline",
+    )
+    datasets.return_value = {str(write_loc / "train"): sorted(controller._filenames)}
+    with patch("pubsub.controller._digest") as digest:
+        controller.data()
+
+    digest.assert_not_called()
+    manifest = json.loads(Path(controller.manifest_path).read_text())
+    assert len(manifest) == 3
+    assert all("sha256" not in item for item in manifest.values())
+
+
+def test_controller_hash_split(scans, tmp_path):
+    for image in range(300):
+        (scans / f"image_{image}").touch()
+
+    def split():
+        controller = Controller(
+            read_loc=str(tmp_path / "in"), write_loc=str(tmp_path), split_mode="hash"
+        )
+        return {
+            Path(path).name: set(fnames) for path, fnames in controller.datasets.items()
+        }
+
+    before = split()
+    assert sum(len(fnames) for fnames in before.values()) == 300
+    assert 150 < len(before["train"]) < 270
+    (scans / "image_300").touch()
+    after = split()
+    for dset, fnames in before.items():
+        assert fnames <= after[dset]  # no file moved
+    with pytest.raises(ValueError):
+        Controller(split_mode="alphabetical")
+
+
+@pytest.mark.parametrize("mode, executor", [("npz", "inline"), ("chunked", "process")])
+def test_controller_sharded_writers(datasets, scans, tmp_path, mode, executor):
+    write_loc = tmp_path / mode
+    for image in range(5):
+        np.save(scans / f"image_{image}.npy", np.full((2, 3), image, np.int16))
+
+    def run():
+        controller = Controller(
+            read_loc=str(tmp_path / "in"),
+            write_loc=str(write_loc),
+            read_mode="npy",
+            write_mode=mode,
+            executor=executor,
+            shard_size=2,
+            incremental=True,
+        )
+        datasets.return_value = {
+            str(write_loc / "train"): sorted(controller._filenames)
+        }
+        controller.data()
+        shards = sorted((write_loc / "train" / "scans").iterdir())
+        return {shard.name: shard.stat().st_ino for shard in shards}
+
+    inodes = run()
+    assert len(inodes) == 3  # 2 + 2 + 1 scans
+    if mode == "npz":
+        data = np.load(write_loc / "train" / "scans" / "shard-000001.npz")
+    else:
+        shard = write_loc / "train" / "scans" / "shard-000001.chunk"
+        data = Factory.reader_factory(mode="chunked")(str(shard)).data
+    assert sorted(data) == ["3Dircadb1.1_image_2", "3Dircadb1.1_image_3"]
+    np.testing.assert_array_equal(data["3Dircadb1.1_image_3"], np.full((2, 3), 3))
+    assert data["3Dircadb1.1_image_3"].dtype == np.int16
+
+    np.save(scans / "image_4.npy", np.zeros((2, 3), np.int16))
+    rewritten = run()
+    unchanged = [name for name in inodes if inodes[name] == rewritten[name]]
+    assert unchanged == sorted(inodes)[:2]
@@ -0,0 +1,41 @@
+"""
+This module tests pubsub.data_loader.DataLoader.
+
+Example:
+    > conda activate pyschool-env
+    > pytest src/pyschool/pubsub/tests/test_data_loader.py -rP
+"""
+
+import numpy as np
+
+from pubsub.data_loader import DataLoader
+
+
+def test_data_loader(tmp_path):
+    paths = []
+    for image in range(10):
+        paths.append(str(tmp_path / f"image_{image}.npy"))
+        np.save(paths[-1], np.full(3, image))
+
+    loader = DataLoader(paths, batch_size=4, prefetch=3)
+    batches = list(loader)
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert len(loader) == 3
+    np.testing.assert_array_equal(batches[1][:, 0], [4, 5, 6, 7])
+    assert loader.stats[:2] == (10, 3)
+
+    def shuffled(executor):
+        loader = DataLoader(
+            paths,
+            batch_size=4,
+            executor=executor,
+            shuffle_buffer=5,
+            seed=7,
+            drop_last=True,
+        )
+        return np.concatenate(list(loader))[:, 0].tolist()
+
+    order = shuffled("process")
+    assert len(order) == 8
+    assert order != sorted(order)
+    assert order == shuffled("inline")  # same seed, same order
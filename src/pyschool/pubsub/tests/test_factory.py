@@ -0,0 +1,89 @@
+"""
+This module tests the building and wiring of pubsub.factory.Factory.
+
+Example:
+    > conda activate pyschool-env
+    > pytest src/pyschool/pubsub/tests/test_factory.py -rP
+"""
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from pubsub.factory import Factory
+from pubsub.registry import builders
+
+CONFIG = Path(__file__).parents[1] / "testtorefactor" / "config.json"
+
+
+def test_factory_builds_from_specification():
+    Factory(str(CONFIG))
+    assert "newspaper" in builders.names
+    assert "lectiophile" in builders.names
+
+
+def test_factory_shares_rosters():
+    objects = Factory(str(CONFIG)).objects
+    nyt, wsj = objects["publisher-1"], objects["publisher-2"]
+    assert nyt.subscribers is wsj.subscribers  # one roster, O(P + S)
+    assert nyt.subscriber_count == 2
+    for key in ("subscriber-1", "subscriber-2"):
+        assert objects[key].update_count == 2  # as full bipartite
+
+
+def test_factory_routing(tmp_path):
+    specification = {
+        "publisher-1": {"module": "newspaper", "name": "NYT", "topic": "news"},
+        "publisher-2": {"module": "newspaper", "name": "WSJ", "topic": "news"},
+        "publisher-3": {"module": "newspaper", "name": "ESPN", "topic": "sports"},
+        "subscriber-1": {
+            "module": "lectiophile",
+            "name": "Alice",
+            "topics": ["n*"],
+        },
+        "subscriber-2": {
+            "module": "lectiophile",
+            "name": "Bob",
+            "follows": ["publisher-3"],
+        },
+        "subscriber-3": {"module": "lectiophile", "name": "Carol"},
+    }
+    path = tmp_path / "routing.json"
+    path.write_text(json.dumps(specification))
+    objects = Factory(str(path), publish="batched").objects
+    with pytest.raises(ValueError):
+        Factory(str(path), publish="sometimes")
+
+    nyt, wsj, espn = (objects[f"publisher-{i}"] for i in (1, 2, 3))
+    alice, bob, carol = (objects[f"subscriber-{i}"] for i in (1, 2, 3))
+    assert nyt.subscribers is wsj.subscribers
+    assert list(nyt.subscribers) == [alice, carol]
+    assert list(espn.subscribers) == [carol, bob]
+    assert alice.update_count == 2
+    assert bob.update_count == 1
+    assert carol.update_count == 3
+
+
+def test_factory_keeps_only_the_routing_of_items(tmp_path):
+    specification = {
+        "publisher-1": {"module": "newspaper", "name": "NYT", "topic": "news"},
+        "subscriber-1": {
+            "module": "lectiophile",
+            "name": "Alice",
+            "zipcode": 87111,
+            "topics": ["news"],
+            "callback": "serialize",
+        },
+    }
+    path = tmp_path / "routing.json"
+    path.write_text(json.dumps(specification))
+    with patch.object(Factory, "_wire", wraps=Factory._wire) as wire:
+        Factory(str(path))
+
+    (routing, *_), _ = wire.call_args
+    assert routing == {
+        "publisher-1": {"topic": "news"},
+        "subscriber-1": {"topics": ["news"], "callback": "serialize"},
+    }
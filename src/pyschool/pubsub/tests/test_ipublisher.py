@@ -0,0 +1,133 @@
+"""
+This module tests the delivery of pubsub.ipublisher.PublisherBase.
+
+Example:
+    > conda activate pyschool-env
+    > pytest src/pyschool/pubsub/tests/test_ipublisher.py -rP
+"""
+
+import gc
+from concurrent.futures import wait
+from unittest.mock import patch
+
+import pytest
+
+from pubsub.ipublisher import PublishError, RegistryStats
+from pubsub.lectiophile import Lectiophile
+from pubsub.newspaper import Newspaper
+
+
+def test_publish_many():
+    wsj = Newspaper(name="The Wall Street Journal")
+    alice = Lectiophile(name="Alice Ackerman")
+    bob = Lectiophile(name="Bob Beverly")
+
+    batches = []
+    bob.publication_batch_callback = batches.append  # batched subscriber
+
+    wsj.connect(alice)
+    wsj.connect(bob)
+    wsj.publish_many(["Monday", "Tuesday", "Wednesday"])
+
+    assert alice.update_count == 3  # default, one update per message
+    assert bob.update_count == 0  # received the batch instead
+    assert batches == [["Monday", "Tuesday", "Wednesday"]]
+
+
+def test_thread_executor_flush():
+    wsj = Newspaper(name="The Wall Street Journal", executor="thread")
+    readers = [Lectiophile(name=f"Reader {i}") for i in range(8)]
+    for reader in readers:
+        wsj.connect(reader)
+
+    wsj.publish()
+    wsj.publish()
+    wsj.flush()  # waits for all submitted callbacks
+    wsj.shutdown()
+
+    assert all(reader.update_count == 2 for reader in readers)
+
+
+def test_process_executor():
+    wsj = Newspaper(name="The Wall Street Journal", executor="process")
+    alice = Lectiophile(name="Alice Ackerman")
+    wsj.connect(alice)
+
+    wsj.publish()
+    wsj.flush()
+    wsj.shutdown()
+
+    # the callback ran on a copy of alice in another process
+    assert alice.update_count == 0
+
+
+def test_unknown_executor():
+    with pytest.raises(ValueError):
+        Newspaper(name="The Wall Street Journal", executor="no-such-executor")
+
+
+@pytest.mark.parametrize("executor", ["inline", "thread"])
+def test_error_aggregation(executor):
+    wsj = Newspaper(name="The Wall Street Journal", executor=executor)
+    alice = Lectiophile(name="Alice Ackerman")
+    bob = Lectiophile(name="Bob Beverly")
+    cali = Lectiophile(name="Cali Cooper")
+    wsj.connect(alice)
+    wsj.connect(bob)
+    wsj.connect(cali)
+    alice.update = bob.update = lambda: 1 / 0  # bound methods resolved
+
+    wsj.publish()  # callbacks were resolved at connect, so no error
+    wsj.flush()
+    assert alice.update_count == 1
+
+    wsj.connect(alice)  # re-resolves alice's callback
+    wsj.connect(bob)
+    with pytest.raises(PublishError) as raised:
+        wsj.publish()
+        wsj.flush()
+    wsj.shutdown()
+
+    assert [who for who, _ in raised.value.errors] == [alice, bob]
+    assert cali.update_count == 2  # still delivered
+
+
+def test_thread_executor_harvests_without_flush():
+    wsj = Newspaper(name="The Wall Street Journal", executor="thread", max_workers=1)
+    alice = Lectiophile(name="Alice Ackerman")
+    bob = Lectiophile(name="Bob Beverly")
+    bob.update = lambda: 1 / 0
+    wsj.connect(alice)
+    wsj.connect(bob)  # fails on every delivery
+
+    with patch.object(wsj, "_harvest", wraps=wsj._harvest) as harvest:
+        for _ in range(1500):
+            wsj.publish()
+    assert harvest.call_count >= 1
+
+    wait([future for _, future in wsj._pending])
+    wsj._harvest()
+    assert wsj._pending == []  # only deliveries in flight are kept
+    with pytest.raises(PublishError) as raised:
+        wsj.flush()
+    wsj.shutdown()
+
+    assert len(raised.value.errors) == 1500
+    assert alice.update_count == 1500
+
+
+def test_weak_registry():
+    wsj = Newspaper(name="The Wall Street Journal", weak=True)
+    alice = Lectiophile(name="Alice Ackerman")
+    wsj.connect(alice)
+    wsj.connect(Lectiophile(name="Bob Beverly"), "serialize")
+    gc.collect()
+
+    assert wsj.registry_stats == RegistryStats(size=1, pruned=1)
+    wsj.publish()
+    assert alice.update_count == 1
+
+    wsj.disconnect(alice)  # explicit disconnect is not counted as a prune
+    del alice
+    gc.collect()
+    assert wsj.registry_stats == RegistryStats(size=0, pruned=1)
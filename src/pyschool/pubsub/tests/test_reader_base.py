@@ -0,0 +1,61 @@
+"""
+This module tests the read cache of pubsub.reader_base.ReaderBase.
+
+Example:
+    > conda activate pyschool-env
+    > pytest src/pyschool/pubsub/tests/test_reader_base.py -rP
+"""
+
+import numpy as np
+import pytest
+
+from pubsub.factory import Factory
+from pubsub.reader_base import MAPPED_NBYTES, CacheStats, ReadCache, ReaderBase
+
+
+@pytest.fixture
+def cache():
+    """Installs a process-wide read cache of 150 bytes for the test."""
+    ReaderBase.cache = ReadCache(max_bytes=150)
+    yield ReaderBase.cache
+    ReaderBase.cache = None
+
+
+def test_read_cache(cache, tmp_path):
+    first, second = tmp_path / "first.csv", tmp_path / "second.csv"
+    first.write_text("1,2\n3,4\n")  # 32 bytes parsed
+    second.write_text("1,2,3\n4,5,6\n7,8,9\n10,11,12\n")  # 96 bytes
+
+    data = Factory.reader_factory(mode="csv")(str(first)).data
+    assert Factory.reader_factory(mode="csv")(str(first)).data is data
+    assert not data.flags.writeable
+    assert cache.stats == CacheStats(1, 1, 0, 1, 32)
+
+    first.write_text("5,6\n7,8\n9,10\n")  # changed size, new key
+    data = Factory.reader_factory(mode="csv")(str(first)).data
+    np.testing.assert_array_equal(data, [[5, 6], [7, 8], [9, 10]])
+    Factory.reader_factory(mode="csv")(str(second)).data
+    assert cache.stats == CacheStats(1, 3, 1, 2, 144)
+
+    cache.clear()
+    assert cache.stats == CacheStats(0, 0, 0, 0, 0)
+
+
+def test_read_cache_freezes_only_cached_arrays(cache, tmp_path):
+    path = tmp_path / "large.csv"
+    path.write_text("1,2,3,4,5\n" * 4)  # 160 bytes parsed, over the budget
+    data = Factory.reader_factory(mode="csv")(str(path)).data
+    assert data.flags.writeable
+    assert cache.stats == CacheStats(0, 1, 0, 0, 0)
+
+
+def test_read_cache_charges_memmaps_nominally(tmp_path):
+    ReaderBase.cache = ReadCache(max_bytes=2 * MAPPED_NBYTES)
+    try:
+        for name in ("first", "second", "third"):
+            np.save(tmp_path / f"{name}.npy", np.zeros(2 * MAPPED_NBYTES))
+            reader = Factory.reader_factory(mode="npy")(str(tmp_path / f"{name}.npy"))
+            assert isinstance(reader.data, np.memmap)
+        assert ReaderBase.cache.stats == CacheStats(0, 3, 1, 2, 2 * MAPPED_NBYTES)
+    finally:
+        ReaderBase.cache = None
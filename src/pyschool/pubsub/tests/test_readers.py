@@ -0,0 +1,96 @@
+"""
+This module tests the npy, csv, and json readers of the pubsub package.
+
+Example:
+    > conda activate pyschool-env
+    > pytest src/pyschool/pubsub/tests/test_readers.py -rP
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from pubsub.factory import Factory
+
+DATA = Path(__file__).parents[1] / "testtorefactor"
+
+
+def _reader_at(path):
+    # a json reader of a temporary file
+    return Factory.reader_factory(mode="json")(str(path))
+
+
+def test_npy_reader_memory_maps(tmp_path):
+    array = np.arange(12.0).reshape(3, 4)
+    path = tmp_path / "array.npy"
+    np.save(path, array)
+    reader = Factory.reader_factory(mode="npy")(str(path))
+    data = reader.data
+    assert isinstance(data, np.memmap)
+    assert not data.flags.writeable
+    np.testing.assert_array_equal(data, array)
+
+    raw = tmp_path / "column.f4"
+    array.astype(np.float32).tofile(raw)
+    reader = Factory.reader_factory(mode="npy")(
+        str(raw), dtype=np.float32, shape=(3, 4)
+    )
+    np.testing.assert_array_equal(reader.data, array)
+
+
+def test_csv_reader_chunks():
+    path = DATA / "strain-stress.csv"
+    reader = Factory.reader_factory(mode="csv")(str(path))
+    data = np.genfromtxt(path, dtype=float, comments="#", delimiter=",")
+    chunks = list(reader.iter_chunks(rows=3))
+    assert all(len(chunk) == 3 for chunk in chunks[:-1])
+    assert len(chunks[-1]) <= 3
+    np.testing.assert_array_equal(np.concatenate(chunks), data)
+    np.testing.assert_array_equal(reader.data, data)
+    with pytest.raises(ValueError):
+        next(reader.iter_chunks(rows=0))
+    with pytest.raises(ValueError):
+        Factory.reader_factory(mode="csv")(str(path), engine="awk")
+
+
+def test_json_reader_streams_items(tmp_path):
+    reader = _reader_at(DATA / "config.json")
+    for block_size in (1, 7, 65536):  # splits keys, strings and numbers
+        items = list(reader.iter_items(block_size=block_size))
+        assert items == list(reader.data.items())
+
+    path = tmp_path / "stream.json"
+    for text, items in (
+        ("{}", []),
+        (
+            ' { "a" : [1, {"b": 2.5e3}] ,"c":-10 }\n',
+            [("a", [1, {"b": 2500.0}]), ("c", -10)],
+        ),
+    ):
+        path.write_text(text)
+        assert list(_reader_at(path).iter_items(block_size=2)) == items
+    # a block that ends inside a number, e.g., after 0. or 1e
+    text = '{"k0": 0.0001, "k1": [1e-5, 25], "k2": -7}'
+    items = list(json.loads(text).items())
+    path.write_text(text)
+    for block_size in range(1, len(text) + 1):
+        assert list(_reader_at(path).iter_items(block_size=block_size)) == items
+    for text in ('{"a": 1', '{"a": 1,}', "[1, 2]", '{"a" 1}'):
+        path.write_text(text)
+        with pytest.raises(json.JSONDecodeError):
+            list(_reader_at(path).iter_items(block_size=3))
+
+
+@pytest.mark.parametrize(
+    "text", ['{"a": 1} garbage', '{"a":1}{"b":2}', "{} 0", '{"a": 1}\n\n]']
+)
+def test_json_reader_rejects_extra_data(tmp_path, text):
+    path = tmp_path / "extra.json"
+    path.write_text(text)
+    with pytest.raises(json.JSONDecodeError, match="Extra data"):
+        json.loads(text)
+    for block_size in (1, 2, 65536):  # the extra data is in a later block
+        with pytest.raises(json.JSONDecodeError, match="Extra data"):
+            list(_reader_at(path).iter_items(block_size=block_size))
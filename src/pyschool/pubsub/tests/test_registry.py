@@ -0,0 +1,88 @@
+"""
+This module tests the class registries of pubsub.registry.
+
+Example:
+    > conda activate pyschool-env
+    > pytest src/pyschool/pubsub/tests/test_registry.py -rP
+"""
+
+import sys
+from importlib import import_module
+from threading import Thread
+from unittest.mock import patch
+
+import pytest
+
+from pubsub.lectiophile import Lectiophile
+from pubsub.newspaper import Newspaper
+from pubsub.registry import Registry, builders
+
+
+def test_registry_resolves_once():
+    registry = Registry(
+        package="pubsub", locate=lambda name: (f".{name}", name.capitalize())
+    )
+    with patch("pubsub.registry.import_module", wraps=import_module) as spy:
+        assert registry.resolve("newspaper") is Newspaper
+        assert registry.resolve("newspaper") is Newspaper
+        for _ in range(2):
+            with pytest.raises(ModuleNotFoundError):
+                registry.resolve("no_such_module")
+    assert spy.call_count == 2  # once per distinct name
+
+
+def test_registry_errors_keep_their_cause():
+    registry = Registry(package="pubsub", locate=lambda name: (f".{name}", "Missing"))
+    for _ in range(2):
+        with pytest.raises(ModuleNotFoundError, match="no_such_module") as info:
+            registry.resolve("no_such_module")
+        assert info.value.name == "pubsub.no_such_module"
+        assert isinstance(info.value.__cause__, ModuleNotFoundError)
+        assert info.value.__cause__.__traceback__ is not None
+    with pytest.raises(AttributeError, match="'newspaper'") as info:
+        registry.resolve("newspaper")
+    assert isinstance(info.value.__cause__, AttributeError)
+
+
+def test_registry_decorator_and_lazy_registration():
+    registry = Registry(package="pubsub", locate=lambda name: (name, name))
+
+    @registry.register("tabloid")
+    class Tabloid(Newspaper):
+        pass
+
+    registry.register_lazy("reader", "pubsub.lectiophile:Lectiophile")
+    registry.register_lazy("missing", "pubsub.no_such_module:Missing")
+    assert registry.names == ("tabloid", "reader", "missing")
+
+    assert registry.resolve("tabloid") is Tabloid
+    assert registry.resolve("reader") is Lectiophile
+    with pytest.raises(ModuleNotFoundError):
+        registry.resolve("missing")  # only fails on first use
+
+
+def test_registry_module_registers_itself(tmp_path):
+    (tmp_path / "registering_tabloid.py").write_text(
+        "from pubsub.newspaper import Newspaper\n"
+        "from pubsub.registry import builders\n"
+        "\n"
+        "@builders.register('registering_tabloid')\n"
+        "class Tabloid(Newspaper):\n"
+        "    pass\n"
+    )
+    builders.register_lazy("registering_tabloid", "registering_tabloid:Tabloid")
+    sys.path.insert(0, str(tmp_path))
+    try:
+        resolver = Thread(target=builders.resolve, args=("registering_tabloid",))
+        resolver.start()
+        resolver.join(timeout=10.0)
+        assert not resolver.is_alive()  # imports without deadlock
+        assert (
+            builders.resolve("registering_tabloid")
+            is sys.modules["registering_tabloid"].Tabloid
+        )
+    finally:
+        sys.path.remove(str(tmp_path))
+        sys.modules.pop("registering_tabloid", None)
+        builders._targets.pop("registering_tabloid", None)
+        builders._cache.pop("registering_tabloid", None)
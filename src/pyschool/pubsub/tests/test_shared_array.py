@@ -0,0 +1,91 @@
+"""
+This module tests the shared-memory transport of pubsub.shared_array.
+
+Example:
+    > conda activate pyschool-env
+    > pytest src/pyschool/pubsub/tests/test_shared_array.py -rP
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from pubsub.lectiophile import Lectiophile
+from pubsub.shared_array import (
+    SharedArrayPublisher,
+    SharedArrayReader,
+    SharedArrayRing,
+    StaleDescriptorError,
+)
+
+
+def _total(descriptor):
+    # reads a shared array in a subscriber process
+    reader = SharedArrayReader()
+    total = float(reader.view(descriptor).sum())
+    reader.close()
+    return total
+
+
+def test_shared_array_transport():
+    frame = np.arange(12, dtype=float).reshape(3, 4)
+    with SharedArrayRing(slot_bytes=frame.nbytes, slots=2) as ring:
+        reader = SharedArrayReader()
+        descriptor = ring.write(frame)
+        view = reader.view(descriptor)
+        np.testing.assert_array_equal(view, frame)
+        assert not view.flags.writeable
+
+        # a subscriber in another process receives only the descriptor
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            assert pool.submit(_total, descriptor).result() == 66.0
+
+        ring.write(frame + 1)
+        ring.write(frame + 2)  # reuses the slot of the first write
+        with pytest.raises(StaleDescriptorError):
+            reader.view(descriptor)
+        with pytest.raises(ValueError):
+            ring.write(np.zeros(13))  # larger than a slot
+
+        del view
+        reader.close()
+
+
+def test_shared_array_slot_being_rewritten():
+    frame = np.ones(4)
+    with SharedArrayRing(slot_bytes=frame.nbytes, slots=1) as ring:
+        reader = SharedArrayReader()
+        descriptor = ring.write(frame)
+        header = np.ndarray((1,), dtype=np.int64, buffer=ring._shm.buf, offset=0)
+        header[0] = -1  # as while write copies the next frame into the slot
+        for read in (reader.view, reader.read):
+            with pytest.raises(StaleDescriptorError):
+                read(descriptor)
+        header[0] = descriptor.sequence
+        np.testing.assert_array_equal(reader.read(descriptor), frame)
+        del header
+        reader.close()
+
+
+def test_shared_array_publisher():
+    frame = np.arange(6, dtype=float)
+    paper = SharedArrayPublisher(name="Frames", slot_bytes=frame.nbytes, slots=2)
+    subscriber = Lectiophile(name="Alice Ackerman")
+    reader = SharedArrayReader()
+    frames = []
+    subscriber.publication_batch_callback = lambda descriptors: frames.extend(
+        reader.read(descriptor) for descriptor in descriptors
+    )
+    paper.connect(subscriber)
+
+    descriptors = [paper.publish_array(frame * i) for i in range(3)]
+    assert [d.sequence for d in descriptors] == [0, 1, 2]
+    for i, received in enumerate(frames):
+        np.testing.assert_array_equal(received, frame * i)
+    assert len(frames) == 3
+    with pytest.raises(StaleDescriptorError):
+        reader.view(descriptors[0])  # its slot was reused by the third
+
+    reader.close()
+    paper.shutdown()
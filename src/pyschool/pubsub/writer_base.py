@@ -0,0 +1,73 @@
+"""
+Implements WriterBase
+"""
+
+import os
+
+from pubsub.iwriter import IWriter
+
+
+class WriterBase(IWriter):
+    """
+    The Base class for writers.
+
+    Data is written to a temporary file next to the target, which then
+    replaces the target in a single rename, so a reader never sees a
+    partially written file, even if the writer is interrupted.
+
+    Attributes:
+        suffix (str): The file extension of the files written, e.g., '.npy'.
+        shard_size (int): The number of arrays written to each file, as a
+            dict of arrays by name, or None for one array per file.
+        file_path (str): The path to the file to be written.
+    """
+
+    suffix = ""
+    shard_size = None
+
+    def __init__(self, file_path: str):
+        """
+        The init method of the WriterBase class.
+
+        Arguments:
+            file_path (str): The path to the file to be written.
+        """
+        super().__init__(file_path=file_path)
+
+        self.file_path = file_path
+
+    def write(self, data) -> str:
+        """
+        Writes the data to the file atomically.
+
+        Arguments:
+            data (dict or np.ndarray): The data to be written.
+
+        Returns:
+            file_path (str): The path to the file written.
+
+        Raises:
+            NotImplementedError: If _write_data has not been
+                implemented in the child class.
+        """
+        head, tail = os.path.split(self.file_path)
+        temporary = os.path.join(head, f".{tail}.{os.getpid()}.tmp")
+        try:
+            with open(temporary, "wb") as fout:
+                self._write_data(fout, data)
+            os.replace(temporary, self.file_path)
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+
+        return self.file_path
+
+    def _write_data(self, fout, data):
+        """
+        Writes the data to an open binary file.
+
+        Raises:
+            NotImplementedError: If _write_data has not been
+                implemented in the child class.
+        """
+        raise NotImplementedError